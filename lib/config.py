@@ -26,6 +26,8 @@ END_FORWARD_TIME = 500
 CONTROL_LOOP_POLL_RATE = 200
 DEBUG = False
 USB_DEBUG = False
+# Time the control loop ISR / handler and dump the numbers at the end of the run
+PROFILE_CONTROL_LOOP = False
 
 # !!! MUST DISABLE IF YOU WANT ROBOT TO RUN MAIN! !!!
 DISABLE_RUN = False
@@ -45,11 +47,34 @@ LOG_LEVEL = DEBUG
 LOG_FILE = "robot.log"
 MAX_LOG_SIZE = 64 * 1024  # 64 KB
 
+# Log binary records to a RAM ring flushed by a task instead of formatting, printing
+# and writing every line as it's logged - that changes the timing of the control loop.
+# Decode LOG_BINARY_FILE with tools/decode_log.py. Logs even with DEBUG off.
+BINARY_LOG = False
+LOG_BINARY_FILE = "robot.bin"
+# Bytes, power of two. Records are ~8 bytes + 5 per argument.
+LOG_RING_SIZE = 16 * 1024
+LOG_FLUSH_PERIOD = 100  # ms
+# Format strings + string arguments given IDs, later ones are logged as "?"
+LOG_MAX_STRINGS = 1024
+
 
 # How many past values to consider in the moving average
 MOVING_AVERAGE_HISTORY_SIZE = 5
 # Where we decide a line is a line; higher is more conservative
 MOVING_AVERAGE_THRESHOLD = 0.5
+# Line sensor filter compiled with the viper emitter (history sizes up to 8)
+MOVING_AVERAGE_VIPER = True
+
+# Oversample the line sensors with a PIO state machine instead of reading the pins
+# every tick. Needs the sensor pins consecutive, outer right lowest.
+LINE_SENSOR_PIO = False
+LINE_SENSOR_PIO_SM = 0
+# Samples per second, majority voted in words of LINE_SENSOR_PIO_SAMPLES (at most 7
+# so a word stays a small int). A word every ms keeps the reading fresh - with one
+# every 3.5ms reversing off the pickups drifted in the simulator.
+LINE_SENSOR_PIO_RATE = 7000
+LINE_SENSOR_PIO_SAMPLES = 7
 
 # PHYSICAL ATTRIBUTES
 
@@ -87,6 +112,12 @@ RIGHT_I2C_SDA = 26
 DEFAULT_TOF_ADDR = 0x29
 LEFT_TOF_ADDR = 0x30
 
+# ToF GPIO1 (data ready, active low) wired to these pins: samples are read when the
+# sensor says so instead of polling it every tick. Needs the wires, off by default.
+TOF_DATA_READY_IRQ = False
+LEFT_TOF_INT_PIN = 12
+RIGHT_TOF_INT_PIN = 22
+
 BUTTON_PIN = 14
 
 # Globals logic
@@ -6,13 +6,15 @@
 #
 ####################################################################################################rom utime import sleep_ms  # type: ignore
 
+import uasyncio  # type: ignore
+
 from config import LOG_LEVELS
 
 from grabber.components.resistanceSensing import resistanceSensing
 from logger.logger import logger
 from grabber.components.servoController import servoController
 from grabber.components.types.servo import Servo
-from grabber.config import ServoPositions
+from grabber.config import SERVO_HOMING_POLL, ServoPositions
 from grabber.components.state import (
     DropOffState,
     GrabberState as State,
@@ -37,9 +39,19 @@ class grabberControl:
         self._r = resistanceSensing()
         self._reel = None
 
-        # Reset arm state on start
-        self._move_jaw(JawState.OPEN, True)
-        self._move_lifter(LifterState.DOWN, True)
+    async def home(self):
+        """
+        Reset the arm on start: jaw open and lifter down, returns once they're there.
+        """
+        self._move_jaw(JawState.OPEN)
+        self._move_lifter(LifterState.DOWN)
+        while not (
+            self.jaw.state == ServoState.IN_POSITION
+            and self.lifter.state == ServoState.IN_POSITION
+        ):
+            await uasyncio.sleep_ms(SERVO_HOMING_POLL)
+            self.jaw._handler()
+            self.lifter._handler()
 
     @property
     def reel(self):
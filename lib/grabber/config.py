@@ -36,4 +36,6 @@ POS_TO_PULSE_WIDTH = {
 }
 
 SERVO_TURN_TIME = 500
+# How often homing at boot checks the servos are in position (ms)
+SERVO_HOMING_POLL = 20
  
\ No newline at end of file
@@ -10,10 +10,23 @@
 from utime import ticks_diff, ticks_ms  # type: ignore
 
 # Local imports
-from config import DEBUG, USB_DEBUG, LOG_LEVELS, LOG_LEVEL, LOG_FILE, MAX_LOG_SIZE
+from config import (
+    BINARY_LOG,
+    DEBUG,
+    USB_DEBUG,
+    LOG_LEVELS,
+    LOG_LEVEL,
+    LOG_FILE,
+    MAX_LOG_SIZE,
+)
 
 
-if DEBUG or USB_DEBUG:
+if BINARY_LOG:
+    # Records into a RAM ring, the flush task has to be started with logger.run()
+    from logger.ringLogger import ringLogger
+
+    logger = ringLogger()
+elif DEBUG or USB_DEBUG:
     # Full logger
     class Logger:
         """
@@ -0,0 +1,272 @@
+####################################################################################################
+#
+# Logic related to the binary ring buffer logger.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Logger writing compact binary records into a preallocated RAM ring, flushed to flash
+in blocks by a uasyncio task. Nothing is formatted on the robot: tools/decode_log.py
+renders the text on the host, the same lines the text logger would have written.
+
+Format strings and string arguments are sent once as DEF records and referred to by
+ID after that, so once every message has been seen a log call with int, string and
+tuple arguments doesn't allocate. Records are reserved in the ring before they're
+written so one from a scheduled handler landing in the middle of another just goes
+after it. When the ring is full records are dropped and counted rather than waiting
+for the flush.
+
+File layout, little endian, after LOG_MAGIC:
+
+    REC_LOG   u32 ms, u16 message ID, u8 argc, args
+    REC_DEF   u16 ID, u16 length, UTF-8 string
+    REC_DROP  u32 records dropped since the last flush
+
+Arguments are a tag byte then: ARG_INT i32, ARG_FLOAT i32 thousandths, ARG_STR u16 ID,
+ARG_BOOL u8, ARG_NONE nothing, ARG_TUPLE / ARG_LIST u8 count then the items. Ints
+outside i32 and anything else go as ARG_STR of their str().
+"""
+
+# Machine imports
+import micropython  # type: ignore
+import uasyncio  # type: ignore
+from utime import ticks_diff, ticks_ms  # type: ignore
+
+# Local imports
+from config import (
+    LOG_BINARY_FILE,
+    LOG_FLUSH_PERIOD,
+    LOG_LEVEL,
+    LOG_MAX_STRINGS,
+    LOG_RING_SIZE,
+    MAX_LOG_SIZE,
+    LOG_LEVELS,
+)
+
+LOG_MAGIC = b"IDPLOG1\n"
+
+REC_LOG = 1
+REC_DEF = 2
+REC_DROP = 3
+
+ARG_INT = 0x69  # i
+ARG_FLOAT = 0x66  # f
+ARG_STR = 0x73  # s
+ARG_BOOL = 0x62  # b
+ARG_NONE = 0x6E  # n
+ARG_TUPLE = 0x74  # t
+ARG_LIST = 0x6C  # l
+
+# String ID once LOG_MAX_STRINGS is used up, decoded as "?"
+NO_STRING = 0xFFFF
+# Record header: kind, ms, message ID, argc
+LOG_HEADER_SIZE = 8
+
+INT_MIN = -(1 << 31)
+INT_MAX = (1 << 31) - 1
+
+
+@micropython.viper
+def _put(buf, mask: int, pos: int, value: int, n: int) -> int:
+    """
+    Write the low n bytes of value little endian at pos, wrapping around the ring.
+
+    Returns:
+        int: Position after the bytes.
+    """
+    p = ptr8(buf)  # type: ignore # noqa: F821
+    for _ in range(n):
+        p[pos & mask] = value
+        value >>= 8
+        pos += 1
+    return pos
+
+
+class ringLogger:
+    """
+    Binary logger with the same interface as the text one, plus flush() / run().
+    """
+    def __init__(self):
+        if LOG_RING_SIZE & (LOG_RING_SIZE - 1):
+            raise ValueError("LOG_RING_SIZE must be a power of two")
+        self.ring = bytearray(LOG_RING_SIZE)
+        self._view = memoryview(self.ring)
+        self._mask = LOG_RING_SIZE - 1
+        # Free running byte counts, positions are & _mask
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+
+        # String -> ID and the (ID, string) definitions, written out in order
+        self._ids = {}
+        self._defs = []
+        self._defs_written = 0
+
+        self.f = None
+        self.size = 0
+        self._open()
+        self.start = ticks_ms()
+
+    def _open(self):
+        self.f = open(LOG_BINARY_FILE, "wb")
+        self.f.write(LOG_MAGIC)
+        self.size = len(LOG_MAGIC)
+        self._defs_written = 0
+
+    # ==========================
+    # Writer side
+    # ==========================
+    def _intern(self, s: str) -> int:
+        """
+        ID of a string, assigning one (and queueing its DEF) the first time it's seen.
+        """
+        i = self._ids.get(s)
+        if i is not None:
+            return i
+        if len(self._ids) >= LOG_MAX_STRINGS:
+            return NO_STRING
+        i = len(self._ids)
+        self._ids[s] = i
+        self._defs.append((i, s))
+        return i
+
+    def _size(self, arg) -> int:
+        if arg is None:
+            return 1
+        if isinstance(arg, bool):
+            return 2
+        if isinstance(arg, (tuple, list)):
+            n = 2
+            for item in arg:
+                n += self._size(item)
+            return n
+        if isinstance(arg, (int, float)):
+            return 5
+        return 3
+
+    def _write(self, pos: int, arg) -> int:
+        ring = self.ring
+        mask = self._mask
+        if arg is None:
+            return _put(ring, mask, pos, ARG_NONE, 1)
+        if isinstance(arg, bool):
+            pos = _put(ring, mask, pos, ARG_BOOL, 1)
+            return _put(ring, mask, pos, 1 if arg else 0, 1)
+        if isinstance(arg, (tuple, list)):
+            tag = ARG_TUPLE if isinstance(arg, tuple) else ARG_LIST
+            pos = _put(ring, mask, pos, tag, 1)
+            pos = _put(ring, mask, pos, len(arg), 1)
+            for item in arg:
+                pos = self._write(pos, item)
+            return pos
+        if isinstance(arg, int) and INT_MIN <= arg <= INT_MAX:
+            pos = _put(ring, mask, pos, ARG_INT, 1)
+            return _put(ring, mask, pos, arg, 4)
+        if isinstance(arg, float) and INT_MIN <= arg * 1000 <= INT_MAX:
+            pos = _put(ring, mask, pos, ARG_FLOAT, 1)
+            return _put(ring, mask, pos, int(arg * 1000), 4)
+        pos = _put(ring, mask, pos, ARG_STR, 1)
+        return _put(
+            ring, mask, pos, self._intern(arg if isinstance(arg, str) else str(arg)), 2
+        )
+
+    def log(self, msg, *args, level=LOG_LEVELS.DEBUG):
+        """
+        Queue a record if above the configured log level.
+        """
+        if level < LOG_LEVEL:
+            return
+        msg_id = self._intern(msg)
+        n = LOG_HEADER_SIZE
+        for arg in args:
+            n += self._size(arg)
+        if self._head + n - self._tail > LOG_RING_SIZE:
+            self.dropped += 1
+            return
+        # Reserve first - a scheduled handler logging from here on goes after us
+        pos = self._head
+        self._head = pos + n
+
+        ring = self.ring
+        mask = self._mask
+        pos = _put(ring, mask, pos, REC_LOG, 1)
+        pos = _put(ring, mask, pos, ticks_diff(ticks_ms(), self.start), 4)
+        pos = _put(ring, mask, pos, msg_id, 2)
+        pos = _put(ring, mask, pos, len(args), 1)
+        for arg in args:
+            pos = self._write(pos, arg)
+
+    # ==========================
+    # Flush side
+    # ==========================
+    def _file_write(self, data):
+        try:
+            self.f.write(data)
+        except Exception:
+            # Never let logging kill the robot
+            pass
+        self.size += len(data)
+
+    def flush(self):
+        """
+        Write the new definitions and everything in the ring out to the file.
+        """
+        if self.f is None:
+            return
+        head = self._head
+        pending = head - self._tail
+        if self.size + pending > MAX_LOG_SIZE:
+            # Start again, the definitions go first so it still decodes
+            self.f.close()
+            self._open()
+
+        header = bytearray(5)
+        while self._defs_written < len(self._defs):
+            i, s = self._defs[self._defs_written]
+            data = s.encode()
+            header[0] = REC_DEF
+            header[1] = i & 0xFF
+            header[2] = i >> 8
+            header[3] = len(data) & 0xFF
+            header[4] = len(data) >> 8
+            self._file_write(header)
+            self._file_write(data)
+            self._defs_written += 1
+
+        if pending:
+            start = self._tail & self._mask
+            end = start + pending
+            if end <= LOG_RING_SIZE:
+                self._file_write(self._view[start:end])
+            else:
+                self._file_write(self._view[start:])
+                self._file_write(self._view[: end - LOG_RING_SIZE])
+            self._tail = head
+
+        if self.dropped:
+            dropped = self.dropped
+            self.dropped = 0
+            header[0] = REC_DROP
+            for b in range(4):
+                header[1 + b] = (dropped >> (8 * b)) & 0xFF
+            self._file_write(header)
+        self.f.flush()
+
+    async def run(self):
+        """
+        Flush task, start with uasyncio.create_task. Ends when the logger is closed.
+        """
+        while self.f is not None:
+            await uasyncio.sleep_ms(LOG_FLUSH_PERIOD)
+            self.flush()
+
+    def close(self):
+        """
+        Flush what's left and close the file.
+        """
+        self.flush()
+        if self.f is not None:
+            self.f.close()
+            self.f = None
@@ -0,0 +1,214 @@
+####################################################################################################
+#
+# Logic related to profiling the control loop.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Latency / jitter instrumentation for the Timer ISR -> scheduled handler path.
+
+Everything is preallocated so the ISR side never allocates: the ISR stamps the
+tick into a small ring matching the micropython.schedule queue, the handler pops
+it to get the dispatch latency and times itself. Samples go into fixed width
+histograms per bucket (usually the MotionState), percentiles are read off the
+histograms when the report is dumped at the end of the run.
+"""
+
+# Machine imports
+from array import array
+import micropython  # type: ignore
+from utime import ticks_diff, ticks_us  # type: ignore
+
+# Local imports
+from misc.config import (
+    PROFILE_BIN_WIDTH_US,
+    PROFILE_BINS,
+    PROFILE_PENDING_SIZE,
+    PROFILE_PERCENTILES,
+)
+
+
+class loopProfiler:
+    """
+    Records ISR -> handler latency, handler execution time and missed, coalesced
+    and dropped ticks for a periodic control loop.
+    """
+    def __init__(self, freq: int, buckets):
+        """
+        Args:
+            freq (int): Timer frequency in Hz.
+            buckets (Iterable[str]): Keys samples are filed under, e.g. MotionStates.
+        """
+        self.period_us = 1_000_000 // freq
+        self.buckets = tuple(buckets)
+        self._index = {key: i for i, key in enumerate(self.buckets)}
+        n = len(self.buckets)
+
+        # Ticks waiting in the schedule queue, oldest at _tail
+        self._pending = array("i", [0] * PROFILE_PENDING_SIZE)
+        self._head = 0
+        self._tail = 0
+        self._queued = 0
+        self._latency = 0
+
+        self._last_isr = None
+        self.ticks = 0
+        self.handled = 0
+        # Timer fired late enough that whole periods went by
+        self.missed = 0
+        # Timer fired while the previous tick's handler still hadn't run
+        self.coalesced = 0
+        # micropython.schedule queue was full, the handler never ran for the tick
+        self.dropped = 0
+        self.max_jitter_us = 0
+
+        # Per bucket counts / max, histograms are bucket major
+        self.count = array("I", [0] * n)
+        self.latency_max = array("I", [0] * n)
+        self.exec_max = array("I", [0] * n)
+        self.latency_hist = array("I", [0] * (n * PROFILE_BINS))
+        self.exec_hist = array("I", [0] * (n * PROFILE_BINS))
+
+        self._start = ticks_us()
+
+    # ==========================
+    # ISR side
+    # ==========================
+    def schedule(self, handler, arg) -> bool:
+        """
+        Stamp a tick and schedule the handler for it. Call from the ISR.
+
+        Returns:
+            bool: False if the schedule queue was full and the tick was dropped.
+        """
+        now = ticks_us()
+        self.ticks += 1
+        if self._last_isr is not None:
+            jitter = ticks_diff(now, self._last_isr) - self.period_us
+            if jitter < 0:
+                jitter = -jitter
+            if jitter > self.max_jitter_us:
+                self.max_jitter_us = jitter
+            # Every whole period late is a tick that never fired
+            self.missed += (jitter + self.period_us // 2) // self.period_us
+        self._last_isr = now
+
+        if self._queued:
+            self.coalesced += 1
+        if self._queued == PROFILE_PENDING_SIZE:
+            self.dropped += 1
+            return False
+        try:
+            micropython.schedule(handler, arg)
+        except RuntimeError:
+            # Queue full - shared with the other scheduled handlers
+            self.dropped += 1
+            return False
+
+        self._pending[self._head] = now
+        self._head = (self._head + 1) % PROFILE_PENDING_SIZE
+        self._queued += 1
+        return True
+
+    # ==========================
+    # Handler side
+    # ==========================
+    def start(self) -> int:
+        """
+        Pop the tick being handled. Call first thing in the scheduled handler.
+
+        Returns:
+            int: Start time to hand back to stop().
+        """
+        start = ticks_us()
+        if self._queued:
+            self._latency = ticks_diff(start, self._pending[self._tail])
+            self._tail = (self._tail + 1) % PROFILE_PENDING_SIZE
+            self._queued -= 1
+        else:
+            self._latency = 0
+        return start
+
+    def stop(self, start: int, bucket):
+        """
+        Record the tick once the handler is done.
+
+        Args:
+            start (int): Value returned by start().
+            bucket (str): Key the sample is filed under.
+        """
+        elapsed = ticks_diff(ticks_us(), start)
+        i = self._index.get(bucket)
+        if i is None:
+            return
+        self.handled += 1
+        self.count[i] += 1
+        self._add(self.latency_hist, self.latency_max, i, self._latency)
+        self._add(self.exec_hist, self.exec_max, i, elapsed)
+
+    @staticmethod
+    def _add(hist, maxima, i: int, us: int):
+        b = us // PROFILE_BIN_WIDTH_US
+        if b >= PROFILE_BINS:
+            # Last bin is the overflow
+            b = PROFILE_BINS - 1
+        hist[i * PROFILE_BINS + b] += 1
+        if us > maxima[i]:
+            maxima[i] = us
+
+    # ==========================
+    # Report
+    # ==========================
+    def _percentile(self, hist, i: int, p: int) -> int:
+        """
+        Upper edge of the bin the p-th percentile sample falls in, in us.
+        """
+        target = (self.count[i] * p + 99) // 100
+        seen = 0
+        base = i * PROFILE_BINS
+        for b in range(PROFILE_BINS):
+            seen += hist[base + b]
+            if seen >= target:
+                return (b + 1) * PROFILE_BIN_WIDTH_US
+        return PROFILE_BINS * PROFILE_BIN_WIDTH_US
+
+    def report(self):
+        """
+        Summary of the run as a list of lines.
+        """
+        elapsed = ticks_diff(ticks_us(), self._start)
+        rate = self.handled * 1_000_000 // elapsed if elapsed > 0 else 0
+        lines = [
+            "Control loop: {} Hz achieved of {} Hz over {} ms".format(
+                rate, 1_000_000 // self.period_us, elapsed // 1000
+            ),
+            "Control loop: ticks {} handled {} missed {} coalesced {} dropped {}".format(
+                self.ticks, self.handled, self.missed, self.coalesced, self.dropped
+            ),
+            "Control loop: max timer jitter {} us".format(self.max_jitter_us),
+        ]
+        pct = "/".join("p{}".format(p) for p in PROFILE_PERCENTILES)
+        for i, key in enumerate(self.buckets):
+            if not self.count[i]:
+                continue
+            lines.append(
+                "Control loop: {} n={} latency {} {} max {} | exec {} {} max {} (us)".format(
+                    key,
+                    self.count[i],
+                    pct,
+                    "/".join(
+                        str(self._percentile(self.latency_hist, i, p))
+                        for p in PROFILE_PERCENTILES
+                    ),
+                    self.latency_max[i],
+                    pct,
+                    "/".join(
+                        str(self._percentile(self.exec_hist, i, p))
+                        for p in PROFILE_PERCENTILES
+                    ),
+                    self.exec_max[i],
+                )
+            )
+        return lines
@@ -7,17 +7,32 @@
 ####################################################################################################
 
 from config import (
+    DEBUG,
     DEFAULT_TOF_ADDR,
     DISABLE_LEFT_TOF,
     LEFT_I2C_SCL,
     LEFT_I2C_SDA,
+    LEFT_TOF_INT_PIN,
     RIGHT_I2C_SCL,
     RIGHT_I2C_SDA,
+    RIGHT_TOF_INT_PIN,
+    TOF_DATA_READY_IRQ,
 )
+from array import array
 import math
-from utime import sleep_ms  # type: ignore
+import micropython  # type: ignore
+from utime import ticks_diff, ticks_ms  # type: ignore
 import uasyncio  # type: ignore
-from misc.config import BAY_THRESHOLD, MAX_TRIGGERS, NUM_TRIGGERS
+from misc.config import (
+    BAY_THRESHOLD,
+    MAX_TRIGGERS,
+    NUM_TRIGGERS,
+    TOF_CONTINUOUS,
+    TOF_PERIOD_MS,
+    TOF_SAMPLE_BUFFER_SIZE,
+    TOF_SCAN_BUFFER_SIZE,
+    TOF_TIMING_BUDGET_US,
+)
 from logger.logger import logger
 from machine import Pin, I2C  # type: ignore
 from misc.components.utils.VL53L0X import VL53L0X
@@ -35,48 +50,119 @@ class ToFs:
     def __init__(self):
         self.left_i2c_bus = I2C(id=0, sda=Pin(LEFT_I2C_SDA), scl=Pin(LEFT_I2C_SCL))
         self.right_i2c_bus = I2C(id=1, sda=Pin(RIGHT_I2C_SDA), scl=Pin(RIGHT_I2C_SCL))
+        # No I2C traffic until init()
         if not DISABLE_LEFT_TOF:
             self.left_tof = VL53L0X(self.left_i2c_bus, address=DEFAULT_TOF_ADDR)
-            logger.log("I2C LEFT: {}", self.left_i2c_bus.scan())
         self.right_tof = VL53L0X(self.right_i2c_bus, address=DEFAULT_TOF_ADDR)
-        logger.log("I2C RIGHT: {}", self.right_i2c_bus.scan())
         self.tofs = (
             (self.right_tof,) if DISABLE_LEFT_TOF else (self.left_tof, self.right_tof)
         )
-        for tof in self.tofs:
-            tof.set_Vcsel_pulse_period(tof.vcsel_period_type[0], 18)
-            tof.set_Vcsel_pulse_period(tof.vcsel_period_type[1], 14)
 
         self._readings = []
         self.state = State.REST
+        # Ranging, set once start_tofs() is done
+        self.started = False
         self._triggers = 0
         self._total_triggers = 0
         self.occupied = True
 
+        # Data ready samples (TOF_DATA_READY_IRQ), a ring per sensor in self.tofs order.
+        # Head / tail are free running counts, the slot is % TOF_SAMPLE_BUFFER_SIZE
+        self._samples = tuple(
+            array("H", bytes(2 * TOF_SAMPLE_BUFFER_SIZE)) for _ in self.tofs
+        )
+        self._heads = [0] * len(self.tofs)
+        self._tails = [0] * len(self.tofs)
+        self._int_pins = ()
+        # Set when the schedule queue was full and a data ready edge was lost
+        self._missed = False
+        # Bound once, making the bound method in the IRQ would allocate
+        self._read_sample_ref = self._read_sample
+
+        # Bay scan: the last TOF_SCAN_BUFFER_SIZE readings off one side and the ticks
+        # they came in at, _scan_count is free running like the heads above
+        self._scan_ticks = array("i", bytes(4 * TOF_SCAN_BUFFER_SIZE))
+        self._scan_mm = array("H", bytes(2 * TOF_SCAN_BUFFER_SIZE))
+        self._scan_count = 0
+        self._scan_side = None
+
+    # ==========================
+    # Init
+    # ==========================
+    async def init(self):
+        """
+        Initialise and calibrate the sensors, all at once - they're on separate buses.
+        """
+        await uasyncio.gather(*(self._init_tof(tof) for tof in self.tofs))
+
+    async def _init_tof(self, tof):
+        """
+        Bring up a single sensor and set its VCSEL periods.
+        """
+        start = ticks_ms()
+        await tof.init()
+        await tof.set_Vcsel_pulse_period(tof.vcsel_period_type[0], 18)
+        await tof.set_Vcsel_pulse_period(tof.vcsel_period_type[1], 14)
+        side = "LEFT" if tof is not self.right_tof else "RIGHT"
+        if DEBUG:
+            # A scan probes every address, only worth it when debugging the wiring
+            logger.log("I2C {}: {}", side, tof.i2c.scan())
+        logger.log("ToF: {} ready in {} ms", side, ticks_diff(ticks_ms(), start))
+
     # ==========================
     # start/stop tof
     # ==========================
-    def start_tofs(self):
+    async def start_tofs(self):
         """
-        Initialise and start all configured ToF sensors.
+        Start all configured ToF sensors, yielding between the I2C steps. Can run as a
+        task while driving, bay checks wait for it.
         """
-        print("starting ToF sensors...")
+        logger.log("ToF: starting sensors")
         for tof in self.tofs:
-            tof.start()
-        while not (
-            (DISABLE_LEFT_TOF or self.left_tof._started) and self.right_tof._started
-        ):
-            logger.log("Waiting for ToF sensors to start...")
-            sleep_ms(50)
+            if TOF_CONTINUOUS:
+                if not tof.set_measurement_timing_budget(TOF_TIMING_BUDGET_US):
+                    logger.log("ToF: timing budget {} rejected", TOF_TIMING_BUDGET_US)
+                await uasyncio.sleep_ms(0)
+                tof.start(TOF_PERIOD_MS)
+            else:
+                tof.start()
+            if TOF_DATA_READY_IRQ:
+                # GPIO1 only falls again once the last sample is cleared
+                tof.clear()
+            await uasyncio.sleep_ms(0)
+        if TOF_DATA_READY_IRQ:
+            self._start_irqs()
+        self.started = True
         logger.log("ToF sensors started!")
 
-    def stop_tofs(self):
+    async def stop_tofs(self):
         """
-        Stop all ToF sensors.
+        Stop all ToF sensors, yielding between them.
         """
+        self.started = False
+        for pin in self._int_pins:
+            pin.irq(handler=None)
+        self._int_pins = ()
         for tof in self.tofs:
             tof.stop()
-        print("Stopped ToF sensors.")
+            await uasyncio.sleep_ms(0)
+        logger.log("ToF: stopped sensors")
+
+    async def measure(self, side):
+        """
+        Single shot measurement from one sensor, for when they aren't ranging.
+
+        Returns:
+            int | None: Distance in mm, None if the sensor timed out.
+        """
+        return await self.sel_tof(side).measure()
+
+    async def calibrate(self):
+        """
+        Redo the reference calibration of all the sensors at once, e.g. after a big
+        temperature change. They have to be stopped.
+        """
+        await uasyncio.gather(*(tof.calibrate() for tof in self.tofs))
 
     def sel_tof(self, side: str):
         """
@@ -94,6 +180,8 @@ class ToFs:
         """
         Transition ToF state to begin acquiring readings.
         """
+        # Whatever the sensors measured on the way here isn't this bay
+        self._drop_samples()
         self.state = State.ACQUIRING_READINGS
 
     def reset(self):
@@ -106,6 +194,79 @@ class ToFs:
         self._readings = []
         self.state = State.REST
 
+    def _drop_samples(self):
+        """
+        Forget the samples the sensors have waiting.
+        """
+        if TOF_DATA_READY_IRQ:
+            for i in range(len(self.tofs)):
+                self._tails[i] = self._heads[i]
+        else:
+            for tof in self.tofs:
+                tof.clear()
+
+    # ==========================
+    # Data ready IRQ
+    # ==========================
+    def _start_irqs(self):
+        """
+        Hook each sensor's GPIO1 up to a falling edge IRQ.
+        """
+        pins = (
+            (RIGHT_TOF_INT_PIN,)
+            if DISABLE_LEFT_TOF
+            else (LEFT_TOF_INT_PIN, RIGHT_TOF_INT_PIN)
+        )
+        self._int_pins = tuple(Pin(pin, Pin.IN, Pin.PULL_UP) for pin in pins)
+        for i, pin in enumerate(self._int_pins):
+            pin.irq(handler=self._data_ready(i), trigger=Pin.IRQ_FALLING, hard=True)
+
+    def _data_ready(self, i: int):
+        """
+        Hard IRQ handler for sensor i, handing the read over to the scheduler.
+        """
+        def handler(pin):
+            try:
+                micropython.schedule(self._read_sample_ref, i)
+            except RuntimeError:
+                # Queue full, GPIO1 stays low until someone reads the sample
+                self._missed = True
+
+        return handler
+
+    def _read_sample(self, i: int):
+        """
+        Scheduled: read sensor i's new sample into its ring.
+        """
+        tof = self.tofs[i]
+        if not tof.poll():
+            return
+        head = self._heads[i]
+        self._samples[i][head % TOF_SAMPLE_BUFFER_SIZE] = tof.range
+        head += 1
+        self._heads[i] = head
+        if head - self._tails[i] > TOF_SAMPLE_BUFFER_SIZE:
+            self._tails[i] = head - TOF_SAMPLE_BUFFER_SIZE
+
+    def _next_sample(self, side):
+        """
+        Oldest unread sample from a sensor's ring.
+
+        Returns:
+            int | None: Distance in mm, None if there isn't a new one.
+        """
+        i = self.tofs.index(self.sel_tof(side))
+        if self._missed:
+            # Lost an edge, read whatever is waiting so GPIO1 is released
+            self._missed = False
+            for j in range(len(self.tofs)):
+                self._read_sample(j)
+        tail = self._tails[i]
+        if tail == self._heads[i]:
+            return None
+        self._tails[i] = tail + 1
+        return self._samples[i][tail % TOF_SAMPLE_BUFFER_SIZE]
+
     # ==========================
     # Bay detection
     # ==========================
@@ -114,7 +275,10 @@ class ToFs:
         Read one valid distance sample.
         Returns distance in mm, or None if not ready.
         """
-        d = self.sel_tof(side).read()
+        if TOF_DATA_READY_IRQ:
+            d = self._next_sample(side)
+        else:
+            d = self.sel_tof(side).read()
         if d is not None and d > 8000:
             logger.log("Got an 8000 measurement!")
             return None
@@ -125,6 +289,9 @@ class ToFs:
         Accumulate distance samples until trigger limits are reached,
         then determine bay occupancy.
         """
+        if not self.started:
+            # Still starting up, don't use up the triggers
+            return
         if self._triggers >= NUM_TRIGGERS or self._total_triggers >= MAX_TRIGGERS:
             # Convert 0 readings to 600 readings
             self._readings = [600 if r == 0 else r for r in self._readings]
@@ -155,6 +322,61 @@ class ToFs:
         if self.state == State.ACQUIRING_READINGS:
             self.get_distances(side)
 
+    # ==========================
+    # Bay scan
+    # ==========================
+    def scan(self, side):
+        """
+        Stream readings off one side into the scan ring, call every tick while driving
+        past bays. Switching side starts the ring again.
+        """
+        if not self.started or self.state != State.REST:
+            # Sampling a bay the scan missed, leave the readings to that
+            return
+        if side != self._scan_side:
+            self._scan_side = side
+            self._scan_count = 0
+            self._drop_samples()
+        while (d := self.read_distance_once(side)) is not None:
+            slot = self._scan_count % TOF_SCAN_BUFFER_SIZE
+            self._scan_ticks[slot] = ticks_ms()
+            self._scan_mm[slot] = d
+            self._scan_count += 1
+            if not TOF_DATA_READY_IRQ:
+                # Polling, there's only ever the one
+                break
+
+    def stop_scan(self):
+        """
+        Stop scanning, the next scan() starts afresh.
+        """
+        self._scan_side = None
+
+    def scan_occupied(self, since: int):
+        """
+        Bay occupancy from the scan readings that came in from since on.
+
+        Args:
+            since (int): ticks_ms of the oldest reading to use.
+
+        Returns:
+            bool | None: Whether the bay is occupied, None if fewer than NUM_TRIGGERS
+                readings came in.
+        """
+        total = 0
+        n = 0
+        for i in range(max(0, self._scan_count - TOF_SCAN_BUFFER_SIZE), self._scan_count):
+            slot = i % TOF_SCAN_BUFFER_SIZE
+            if ticks_diff(self._scan_ticks[slot], since) >= 0:
+                d = self._scan_mm[slot]
+                total += 600 if d == 0 else d
+                n += 1
+        if n < NUM_TRIGGERS:
+            return None
+        if DEBUG:
+            logger.log("ToF: Scanned {} readings, mean {}", n, total // n)
+        return total < BAY_THRESHOLD * n
+
 
 # Instatiate object
 tofs = ToFs()
@@ -166,7 +388,8 @@ tofs = ToFs()
 async def main():
     print("start test")
     tofs = ToFs()
-    tofs.start_tofs()
+    await tofs.init()
+    await tofs.start_tofs()
     tofs.start_reading()
     while tofs.state != State.COMPLETE:
         print("Getting readings...")
@@ -180,7 +403,7 @@ async def main():
         tofs.handler("left")
         await uasyncio.sleep_ms(20)
     print("Left Readings {}, occupied: {}", tofs._readings, tofs.occupied)
-    tofs.stop_tofs()
+    await tofs.stop_tofs()
     print("end test")
 
 
@@ -1,5 +1,6 @@
 from logger.logger import logger
 from micropython import const
+import uasyncio
 import ustruct
 import utime
 
@@ -20,6 +21,9 @@ _RESULT_INTERRUPT_STATUS = const(0x13)
 _RESULT_RANGE_STATUS = const(0x14)
 _OSC_CALIBRATE = const(0xF8)
 _MEASURE_PERIOD = const(0x04)
+# RESULT_INTERRUPT_STATUS through the range result (0x1E-0x1F), read in one go
+_RESULT_BURST_SIZE = const(13)
+_RESULT_RANGE_OFFSET = const(11)
 
 SYSRANGE_START = 0x00
 
@@ -104,6 +108,228 @@ ALGO_PHASECAL_LIM = 0x30
 ALGO_PHASECAL_CONFIG_TIMEOUT = 0x30
 
 
+# Register page select, writes to it always go on their own
+_PAGE_SELECT = const(0xFF)
+_STRUCT_SIZES = {"B": 1, ">H": 2, ">I": 4}
+# Page 0 registers only changed through _flag or our own writes, so they can be
+# shadowed. 0x83 is left out, the sensor sets it itself during the SPAD readout.
+_SHADOWED_FLAGS = (_EXTSUP_HV, _MSRC_CONFIG, _GPIO_MUX_ACTIVE_HIGH)
+
+
+def _compile(config):
+    """
+    Turn (register, value) pairs into (first register, bytes) bursts, merging runs of
+    consecutive registers into one auto-incrementing write. Page selects are never
+    merged, so nothing crosses a page change.
+    """
+    bursts = []
+    start = None
+    data = b""
+    for register, value in config:
+        if (
+            start is not None
+            and register == start + len(data)
+            and register != _PAGE_SELECT
+            and start != _PAGE_SELECT
+        ):
+            data += bytes((value,))
+            continue
+        if start is not None:
+            bursts.append((start, data))
+        start = register
+        data = bytes((value,))
+    if start is not None:
+        bursts.append((start, data))
+    return tuple(bursts)
+
+
+# Init sequences, compiled into bursts once at import
+
+# I2C standard mode, then into the page holding the stop variable
+_STOP_VARIABLE_ENTER = _compile(
+    (
+        (0x88, 0x00),
+        (0x80, 0x01),
+        (0xFF, 0x01),
+        (0x00, 0x00),
+    )
+)
+
+_STOP_VARIABLE_EXIT = _compile(
+    (
+        (0x00, 0x01),
+        (0xFF, 0x00),
+        (0x80, 0x00),
+    )
+)
+
+# Reference SPAD setup before the map is written
+_REF_SPAD_SETUP = _compile(
+    (
+        (0xFF, 0x01),
+        (_SPAD_REF_START, 0x00),
+        (_SPAD_NUM_REQUESTED, 0x2C),
+        (0xFF, 0x00),
+        (_REF_EN_START_SELECT, 0xB4),
+    )
+)
+
+# ST's default tuning settings
+_TUNING = _compile(
+    (
+        (0xFF, 0x01),
+        (0x00, 0x00),
+        (0xFF, 0x00),
+        (0x09, 0x00),
+        (0x10, 0x00),
+        (0x11, 0x00),
+        (0x24, 0x01),
+        (0x25, 0xFF),
+        (0x75, 0x00),
+        (0xFF, 0x01),
+        (0x4E, 0x2C),
+        (0x48, 0x00),
+        (0x30, 0x20),
+        (0xFF, 0x00),
+        (0x30, 0x09),
+        (0x54, 0x00),
+        (0x31, 0x04),
+        (0x32, 0x03),
+        (0x40, 0x83),
+        (0x46, 0x25),
+        (0x60, 0x00),
+        (0x27, 0x00),
+        (0x50, 0x06),
+        (0x51, 0x00),
+        (0x52, 0x96),
+        (0x56, 0x08),
+        (0x57, 0x30),
+        (0x61, 0x00),
+        (0x62, 0x00),
+        (0x64, 0x00),
+        (0x65, 0x00),
+        (0x66, 0xA0),
+        (0xFF, 0x01),
+        (0x22, 0x32),
+        (0x47, 0x14),
+        (0x49, 0xFF),
+        (0x4A, 0x00),
+        (0xFF, 0x00),
+        (0x7A, 0x0A),
+        (0x7B, 0x00),
+        (0x78, 0x21),
+        (0xFF, 0x01),
+        (0x23, 0x34),
+        (0x42, 0x00),
+        (0x44, 0xFF),
+        (0x45, 0x26),
+        (0x46, 0x05),
+        (0x40, 0x40),
+        (0x0E, 0x06),
+        (0x20, 0x1A),
+        (0x43, 0x40),
+        (0xFF, 0x00),
+        (0x34, 0x03),
+        (0x35, 0x44),
+        (0xFF, 0x01),
+        (0x31, 0x04),
+        (0x4B, 0x09),
+        (0x4C, 0x05),
+        (0x4D, 0x04),
+        (0xFF, 0x00),
+        (0x44, 0x00),
+        (0x45, 0x20),
+        (0x47, 0x08),
+        (0x48, 0x28),
+        (0x67, 0x00),
+        (0x70, 0x04),
+        (0x71, 0x01),
+        (0x72, 0xFE),
+        (0x76, 0x00),
+        (0x77, 0x00),
+        (0xFF, 0x01),
+        (0x0D, 0x01),
+        (0xFF, 0x00),
+        (0x80, 0x01),
+        (0x01, 0xF8),
+        (0xFF, 0x01),
+        (0x8E, 0x01),
+        (0x00, 0x01),
+        (0xFF, 0x00),
+        (0x80, 0x00),
+    )
+)
+
+# SPAD count / type readout
+_SPAD_INFO_ENTER = _compile(
+    (
+        (0x80, 0x01),
+        (0xFF, 0x01),
+        (0x00, 0x00),
+        (0xFF, 0x06),
+    )
+)
+
+_SPAD_INFO_START = _compile(
+    (
+        (0xFF, 0x07),
+        (0x81, 0x01),
+        (0x80, 0x01),
+        (0x94, 0x6B),
+        (0x83, 0x00),
+    )
+)
+
+_SPAD_INFO_DONE = _compile(
+    (
+        (0x81, 0x00),
+        (0xFF, 0x06),
+    )
+)
+
+_SPAD_INFO_EXIT = _compile(
+    (
+        (0xFF, 0x01),
+        (0x00, 0x01),
+        (0xFF, 0x00),
+        (0x80, 0x00),
+    )
+)
+
+
+# Valid phase (low, high) for each pre-range VCSEL period
+_PRE_RANGE_VCSEL = {
+    period: _compile(
+        (
+            (PRE_RANGE_CONFIG_VALID_PHASE_LOW, 0x08),
+            (PRE_RANGE_CONFIG_VALID_PHASE_HIGH, high),
+        )
+    )
+    for period, high in ((12, 0x18), (14, 0x30), (16, 0x40), (18, 0x50))
+}
+
+# Valid phase, VCSEL width and phase calibration for each final range VCSEL period
+_FINAL_RANGE_VCSEL = {
+    period: _compile(
+        (
+            (FINAL_RANGE_CONFIG_VALID_PHASE_LOW, 0x08),
+            (FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, high),
+            (GLOBAL_CONFIG_VCSEL_WIDTH, width),
+            (ALGO_PHASECAL_CONFIG_TIMEOUT, timeout),
+            (0xFF, 0x01),
+            (ALGO_PHASECAL_LIM, limit),
+            (0xFF, 0x00),
+        )
+    )
+    for period, high, width, timeout, limit in (
+        (8, 0x10, 0x02, 0x0C, 0x30),
+        (10, 0x28, 0x03, 0x09, 0x20),
+        (12, 0x38, 0x03, 0x08, 0x20),
+        (14, 0x48, 0x03, 0x07, 0x20),
+    )
+}
+
+
 class TimeoutError(RuntimeError):
     pass
 
@@ -112,7 +338,11 @@ class VL53L0X:
     def __init__(self, i2c, address=0x29):
         self.i2c = i2c
         self.address = address
-        self.init()
+        # Register buffers by size, reused for every single register access
+        self._bufs = (None, bytearray(1), bytearray(2), None, bytearray(4))
+        self._page = 0
+        # Page 0 flag register -> last value read or written
+        self._shadow = {}
         self._started = False
         self.measurement_timing_budget_us = 0
         self.set_measurement_timing_budget(self.measurement_timing_budget_us)
@@ -129,6 +359,49 @@ class VL53L0X:
         }
         self.vcsel_period_type = ["VcselPeriodPreRange", "VcselPeriodFinalRange"]
 
+        # Latest result, refreshed by poll()
+        self._result = bytearray(_RESULT_BURST_SIZE)
+        self.range = None
+        self.range_ticks = None
+        self.samples = 0
+
+    # ==========================
+    # Register access
+    # ==========================
+    def _read(self, register, size=1):
+        """
+        Read a big endian register of size bytes (1, 2 or 4) into a preallocated buffer.
+        """
+        buf = self._bufs[size]
+        self.i2c.readfrom_mem_into(self.address, register, buf)
+        value = 0
+        for b in buf:
+            value = (value << 8) | b
+        return value
+
+    def _write(self, register, value, size=1):
+        """
+        Write a big endian register of size bytes (1, 2 or 4) from a preallocated buffer.
+        """
+        buf = self._bufs[size]
+        value = int(value)
+        for i in range(size - 1, -1, -1):
+            buf[i] = value & 0xFF
+            value >>= 8
+        self.i2c.writeto_mem(self.address, register, buf)
+        self._track(register, buf)
+
+    def _track(self, register, data):
+        """
+        Keep the page and the flag shadows up to date with a write.
+        """
+        if register == _PAGE_SELECT:
+            self._page = data[0]
+        elif self._page == 0:
+            for i in range(len(data)):
+                if register + i in self._shadow:
+                    self._shadow[register + i] = data[i]
+
     def _registers(self, register, values=None, struct="B"):
         if values is None:
             size = ustruct.calcsize(struct)
@@ -137,14 +410,29 @@ class VL53L0X:
             return values
         data = ustruct.pack(struct, *values)
         self.i2c.writeto_mem(self.address, register, data)
+        self._track(register, data)
 
     def _register(self, register, value=None, struct="B"):
-        if value is None:
-            return self._registers(register, struct=struct)[0]
-        self._registers(register, (value,), struct=struct)
+        size = _STRUCT_SIZES.get(struct)
+        if size is None:
+            if value is None:
+                return self._registers(register, struct=struct)[0]
+            self._registers(register, (value,), struct=struct)
+        elif value is None:
+            return self._read(register, size)
+        else:
+            self._write(register, value, size)
 
     def _flag(self, register=0x00, bit=0, value=None):
-        data = self._register(register)
+        """
+        Read or set a bit. Registers in _SHADOWED_FLAGS are read once then kept in
+        sync by the writes, so setting a bit there is a single write.
+        """
+        data = self._shadow.get(register) if self._page == 0 else None
+        if data is None:
+            data = self._read(register)
+            if register in _SHADOWED_FLAGS and self._page == 0:
+                self._shadow[register] = data
         mask = 1 << bit
         if value is None:
             return bool(data & mask)
@@ -152,28 +440,31 @@ class VL53L0X:
             data |= mask
         else:
             data &= ~mask
-        self._register(register, data)
+        self._write(register, data)
 
     def _config(self, *config):
         for register, value in config:
-            self._register(register, value)
-
-    def init(self, power2v8=True):
+            self._write(register, value)
+
+    def _burst(self, sequence):
+        """
+        Write a sequence from _compile, one I2C transaction per run of registers.
+        """
+        for register, data in sequence:
+            self.i2c.writeto_mem(self.address, register, data)
+            self._track(register, data)
+
+    async def init(self, power2v8=True):
+        """
+        Bring the sensor up, yielding while it calibrates so other sensors (on their own
+        buses) and tasks can get on at the same time.
+        """
         self._flag(_EXTSUP_HV, 0, power2v8)
 
         # I2C standard mode
-        self._config(
-            (0x88, 0x00),
-            (0x80, 0x01),
-            (0xFF, 0x01),
-            (0x00, 0x00),
-        )
+        self._burst(_STOP_VARIABLE_ENTER)
         self._stop_variable = self._register(0x91)
-        self._config(
-            (0x00, 0x01),
-            (0xFF, 0x00),
-            (0x80, 0x00),
-        )
+        self._burst(_STOP_VARIABLE_EXIT)
 
         # disable signal_rate_msrc and signal_rate_pre_range limit checks
         self._flag(_MSRC_CONFIG, 1, True)
@@ -184,17 +475,12 @@ class VL53L0X:
 
         self._register(_SYSTEM_SEQUENCE, 0xFF)
 
-        spad_count, is_aperture = self._spad_info()
-        spad_map = bytearray(self._registers(_SPAD_ENABLES, struct="6B"))
+        spad_count, is_aperture = await self._spad_info()
+        spad_map = bytearray(6)
+        self.i2c.readfrom_mem_into(self.address, _SPAD_ENABLES, spad_map)
 
         # set reference spads
-        self._config(
-            (0xFF, 0x01),
-            (_SPAD_REF_START, 0x00),
-            (_SPAD_NUM_REQUESTED, 0x2C),
-            (0xFF, 0x00),
-            (_REF_EN_START_SELECT, 0xB4),
-        )
+        self._burst(_REF_SPAD_SETUP)
 
         spads_enabled = 0
         for i in range(48):
@@ -203,90 +489,9 @@ class VL53L0X:
             elif spad_map[i // 8] & (1 << (i >> 2)):
                 spads_enabled += 1
 
-        self._registers(_SPAD_ENABLES, spad_map, struct="6B")
+        self.i2c.writeto_mem(self.address, _SPAD_ENABLES, spad_map)
 
-        self._config(
-            (0xFF, 0x01),
-            (0x00, 0x00),
-            (0xFF, 0x00),
-            (0x09, 0x00),
-            (0x10, 0x00),
-            (0x11, 0x00),
-            (0x24, 0x01),
-            (0x25, 0xFF),
-            (0x75, 0x00),
-            (0xFF, 0x01),
-            (0x4E, 0x2C),
-            (0x48, 0x00),
-            (0x30, 0x20),
-            (0xFF, 0x00),
-            (0x30, 0x09),
-            (0x54, 0x00),
-            (0x31, 0x04),
-            (0x32, 0x03),
-            (0x40, 0x83),
-            (0x46, 0x25),
-            (0x60, 0x00),
-            (0x27, 0x00),
-            (0x50, 0x06),
-            (0x51, 0x00),
-            (0x52, 0x96),
-            (0x56, 0x08),
-            (0x57, 0x30),
-            (0x61, 0x00),
-            (0x62, 0x00),
-            (0x64, 0x00),
-            (0x65, 0x00),
-            (0x66, 0xA0),
-            (0xFF, 0x01),
-            (0x22, 0x32),
-            (0x47, 0x14),
-            (0x49, 0xFF),
-            (0x4A, 0x00),
-            (0xFF, 0x00),
-            (0x7A, 0x0A),
-            (0x7B, 0x00),
-            (0x78, 0x21),
-            (0xFF, 0x01),
-            (0x23, 0x34),
-            (0x42, 0x00),
-            (0x44, 0xFF),
-            (0x45, 0x26),
-            (0x46, 0x05),
-            (0x40, 0x40),
-            (0x0E, 0x06),
-            (0x20, 0x1A),
-            (0x43, 0x40),
-            (0xFF, 0x00),
-            (0x34, 0x03),
-            (0x35, 0x44),
-            (0xFF, 0x01),
-            (0x31, 0x04),
-            (0x4B, 0x09),
-            (0x4C, 0x05),
-            (0x4D, 0x04),
-            (0xFF, 0x00),
-            (0x44, 0x00),
-            (0x45, 0x20),
-            (0x47, 0x08),
-            (0x48, 0x28),
-            (0x67, 0x00),
-            (0x70, 0x04),
-            (0x71, 0x01),
-            (0x72, 0xFE),
-            (0x76, 0x00),
-            (0x77, 0x00),
-            (0xFF, 0x01),
-            (0x0D, 0x01),
-            (0xFF, 0x00),
-            (0x80, 0x01),
-            (0x01, 0xF8),
-            (0xFF, 0x01),
-            (0x8E, 0x01),
-            (0x00, 0x01),
-            (0xFF, 0x00),
-            (0x80, 0x00),
-        )
+        self._burst(_TUNING)
 
         self._register(_INTERRUPT_GPIO, 0x04)
         self._flag(_GPIO_MUX_ACTIVE_HIGH, 4, False)
@@ -297,65 +502,43 @@ class VL53L0X:
         # self._register(_SYSTEM_SEQUENCE, 0xe8)
         # self._timing_budget(budget)
 
-        self._register(_SYSTEM_SEQUENCE, 0x01)
-        self._calibrate(0x40)
-        self._register(_SYSTEM_SEQUENCE, 0x02)
-        self._calibrate(0x00)
-
+        await self.calibrate()
         self._register(_SYSTEM_SEQUENCE, 0xE8)
 
-    def _spad_info(self):
-        self._config(
-            (0x80, 0x01),
-            (0xFF, 0x01),
-            (0x00, 0x00),
-            (0xFF, 0x06),
-        )
+    async def _spad_info(self):
+        self._burst(_SPAD_INFO_ENTER)
         self._flag(0x83, 3, True)
-        self._config(
-            (0xFF, 0x07),
-            (0x81, 0x01),
-            (0x80, 0x01),
-            (0x94, 0x6B),
-            (0x83, 0x00),
-        )
+        self._burst(_SPAD_INFO_START)
         for timeout in range(_IO_TIMEOUT):
             if self._register(0x83):
                 break
-            utime.sleep_ms(1)
+            await uasyncio.sleep_ms(1)
         else:
             raise TimeoutError()
-        self._config(
-            (0x83, 0x01),
-        )
+        self._write(0x83, 0x01)
         value = self._register(0x92)
-        self._config(
-            (0x81, 0x00),
-            (0xFF, 0x06),
-        )
+        self._burst(_SPAD_INFO_DONE)
         self._flag(0x83, 3, False)
-        self._config(
-            (0xFF, 0x01),
-            (0x00, 0x01),
-            (0xFF, 0x00),
-            (0x80, 0x00),
-        )
+        self._burst(_SPAD_INFO_EXIT)
         count = value & 0x7F
         is_aperture = bool(value & 0b10000000)
         return count, is_aperture
 
-    def _calibrate(self, vhv_init_byte):
+    async def _calibrate(self, vhv_init_byte):
         self._register(_SYSRANGE_START, 0x01 | vhv_init_byte)
         for timeout in range(_IO_TIMEOUT):
             if self._register(_RESULT_INTERRUPT_STATUS) & 0x07:
                 break
-            utime.sleep_ms(1)
+            await uasyncio.sleep_ms(1)
         else:
             raise TimeoutError()
         self._register(_INTERRUPT_CLEAR, 0x01)
         self._register(_SYSRANGE_START, 0x00)
 
-    def start(self, period=0):
+    def _load_stop_variable(self):
+        """
+        Restore the stop variable read at init, needed before any measurement starts.
+        """
         self._config(
             (0x80, 0x01),
             (0xFF, 0x01),
@@ -365,11 +548,15 @@ class VL53L0X:
             (0xFF, 0x00),
             (0x80, 0x00),
         )
+
+    def start(self, period=0):
+        self._load_stop_variable()
         if period:
             oscilator = self._register(_OSC_CALIBRATE, struct=">H")
             if oscilator:
                 period *= oscilator
-            self._register(_MEASURE_PERIOD, period, struct=">H")
+            # 32 bit register, period * oscillator doesn't fit 16
+            self._register(_MEASURE_PERIOD, period, struct=">I")
             self._register(_SYSRANGE_START, 0x04)
         else:
             self._register(_SYSRANGE_START, 0x02)
@@ -386,16 +573,64 @@ class VL53L0X:
         )
         self._started = False
 
+    async def measure(self):
+        """
+        Single shot measurement, yielding until it's done. Not while ranging.
+
+        Returns:
+            int | None: Range in mm, None if it timed out.
+        """
+        self._load_stop_variable()
+        self._register(_SYSRANGE_START, 0x01)
+        start = utime.ticks_ms()
+        while not self.poll():
+            if utime.ticks_diff(utime.ticks_ms(), start) > _IO_TIMEOUT:
+                return None
+            await uasyncio.sleep_ms(1)
+        return self.range
+
+    async def calibrate(self):
+        """
+        VHV and phase reference calibration, yielding while each one runs. Not while
+        ranging.
+        """
+        sequence = self._register(_SYSTEM_SEQUENCE)
+        self._register(_SYSTEM_SEQUENCE, 0x01)
+        await self._calibrate(0x40)
+        self._register(_SYSTEM_SEQUENCE, 0x02)
+        await self._calibrate(0x00)
+        self._register(_SYSTEM_SEQUENCE, sequence)
+
+    def clear(self):
+        """
+        Drop the measurement waiting in the sensor, so the next one is fresh.
+        """
+        self._register(_INTERRUPT_CLEAR, 0x01)
+
+    def poll(self):
+        """
+        Refresh the cached result with one burst read of the status and range.
+
+        Returns:
+            bool: True if there was a new measurement.
+        """
+        self.i2c.readfrom_mem_into(self.address, _RESULT_INTERRUPT_STATUS, self._result)
+        if not self._result[0] & 0x07:
+            return False
+        r = self._result
+        self.range = (r[_RESULT_RANGE_OFFSET] << 8) | r[_RESULT_RANGE_OFFSET + 1]
+        self.range_ticks = utime.ticks_ms()
+        self.samples += 1
+        self.clear()
+        return True
+
     def read(self):
         if not self._started:
             logger.log("Sensor should already have been started!")
             raise
-        if self._register(_RESULT_INTERRUPT_STATUS) & 0x07:
-            value = self._register(_RESULT_RANGE_STATUS + 10, struct=">H")
-            self._register(_INTERRUPT_CLEAR, 0x01)
-            return value
-        else:
-            return None
+        if self.poll():
+            return self.range
+        return None
 
     def set_signal_rate_limit(self, limit_Mcps):
         if limit_Mcps < 0 or limit_Mcps > 511.99:
@@ -409,25 +644,17 @@ class VL53L0X:
     def encode_Vcsel_period(self, period_pclks):
         return ((period_pclks) >> 1) - 1
 
-    def set_Vcsel_pulse_period(self, type, period_pclks):
+    async def set_Vcsel_pulse_period(self, type, period_pclks):
         vcsel_period_reg = self.encode_Vcsel_period(period_pclks)
 
         self.get_sequence_step_enables()
         self.get_sequence_step_timeouts()
 
         if type == self.vcsel_period_type[0]:
-            if period_pclks == 12:
-                self._register(PRE_RANGE_CONFIG_VALID_PHASE_HIGH, 0x18)
-            elif period_pclks == 14:
-                self._register(PRE_RANGE_CONFIG_VALID_PHASE_HIGH, 0x30)
-            elif period_pclks == 16:
-                self._register(PRE_RANGE_CONFIG_VALID_PHASE_HIGH, 0x40)
-            elif period_pclks == 18:
-                self._register(PRE_RANGE_CONFIG_VALID_PHASE_HIGH, 0x50)
-            else:
+            phase = _PRE_RANGE_VCSEL.get(period_pclks)
+            if phase is None:
                 return False
-
-            self._register(PRE_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
+            self._burst(phase)
             self._register(PRE_RANGE_CONFIG_VCSEL_PERIOD, vcsel_period_reg)
 
             new_pre_range_timeout_mclks = self.timeout_microseconds_to_Mclks(
@@ -436,6 +663,7 @@ class VL53L0X:
             self._register(
                 PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI,
                 self.encode_timeout(new_pre_range_timeout_mclks),
+                struct=">H",
             )
 
             new_msrc_timeout_mclks = self.timeout_microseconds_to_Mclks(
@@ -446,41 +674,10 @@ class VL53L0X:
                 255 if new_msrc_timeout_mclks > 256 else (new_msrc_timeout_mclks - 1),
             )
         elif type == self.vcsel_period_type[1]:
-            if period_pclks == 8:
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, 0x10)
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
-                self._register(GLOBAL_CONFIG_VCSEL_WIDTH, 0x02)
-                self._register(ALGO_PHASECAL_CONFIG_TIMEOUT, 0x0C)
-                self._register(0xFF, 0x01)
-                self._register(ALGO_PHASECAL_LIM, 0x30)
-                self._register(0xFF, 0x00)
-            elif period_pclks == 10:
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, 0x28)
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
-                self._register(GLOBAL_CONFIG_VCSEL_WIDTH, 0x03)
-                self._register(ALGO_PHASECAL_CONFIG_TIMEOUT, 0x09)
-                self._register(0xFF, 0x01)
-                self._register(ALGO_PHASECAL_LIM, 0x20)
-                self._register(0xFF, 0x00)
-            elif period_pclks == 12:
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, 0x38)
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
-                self._register(GLOBAL_CONFIG_VCSEL_WIDTH, 0x03)
-                self._register(ALGO_PHASECAL_CONFIG_TIMEOUT, 0x08)
-                self._register(0xFF, 0x01)
-                self._register(ALGO_PHASECAL_LIM, 0x20)
-                self._register(0xFF, 0x00)
-            elif period_pclks == 14:
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_HIGH, 0x48)
-                self._register(FINAL_RANGE_CONFIG_VALID_PHASE_LOW, 0x08)
-                self._register(GLOBAL_CONFIG_VCSEL_WIDTH, 0x03)
-                self._register(ALGO_PHASECAL_CONFIG_TIMEOUT, 0x07)
-                self._register(0xFF, 0x01)
-                self._register(ALGO_PHASECAL_LIM, 0x20)
-                self._register(0xFF, 0x00)
-            else:
+            phase = _FINAL_RANGE_VCSEL.get(period_pclks)
+            if phase is None:
                 return False
-
+            self._burst(phase)
             self._register(FINAL_RANGE_CONFIG_VCSEL_PERIOD, vcsel_period_reg)
 
             new_final_range_timeout_mclks = self.timeout_microseconds_to_Mclks(
@@ -492,13 +689,14 @@ class VL53L0X:
             self._register(
                 FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI,
                 self.encode_timeout(new_final_range_timeout_mclks),
+                struct=">H",
             )
         else:
             return False
         self.set_measurement_timing_budget(self.measurement_timing_budget_us)
         sequence_config = self._register(SYSTEM_SEQUENCE_CONFIG)
         self._register(SYSTEM_SEQUENCE_CONFIG, 0x02)
-        self.perform_single_ref_calibration(0x0)
+        await self.perform_single_ref_calibration(0x0)
         self._register(SYSTEM_SEQUENCE_CONFIG, sequence_config)
 
         return True
@@ -514,9 +712,13 @@ class VL53L0X:
 
     def get_vcsel_pulse_period(self, type):
         if type == self.vcsel_period_type[0]:
-            return self.decode_Vcsel_period(0x50)
+            return self.decode_Vcsel_period(
+                self._register(PRE_RANGE_CONFIG_VCSEL_PERIOD)
+            )
         elif type == self.vcsel_period_type[1]:
-            return self.decode_Vcsel_period(0x70)
+            return self.decode_Vcsel_period(
+                self._register(FINAL_RANGE_CONFIG_VCSEL_PERIOD)
+            )
         else:
             return 255
 
@@ -532,7 +734,7 @@ class VL53L0X:
             self.timeouts["pre_range_vcsel_period_pclks"],
         )
         self.timeouts["pre_range_mclks"] = self.decode_timeout(
-            PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI
+            self._register(PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI, struct=">H")
         )
         self.timeouts["pre_range_us"] = self.timeout_Mclks_to_microseconds(
             self.timeouts["pre_range_mclks"],
@@ -542,7 +744,7 @@ class VL53L0X:
             self.vcsel_period_type[1]
         )
         self.timeouts["final_range_mclks"] = self.decode_timeout(
-            self._register(FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI)
+            self._register(FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, struct=">H")
         )
 
         if self.enables["pre_range"]:
@@ -554,7 +756,7 @@ class VL53L0X:
 
     def timeout_Mclks_to_microseconds(self, timeout_period_mclks, vcsel_period_pclks):
         macro_period_ns = self.calc_macro_period(vcsel_period_pclks)
-        return ((timeout_period_mclks * macro_period_ns) + (macro_period_ns / 2)) / 1000
+        return ((timeout_period_mclks * macro_period_ns) + 500) / 1000
 
     def timeout_microseconds_to_Mclks(self, timeout_period_us, vcsel_period_pclks):
         macro_period_ns = self.calc_macro_period(vcsel_period_pclks)
@@ -577,12 +779,18 @@ class VL53L0X:
             while (ls_byte & 0xFFFFFF00) > 0:
                 ls_byte >>= 1
                 ms_byte += 1
-            return (ms_byte << 8) or (ls_byte & 0xFF)
+            return (ms_byte << 8) | (ls_byte & 0xFF)
         else:
             return 0
 
     def set_measurement_timing_budget(self, budget_us):
-        start_overhead = 1320
+        """
+        Set how long a measurement may take, shorter is quicker but noisier.
+
+        Returns:
+            bool: False if the budget is under 20 ms or too short for the sequence.
+        """
+        start_overhead = 1910
         end_overhead = 960
         msrc_overhead = 660
         tcc_overhead = 590
@@ -602,8 +810,8 @@ class VL53L0X:
         if self.enables["tcc"]:
             used_budget_us += self.timeouts["msrc_dss_tcc_us"] + tcc_overhead
         if self.enables["dss"]:
-            used_budget_us += 2 * self.timeouts["msrc_dss_tcc_us"] + dss_overhead
-        if self.enables["msrc"]:
+            used_budget_us += 2 * (self.timeouts["msrc_dss_tcc_us"] + dss_overhead)
+        elif self.enables["msrc"]:
             used_budget_us += self.timeouts["msrc_dss_tcc_us"] + msrc_overhead
         if self.enables["pre_range"]:
             used_budget_us += self.timeouts["pre_range_us"] + pre_range_overhead
@@ -622,17 +830,18 @@ class VL53L0X:
             self._register(
                 FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI,
                 self.encode_timeout(final_range_timeout_mclks),
+                struct=">H",
             )
             self.measurement_timing_budget_us = budget_us
         return True
 
-    def perform_single_ref_calibration(self, vhv_init_byte):
+    async def perform_single_ref_calibration(self, vhv_init_byte):
         self._register(SYSRANGE_START, 0x01 | vhv_init_byte)
         chrono_start = utime.ticks_ms()
-        while self._register((RESULT_INTERRUPT_STATUS & 0x07) == 0):
-            time_elapsed = utime.ticks_ms() - chrono_start
-            if time_elapsed > _IO_TIMEOUT:
+        while (self._register(RESULT_INTERRUPT_STATUS) & 0x07) == 0:
+            if utime.ticks_diff(utime.ticks_ms(), chrono_start) > _IO_TIMEOUT:
                 return False
+            await uasyncio.sleep_ms(1)
         self._register(SYSTEM_INTERRUPT_CLEAR, 0x01)
         self._register(SYSRANGE_START, 0x00)
         return True
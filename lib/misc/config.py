@@ -10,9 +10,32 @@ BAY_THRESHOLD = 280
 NUM_TRIGGERS = 3
 MAX_TRIGGERS = 15
 
+# Timed continuous ranging: the ToFs measure every TOF_PERIOD_MS in the background
+# and a poll is one burst read of the status + range. Shorter budget is quicker but
+# noisier, 20 ms is the sensor's minimum. NUM_TRIGGERS of them fit in the junction crawl.
+TOF_CONTINUOUS = True
+TOF_TIMING_BUDGET_US = 20000
+TOF_PERIOD_MS = 20
+# Data ready samples kept per ToF (TOF_DATA_READY_IRQ), oldest dropped when full
+TOF_SAMPLE_BUFFER_SIZE = 8
+# Bay scanning: the bay side ToF streams readings while driving into and along a
+# dropoff row and each bay is decided from the ones between its junction being
+# detected and the end of the crawl, so the turn doesn't wait on samples. Nothing
+# from before the junction, the bays are closer together than the ToF sees so it's
+# still looking at the last one. Bays with fewer than NUM_TRIGGERS are sampled as before.
+TOF_BAY_SCAN = True
+TOF_SCAN_BUFFER_SIZE = 16
+
 
 LED_STROBE_DEBOUNCE = 100
 LED_FLASH_DEBOUNCE = 100
 LED_RESET_TIMEOUT = 1000
 
- 
+
+# Control loop profiling (PROFILE_CONTROL_LOOP in the global config)
+PROFILE_BIN_WIDTH_US = 250
+# Last bin collects everything over (PROFILE_BINS - 1) * PROFILE_BIN_WIDTH_US
+PROFILE_BINS = 40
+# Matches MicroPython's schedule queue depth
+PROFILE_PENDING_SIZE = 8
+PROFILE_PERCENTILES = (50, 90, 99)
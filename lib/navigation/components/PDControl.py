@@ -9,10 +9,12 @@
 ####################################################################################################
 
 # library imports
+from array import array
 from navigation.simple_pid.PID import PID
+from utime import ticks_cpu, ticks_diff  # type: ignore
 
 # local imports
-from navigation.components.utils.PDControl import calculate_error
+from navigation.components.utils.PDControl import ERROR_TABLE_3, calculate_error_mask
 from navigation.config import PD, MAX_PD_CORRECTION
 from config import DEBUG, LOG_LEVELS
 from logger.logger import logger
@@ -27,22 +29,112 @@ class PDControl:
         self.pd.output_limits = (-MAX_PD_CORRECTION, MAX_PD_CORRECTION)
 
     # TODO: When is correction None?
-    def calculate_correction(self, line_sensor_readings: list[int]) -> float:
-        error = calculate_error(line_sensor_readings)
+    def calculate_correction(self, mask: int) -> float:
+        error = calculate_error_mask(mask)
         correction = self.pd(error)
         # Bit verbose but will improve perf when not logging
         if DEBUG:
             logger.log(
-                "line_sensor_readings: {} error: {}, correction: {}",
-                line_sensor_readings,
+                "line_sensor_readings: {:04b} error: {}, correction: {}",
+                mask,
                 error,
                 correction,
                 level=LOG_LEVELS.TRACE,
             )
         return correction or 0
 
+    def set_tunings(self, kp, ki, kd):
+        """
+        Set the controller gains.
+        """
+        self.pd.tunings = (kp, ki, kd)
+
+    def set_output_limit(self, limit):
+        """
+        Clamp the correction to +-limit.
+        """
+        self.pd.output_limits = (-limit, limit)
+
     def reset(self):
         """
         Reset internal PID state, typically after a junction or restart.
         """
         self.pd.set_auto_mode(True, 0)
+
+
+# Fractional bits of the fixed point controller
+FIXED_POINT_SHIFT = 8
+
+
+class fixedPDControl:
+    """
+    Integer-only PD for the line sensor bitmask, drop-in for PDControl.
+
+    With only 16 possible readings the proportional term is a table lookup, the
+    derivative works on 3x the error (always an int) over ticks_cpu like simple_pid
+    with scale="cpu". Output is the correction rounded to an int.
+    """
+    def __init__(self):
+        self._p_table = array("i", [0] * 16)
+        self._limit = MAX_PD_CORRECTION << FIXED_POINT_SHIFT
+        # Last reading with the line in it, held while the line is lost
+        self._held = 0
+        self.set_tunings(PD.KP, PD.KI, PD.KD)
+        self.reset()
+
+    def set_tunings(self, kp, ki, kd):
+        """
+        Set the controller gains, rebuilding the proportional table.
+        """
+        if ki:
+            raise ValueError("fixedPDControl has no integral term")
+        one = 1 << FIXED_POINT_SHIFT
+        for mask in range(16):
+            # simple_pid works on error = setpoint - input with the setpoint at 0
+            self._p_table[mask] = -round(kp * ERROR_TABLE_3[mask] * one / 3)
+        # Derivative gain per unit of 3x the error
+        self._kd3 = round(kd * one / 3)
+
+    def set_output_limit(self, limit):
+        """
+        Clamp the correction to +-limit.
+        """
+        self._limit = round(limit * (1 << FIXED_POINT_SHIFT))
+
+    def calculate_correction(self, mask: int) -> int:
+        if mask:
+            self._held = mask
+        else:
+            # Line lost, hold the last error like calculate_error
+            mask = self._held
+        e3 = ERROR_TABLE_3[mask]
+
+        out = self._p_table[mask]
+        now = ticks_cpu()
+        if self._kd3 and self._prev_e3 is not None:
+            dt = ticks_diff(now, self._last_time) or 1
+            out -= self._kd3 * (e3 - self._prev_e3) // dt
+        self._prev_e3 = e3
+        self._last_time = now
+
+        if out > self._limit:
+            out = self._limit
+        elif out < -self._limit:
+            out = -self._limit
+        correction = (out + (1 << (FIXED_POINT_SHIFT - 1))) >> FIXED_POINT_SHIFT
+        if DEBUG:
+            logger.log(
+                "line_sensor_readings: {:04b} error: {}, correction: {}",
+                mask,
+                e3 / 3,
+                correction,
+                level=LOG_LEVELS.TRACE,
+            )
+        return correction
+
+    def reset(self):
+        """
+        Reset the derivative history, typically after a junction or restart.
+        """
+        self._prev_e3 = None
+        self._last_time = ticks_cpu()
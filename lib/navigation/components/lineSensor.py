@@ -14,10 +14,15 @@ from utime import sleep_ms  # type: ignore
 from navigation.components.types.lineSensor import LineSensor
 from config import (
     LINE_SENSOR_PINS,
+    LINE_SENSOR_PIO,
+    LINE_SENSOR_PIO_RATE,
+    LINE_SENSOR_PIO_SAMPLES,
+    LINE_SENSOR_PIO_SM,
     MOVING_AVERAGE_HISTORY_SIZE,
     MOVING_AVERAGE_THRESHOLD,
 )
-from navigation.components.utils.movingAverage import movingAverage
+from navigation.components.utils.movingAverage import mask_moving_average
+from navigation.config import INNER_MASK, OUTER_MASK
 
 
 class lineSensor:
@@ -40,6 +45,11 @@ class lineSensorArray:
     """
     Manages the full array of line sensors, including moving average
     smoothing and rising-edge detection.
+
+    Readings are kept as a bitmask (bits as in LineSensor in the navigation config,
+    outer left is the top bit) so the per tick path doesn't allocate. With
+    LINE_SENSOR_PIO the pins are oversampled by a PIO state machine instead of
+    being read once a tick.
     """
     def __init__(self):
         outer_left = lineSensor(LineSensor.OUTER_LEFT)
@@ -52,40 +62,123 @@ class lineSensorArray:
         self.i_t = False
 
         self.line_sensor_arr = (outer_left, inner_left, inner_right, outer_right)
-        self.average: movingAverage = movingAverage(size=MOVING_AVERAGE_HISTORY_SIZE)
-
-        self.curr = (0, 0, 0, 0)
-
-    def _read(self) -> tuple[int]:
+        # Pins directly, saves a call per sensor per tick
+        self._ol = outer_left.pin
+        self._il = inner_left.pin
+        self._ir = inner_right.pin
+        self._or = outer_right.pin
+        # Picks the filter from the history size
+        self.average = mask_moving_average(
+            MOVING_AVERAGE_HISTORY_SIZE, MOVING_AVERAGE_THRESHOLD
+        )
+
+        # Filtered bitmask, the one at the last rising edge update and the bits
+        # that have come on since
+        self.mask = 0
+        self.prev = 0
+        self.edges = 0
+
+        if LINE_SENSOR_PIO:
+            self._start_pio()
+            self._read = self._read_pio
+        else:
+            self._read = self._read_pins
+
+    def _start_pio(self):
+        """
+        Start the state machine oversampling the sensors into its FIFO.
+        """
+        # Only imported when used, needs rp2
+        import rp2  # type: ignore
+        from navigation.components.utils.lineSensorPIO import (
+            PIO_CYCLES_PER_SAMPLE,
+            majority,
+            sample_line_sensors,
+        )
+
+        base = LINE_SENSOR_PINS[LineSensor.OUTER_RIGHT]
+        if (
+            LINE_SENSOR_PINS[LineSensor.INNER_RIGHT] != base + 1
+            or LINE_SENSOR_PINS[LineSensor.INNER_LEFT] != base + 2
+            or LINE_SENSOR_PINS[LineSensor.OUTER_LEFT] != base + 3
+        ):
+            raise ValueError("PIO line sensing needs consecutive pins, outer right lowest")
+
+        self._majority = majority
+        # Last word's reading, kept if the FIFO is empty on a tick
+        self._raw = 0
+        self._sm = rp2.StateMachine(
+            LINE_SENSOR_PIO_SM,
+            sample_line_sensors,
+            freq=LINE_SENSOR_PIO_RATE * PIO_CYCLES_PER_SAMPLE,
+            in_base=self._or,
+        )
+        self._sm.active(1)
+
+    def _read_pins(self) -> int:
         """
         Read raw digital values from all sensors.
 
         Returns:
-            tuple[int, int, int, int]: Raw readings (0 or 1) for each sensor.
+            int: Raw readings as a bitmask.
+        """
+        return (
+            (self._ol.value() << 3)
+            | (self._il.value() << 2)
+            | (self._ir.value() << 1)
+            | self._or.value()
+        )
+
+    def _read_pio(self) -> int:
+        """
+        Drain the PIO FIFO and majority vote the newest word.
+
+        Returns:
+            int: Readings as a bitmask, the last ones if no word came in.
+        """
+        sm = self._sm
+        if sm.rx_fifo():
+            word = sm.get()
+            while sm.rx_fifo():
+                word = sm.get()
+            self._raw = self._majority(word, LINE_SENSOR_PIO_SAMPLES)
+        return self._raw
+
+    def read_mask(self) -> int:
+        """Returns the line sensor bitmask with a small moving average.
+
+        Also updates the edge bits.
         """
-        values = (ls.read() for ls in self.line_sensor_arr)
-        return tuple(values)
-        # tuple of size 4 of 0 or 1 for each sensor
+        self.average.add(self._read())
+        mask = self.average.clamp()
+        self.mask = mask
+        self.edges = mask & ~self.prev
+        return mask
 
     def state(self) -> tuple[int, ...]:
         """Returns the line sensor state with a small moving average.
 
-        Also updates the rising edge detection.
+        Allocates a tuple - use read_mask() in the control loop.
         """
-        values = self._read()
-        self.average.add(values)
-
-        self.curr = self.average.clamp(MOVING_AVERAGE_THRESHOLD)
-
+        self.read_mask()
         return self.curr
 
+    @property
+    def curr(self) -> tuple[int, ...]:
+        """
+        Current filtered readings as (lo, li, ri, ro).
+        """
+        mask = self.mask
+        return ((mask >> 3) & 1, (mask >> 2) & 1, (mask >> 1) & 1, mask & 1)
+
     def update_rising_edge(self):
         """
         Update cached rising-edge flags for outer and inner sensors.
         """
-        lo, li, ri, ro = self.curr
-        self.o_t = lo or ro
-        self.i_t = li and ri
+        mask = self.mask
+        self.prev = mask
+        self.o_t = (mask & OUTER_MASK) != 0
+        self.i_t = (mask & INNER_MASK) == INNER_MASK
 
     @property
     def rising_edge(self):
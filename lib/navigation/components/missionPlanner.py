@@ -0,0 +1,215 @@
+####################################################################################################
+#
+# Logic related to mission planning.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Picks the order of pickups, the bay to aim for in each dropoff row and when to head
+back to S, on expected travel times from the route table.
+
+Which reel is at a pickup isn't known until it's in the jaw, so a delivery is the
+mean over the REEL_DROP_NODE rows. That makes every cycle after the one we're about
+to start cost the same whatever came before it - the reel decides where we end up -
+so the cheapest cycles first fits the most reels in. Only the first one depends on
+where we are now, so each pickup is tried first in turn and the one that fits the
+most reels in before having to head back (quickest on a tie) wins.
+"""
+
+from config import END_FORWARD_TIME
+from logger.logger import logger
+from navigation.config import (
+    JUNCTION_TIME,
+    MISSION_DROPOFF_TIME,
+    MISSION_PICKUP_TIME,
+    REEL_DROP_NODE,
+    REELS_PER_PICKUP,
+)
+from navigation.components.pathfinding import pathfinding
+from navigation.components.types.navigation import JunctionOptions, NodeKind
+from navigation.components.utils.graph import (
+    DROPOFF_DIR,
+    EDGE_TIME,
+    NODE_KIND,
+    NODE_NAMES,
+    NO_NODE,
+    NUM_NODES,
+    neighbour,
+    node_id,
+)
+
+S = node_id("S")
+
+
+class missionPlanner:
+    """
+    Chooses the next pickup for the time left in the run, None meaning head back to S.
+    """
+    def __init__(self, nav):
+        self._nav = nav
+        # Reels left at each pickup node
+        self.reels_left = {
+            node: REELS_PER_PICKUP
+            for node in range(NUM_NODES)
+            if NODE_KIND[node] & NodeKind.PICKUP
+        }
+        # Per row: (row start, [(junction, bay, ms from the row start into the bay)])
+        self._rows = [self._row(start, end) for start, end in REEL_DROP_NODE.values()]
+
+    @staticmethod
+    def _row(start, end):
+        """
+        Bays along a dropoff row in the order the dropoff drives past them.
+        """
+        start = node_id(start)
+        end = node_id(end)
+        straight = JUNCTION_TIME[JunctionOptions.GO_STRAIGHT]
+        for heading in range(4):
+            bays = []
+            node = start
+            time = 0
+            while node != NO_NODE and DROPOFF_DIR[node] != NO_NODE:
+                bay_dir = DROPOFF_DIR[node]
+                turn, _ = pathfinding.compute_turn(heading, bay_dir)
+                bays.append(
+                    (
+                        node,
+                        neighbour(node, bay_dir),
+                        time + JUNCTION_TIME[turn] + EDGE_TIME[node * 4 + bay_dir],
+                    )
+                )
+                if node == end:
+                    return start, bays
+                time += straight + EDGE_TIME[node * 4 + heading]
+                node = neighbour(node, heading)
+        raise ValueError("No row from {} to {}".format(start, end))
+
+    def _bay(self, bays):
+        """
+        First bay along a row not known to be occupied, the last one if they all are.
+
+        Returns:
+            tuple[int, int, int]: Junction, bay and ms from the row start into the bay.
+        """
+        scanned = self._nav.bay_scan
+        for bay in bays:
+            junction = bay[0]
+            if junction not in self._nav.delivered_bays and not scanned.get(junction):
+                return bay
+        return bays[-1]
+
+    def _cycle_times(self, bays):
+        """
+        Expected ms from each pickup to a reel delivered, from a delivery to each
+        pickup and from a delivery back to S, meaned over the rows we can get round.
+        Pickups we can't get to or from are left out.
+        """
+        nav = self._nav
+        deliver = {}
+        fetch = {}
+        for pickup in self.reels_left:
+            # We face into a pickup when we get there, its only way out behind us
+            facing = (_exit(pickup) + 2) & 3
+            to_row = []
+            from_row = []
+            for (start, _), (junction, bay, row_time) in zip(self._rows, bays):
+                time = nav.route_time(pickup, start, facing)
+                to_row.append(None if time is None else time + row_time)
+                from_row.append(nav.route_time(bay, pickup, DROPOFF_DIR[junction]))
+            to_row = _mean(to_row)
+            from_row = _mean(from_row)
+            if to_row is None or from_row is None:
+                continue
+            deliver[pickup] = MISSION_PICKUP_TIME + MISSION_DROPOFF_TIME + to_row
+            fetch[pickup] = from_row
+        home = _mean(
+            nav.route_time(bay, S, DROPOFF_DIR[junction]) for junction, bay, _ in bays
+        )
+        return deliver, fetch, END_FORWARD_TIME + (home or 0)
+
+    def next_pickup(self, node: int, orientation: int, time_left: int):
+        """
+        Pickup to go to next, taking a reel off it.
+
+        Args:
+            node (int): Node we're at.
+            orientation (int): Orientation we're in.
+            time_left (int): ms left in the run.
+
+        Returns:
+            int | None: Pickup node ID, None to head back to S.
+        """
+        bays = [self._bay(bays) for _, bays in self._rows]
+        deliver, fetch, home = self._cycle_times(bays)
+        cycle = {pickup: fetch[pickup] + deliver[pickup] for pickup in deliver}
+
+        best = None
+        best_reels = 0
+        best_time = 0
+        for first, left in self.reels_left.items():
+            if not left or first not in cycle:
+                continue
+            to_first = self._nav.route_time(node, first, orientation)
+            if to_first is None:
+                continue
+            time = to_first + deliver[first]
+            if time + home > time_left:
+                continue
+            # Then the cheapest cycles for as long as there's time
+            rest = sorted(
+                cycle[pickup]
+                for pickup, n in self.reels_left.items()
+                if pickup in cycle
+                for _ in range(n - (pickup == first))
+            )
+            reels = 1
+            for ms in rest:
+                if time + ms + home > time_left:
+                    break
+                time += ms
+                reels += 1
+            if reels > best_reels or (reels == best_reels and time < best_time):
+                best = first
+                best_reels = reels
+                best_time = time
+
+        if best is None:
+            if any(self.reels_left.values()):
+                logger.log("Mission: no reel fits in {} ms, heading back", time_left)
+            else:
+                logger.log("Mission: all reels delivered, heading back")
+            return None
+        self.reels_left[best] -= 1
+        logger.log(
+            "Mission: {} next, {} reels in {} ms of {}",
+            NODE_NAMES[best],
+            best_reels,
+            best_time + home,
+            time_left,
+        )
+        return best
+
+
+def _exit(node: int) -> int:
+    """
+    Orientation of the only way out of a dead end node.
+    """
+    for d in range(4):
+        if neighbour(node, d) != NO_NODE:
+            return d
+    raise ValueError("{} has no way out".format(NODE_NAMES[node]))
+
+
+def _mean(times):
+    """
+    Mean of the route times that aren't None, None if they all are.
+    """
+    total = 0
+    n = 0
+    for time in times:
+        if time is not None:
+            total += time
+            n += 1
+    return total // n if n else None
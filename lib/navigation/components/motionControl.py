@@ -9,25 +9,38 @@
 # Machine imports
 from config import LOG_LEVELS
 from navigation.components.types.navigation import JunctionOptions
-from utime import ticks_ms, ticks_diff  # type: ignore
+from utime import ticks_add, ticks_ms, ticks_diff  # type: ignore
 
 # Local imports
-from navigation.state import LineState
+from navigation.state import LineSearchState, LineState
 from navigation.components.motorController import motorController
-from navigation.components.PDControl import PDControl
+from navigation.components.PDControl import PDControl, fixedPDControl
 from navigation.components.lineSensor import lineSensorArray
 from navigation.components.utils.motionControl import junction_detection, line_detection
+from navigation.components.utils.PDControl import ERROR_TABLE_3
+from navigation.components.utils.gainSchedule import scheduled_gains
 from logger.logger import logger
 from navigation.config import (
+    INNER_LEFT_MASK,
+    INNER_MASK,
+    INNER_RIGHT_MASK,
+    OUTER_MASK,
     JUNCTION_TURN_GRACE_PERIOD,
     ROBOT_SPEED,
+    CRUISE_SPEED,
+    SPEED_RAMP_STEP,
     JUNCTION_FORWARD_TIME,
     REVERSE_GRACE_MULTIPLIER,
+    LINE_LOST_TIME,
+    LINE_SEARCH_SWEEP_TIME,
+    LINE_SEARCH_BACK_TIME,
     PD,
+    FIXED_POINT_PD,
 )
 
 # Type imports
-from navigation.components.types.motor import Motor
+from navigation.components.types.motor import Direction, Motor
+from navigation.components.types.motionControl import LineEvent
 
 # State import
 from navigation.state import MotionState as State
@@ -39,7 +52,7 @@ class motion:
     junction handling, turning, and PD-based correction.
     """
     def __init__(self):
-        self.pd = PDControl()
+        self.pd = fixedPDControl() if FIXED_POINT_PD else PDControl()
 
         self.left = motorController(motor=Motor.LEFT)
         self.right = motorController(motor=Motor.RIGHT)
@@ -52,12 +65,33 @@ class motion:
 
         # TODO: Maybe collapse into a junction state dict or similar
         self.junction_start = None
+        # Outer sensors that saw a line from the detection to the end of the crawl
+        self.junction_mask = 0
         self.junction_turn_start = None
         self.junction_turn_type = None
         self.last_turn_time = None
         self.u_turn_counter = 0
 
         self.reversing = False
+        # PD gains last applied from the schedule
+        self._gains = None
+        # End of the current cruise (ticks_ms), None when not cruising
+        self._cruise_until = None
+
+        # Line lost recovery: when every sensor went off the line following it,
+        # the last reading with the line in it (which side it went) and the search
+        self._off_line_start = None
+        self._line_mask = 0
+        self._lost_start = None
+        self._search_state = None
+        self._search_start = None
+        self._sweep_left = False
+        # Power to follow the line at again once it's found
+        self._search_power = ROBOT_SPEED
+        # Last LineEvent for navigation, see pop_line_event
+        self.line_event = None
+        # How long the line was lost for, set when it's found again
+        self.line_lost_time = 0
 
     @property
     def state(self):
@@ -90,14 +124,31 @@ class motion:
         logger.log("Motion: Received reverse command", level=LOG_LEVELS.DEBUG)
         self.state = State.FOLLOWING_LINE
         self.reversing = True
+        self._cruise_until = None
         self._reverse(power)
 
+    def cruise(self, duration: int):
+        """
+        Ramp up to CRUISE_SPEED while following the line forwards, then back down to
+        ROBOT_SPEED once duration is up.
+
+        Carries on through straight junctions, stop, reverse and turns cancel it.
+
+        Args:
+            duration (int): Time to cruise for in ms.
+        """
+        if duration <= 0:
+            return
+        logger.log("Motion: cruising for {} ms", duration, level=LOG_LEVELS.DEBUG)
+        self._cruise_until = ticks_add(ticks_ms(), duration)
+
     def stop(self):
         """
         Immediately stop both motors and enter REST state.
         """
         logger.log("Motion: Received stop command", level=LOG_LEVELS.DEBUG)
         self.state = State.REST
+        self._cruise_until = None
         self._stop()
 
     def turn_left(self, power: int = ROBOT_SPEED):
@@ -111,6 +162,7 @@ class motion:
         # Get a start time for the junction grace period
         self.junction_turn_start = ticks_ms()
         self.junction_turn_type = JunctionOptions.GO_LEFT
+        self._cruise_until = None
         self.left.reverse(power)
         logger.log("Motion: left {} {}", self.junction_turn_start, self.state)
         self.right.forward(power)
@@ -123,6 +175,7 @@ class motion:
         # Get a start time for the junction grace period
         self.junction_turn_start = ticks_ms()
         self.junction_turn_type = JunctionOptions.GO_RIGHT
+        self._cruise_until = None
         logger.log("Motion: right {} {}", self.junction_turn_start, self.state)
         self.left.forward(power)
         self.right.reverse(power)
@@ -149,6 +202,7 @@ class motion:
         logger.log("Motion: Received u_turn command", level=LOG_LEVELS.DEBUG)
         self.junction_turn_start = ticks_ms()
         self.junction_turn_type = JunctionOptions.U_TURN
+        self._cruise_until = None
         if not opposite:
             self.left.reverse(power)
             self.right.forward(power)
@@ -156,6 +210,44 @@ class motion:
             self.left.forward(power)
             self.right.reverse(power)
 
+    def search(self):
+        """
+        Look for a lost line: pivot towards the side it was last seen on, back to
+        where we were, then back off the way we came.
+
+        Follows the line again if an inner sensor finds it (LineEvent.FOUND), stops
+        if it runs out of time (LineEvent.GAVE_UP).
+        """
+        logger.log("Motion: line lost, searching", level=LOG_LEVELS.DEBUG)
+        now = ticks_ms()
+        self._lost_start = now if self._off_line_start is None else self._off_line_start
+        # Not back up to a cruise, there's no ramp without one
+        self._search_power = min(abs(self.left.base_power), ROBOT_SPEED) or ROBOT_SPEED
+        self._cruise_until = None
+        # Given up on any junction we were going through
+        self.junction_turn_type = None
+        self.junction_turn_start = None
+        self.state = State.LINE_LOST
+        self.line_event = LineEvent.LOST
+        side = ERROR_TABLE_3[self._line_mask]
+        if side:
+            self._sweep_left = side < 0
+            self._set_search(LineSearchState.SWEEP)
+        else:
+            # Last seen dead ahead, it's behind us
+            self._set_search(LineSearchState.BACK_OFF)
+
+    def pop_line_event(self):
+        """
+        The last LineEvent, clearing it.
+
+        Returns:
+            str | None: LineEvent, None if nothing happened since the last call.
+        """
+        event = self.line_event
+        self.line_event = None
+        return event
+
     ############# PRIVATE METHODS - DO NOT USE OUTSIDE #############
 
     def _forward(self, power: int = ROBOT_SPEED):
@@ -163,7 +255,7 @@ class motion:
         Internal motor drive: set both motors forward and apply PD tunings.
         """
         logger.log("Motion: internal forward", level=LOG_LEVELS.DEBUG)
-        self.pd.pd.tunings = (PD.KP, PD.KI, PD.KD)
+        self._schedule_gains(power, Direction.FORWARD)
         self.left.forward(power)
         self.right.forward(power)
 
@@ -172,10 +264,48 @@ class motion:
         Internal motor drive: set both motors in reverse and apply PD tunings.
         """
         logger.log("Motion: internal reverse", level=LOG_LEVELS.DEBUG)
-        self.pd.pd.tunings = (PD.KP * 0.25, PD.KI, PD.KD * 0.25)
+        self._schedule_gains(power, Direction.REVERSE)
         self.left.reverse(power)
         self.right.reverse(power)
 
+    def _schedule_gains(self, power: int, direction: int):
+        """
+        Internal: Apply the scheduled PD gains for a power / direction if they changed.
+        """
+        gains = scheduled_gains(power, direction)
+        if gains == self._gains:
+            return
+        self._gains = gains
+        kp, kd, limit = gains
+        self.pd.set_tunings(kp, PD.KI, kd)
+        self.pd.set_output_limit(limit)
+        logger.log("Motion: PD gains {}", gains, level=LOG_LEVELS.DEBUG)
+
+    def _ramp(self):
+        """
+        Internal: Step the base power towards the cruise target, dropping the cruise
+        once it's over and we're back at ROBOT_SPEED.
+        """
+        power = self.left.base_power
+        if ticks_diff(self._cruise_until, ticks_ms()) > 0:
+            target = CRUISE_SPEED
+        elif power == ROBOT_SPEED:
+            logger.log("Motion: cruise over", level=LOG_LEVELS.DEBUG)
+            self._cruise_until = None
+            return
+        else:
+            target = ROBOT_SPEED
+        if power == target:
+            return
+        if power < target:
+            power = min(power + SPEED_RAMP_STEP, target)
+        else:
+            power = max(power - SPEED_RAMP_STEP, target)
+        self._schedule_gains(power, Direction.FORWARD)
+        # PD corrects around the base power, _update_pd sets the duty
+        self.left.base_power = power
+        self.right.base_power = power
+
     def _stop(self):
         """
         Internal stop: set both motors to zero power.
@@ -184,50 +314,129 @@ class motion:
         self.left.forward(0)
         self.right.forward(0)
 
+    def _set_search(self, search_state: str):
+        """
+        Internal: Start a phase of the line search, driving the motors for it.
+        """
+        logger.log("Motion: line search {}", search_state, level=LOG_LEVELS.DEBUG)
+        self._search_state = search_state
+        self._search_start = ticks_ms()
+        if search_state == LineSearchState.BACK_OFF:
+            if self.reversing:
+                self._forward()
+            else:
+                self._reverse()
+            return
+        left = self._sweep_left != (search_state == LineSearchState.SWEEP_BACK)
+        if left:
+            self.left.reverse()
+            self.right.forward()
+        else:
+            self.left.forward()
+            self.right.reverse()
+
+    def _search(self, mask):
+        """
+        Internal: Step the line search, handing back to line following once an inner
+        sensor is on the line.
+        """
+        now = ticks_ms()
+        if mask & INNER_MASK:
+            self.line_lost_time = ticks_diff(now, self._lost_start)
+            logger.log(
+                "Motion: found the line after {} ms {:04b}",
+                self.line_lost_time,
+                mask,
+                level=LOG_LEVELS.DEBUG,
+            )
+            self._search_state = None
+            self.line_event = LineEvent.FOUND
+            self.state = State.FOLLOWING_LINE
+            if self.reversing:
+                self._reverse(self._search_power)
+            else:
+                self._forward(self._search_power)
+            return
+        elapsed = ticks_diff(now, self._search_start)
+        if self._search_state == LineSearchState.SWEEP:
+            if elapsed > LINE_SEARCH_SWEEP_TIME:
+                self._set_search(LineSearchState.SWEEP_BACK)
+        elif self._search_state == LineSearchState.SWEEP_BACK:
+            # Same time back so we back off along the way we came
+            if elapsed > LINE_SEARCH_SWEEP_TIME:
+                self._set_search(LineSearchState.BACK_OFF)
+        elif elapsed > LINE_SEARCH_BACK_TIME:
+            logger.log("Motion: couldn't find the line", level=LOG_LEVELS.DEBUG)
+            self._search_state = None
+            self.line_event = LineEvent.GAVE_UP
+            self.stop()
+
     def _turn_handle(self):
         """
         Internal handler to prime state for turn execution.
         """
         self.state = State.JUNCTION
 
-    def _update_pd(self, lsrs):
+    def _update_pd(self, mask):
         """
         Internal: Update motor powers using PD correction based on line sensor readings.
         """
-        correction = self.pd.calculate_correction(lsrs)
+        correction = self.pd.calculate_correction(mask)
         self.left.correct_power(-correction)
         self.right.correct_power(correction)
 
-    def _update(self, lsrs, o_t):
+    def _update(self, mask, o_t):
         """
         Internal: Handle line following and junction detection logic.
         """
-        lo, _, _, ro = lsrs
         # Ignore inner sensors for junction detection
         # ONLY true if not already triggered and current reading is 1
-        self.junction_start = junction_detection((lo or ro) and not o_t)
+        self.junction_start = junction_detection(mask & OUTER_MASK and not o_t)
 
         if self.junction_start is not None:
             # We're at a junction, set PRE_JUNCTION state & crawl forward with the robot until nav decides what to do
             self.state = State.PRE_JUNCTION
+            self.junction_mask = mask & OUTER_MASK
             # TODO: Tune power
             self._forward()
             logger.log(
-                "Motion: detected junction, crawling {}",
-                lsrs,
+                "Motion: detected junction, crawling {:04b}",
+                mask,
                 level=LOG_LEVELS.DEBUG,
             )
             return
-        self._update_pd(lsrs)
+        if self._off_line(mask):
+            self.search()
+            return
+        if self._cruise_until is not None and not self.reversing:
+            self._ramp()
+        self._update_pd(mask)
 
-    def _line_detection(self, lsrs, i_t):
+    def _off_line(self, mask) -> bool:
+        """
+        Internal: Track the last mask with the line in it, whether every sensor has
+        been off it for LINE_LOST_TIME.
+        """
+        if mask:
+            self._line_mask = mask
+            self._off_line_start = None
+        elif self._off_line_start is None:
+            self._off_line_start = ticks_ms()
+        elif ticks_diff(ticks_ms(), self._off_line_start) > LINE_LOST_TIME:
+            return True
+        return False
+
+    def _line_detection(self, mask, i_t):
         """
         Internal: Detect line state during junction handling and update state accordingly.
         """
-        _, li, ri, _ = lsrs
         # Straight doesn't turn so accept either line sensor
         self.line_state = line_detection(
-            li, ri, i_t, self.junction_turn_type, self.junction_turn_start
+            mask & INNER_LEFT_MASK,
+            mask & INNER_RIGHT_MASK,
+            i_t,
+            self.junction_turn_type,
+            self.junction_turn_start,
         )
         if self.line_state == LineState.CENTERED:
             if (
@@ -239,7 +448,7 @@ class motion:
                     < JUNCTION_TURN_GRACE_PERIOD * 2.5
                 ):
                     return
-            logger.log("Motion: successful junction {}", lsrs, level=LOG_LEVELS.DEBUG)
+            logger.log("Motion: successful junction {:04b}", mask, level=LOG_LEVELS.DEBUG)
             # Stop turning
             # TODO: Quick enough we don't need this?
             #       Could add a better handler to just start on the next command
@@ -257,20 +466,21 @@ class motion:
         if self.state_transition:
             # Reset the PD controller on state transition
             self.pd.reset()
+            self._off_line_start = None
             self.state_transition = False
 
         if self.state == State.REST:
             # Nothing to do
             return
 
-        # Get fresh line sensor values
-        lsrs = self.lsa.state()
-        o_t, i_t = self.lsa.rising_edge
+        # Get fresh line sensor values, as a bitmask so nothing is allocated
+        mask = self.lsa.read_mask()
         if self.state == State.FOLLOWING_LINE:
             # No junction, keep moving & correcting
-            self._update(lsrs, o_t)
+            self._update(mask, self.lsa.o_t)
         elif self.state == State.PRE_JUNCTION:
-            lo, _, _, ro = lsrs
+            # Which sides the junction has, for navigation to check against the map
+            self.junction_mask |= mask & OUTER_MASK
             # Either both see black OR threshold reached...
             # TODO: Test!
             diff = ticks_diff(ticks_ms(), self.junction_start)
@@ -280,19 +490,25 @@ class motion:
             if diff > JUNCTION_FORWARD_TIME * grace_mult:
                 # Aligned in the forwards direction, transition to TURN
                 logger.log(
-                    "Motion control: Transitioning from PRE_JUNCTION to JUNCTION after grace! {}",
-                    lsrs,
+                    "Motion control: Transitioning from PRE_JUNCTION to JUNCTION after grace! {:04b}",
+                    mask,
                     level=LOG_LEVELS.DEBUG,
                 )
                 self.state = State.JUNCTION
                 # TODO: Might not be necessary?
                 # self._stop()
         elif self.state == State.JUNCTION:
-            # Junction, go into line detection mode
-            # self.junction_turn_start might be None here but that's fine
-            self._line_detection(lsrs, i_t)
+            # Junction, go into line detection mode once navigation has said what to
+            # do - until then there's no turn to time (e.g. a pad while dropping off)
+            if self.junction_turn_start is not None:
+                straight = self.junction_turn_type == JunctionOptions.GO_STRAIGHT
+                if straight and self._off_line(mask):
+                    # Nothing on the other side, don't drive off open loop
+                    self.search()
+                else:
+                    self._line_detection(mask, self.lsa.i_t)
+        elif self.state == State.LINE_LOST:
+            self._search(mask)
         # Update rising edge detection - last so we don't miss it!
         self.lsa.update_rising_edge()
 
-
-# TODO: Could add recovery state here?
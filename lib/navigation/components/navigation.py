@@ -7,19 +7,52 @@
 ####################################################################################################
 
 # Machine imports
+from misc.config import TOF_BAY_SCAN
 from misc.state import ToFState
-from navigation.config import DROP_OFF_FORWARD_TIME, NODE_MAP
-from utime import ticks_diff, ticks_ms  # type: ignore
+from navigation.config import (
+    DROP_OFF_FORWARD_TIME,
+    EDGE_BLOCK_TIME,
+    LINE_MAX_SEARCHES,
+    LOCALISATION,
+    REEL_DROP_NODE,
+    ROUTE_CACHE_SLOTS,
+    SPEED_PROFILE,
+)
+from utime import ticks_add, ticks_diff, ticks_ms  # type: ignore
 
 # Local imports
-from config import LOG_LEVELS
+from config import DEBUG, LOG_LEVELS
 from logger.logger import logger
 from navigation.components.motionControl import motion
 from navigation.components.pathfinding import pathfinding
+from navigation.components.utils.localisation import locate
+from navigation.components.utils.routeCache import (
+    routeCache,
+    route_orientation,
+    route_steps,
+    route_time,
+)
+from navigation.components.utils.speedProfile import cruise_time
+from navigation.components.utils.graph import (
+    DROPOFF_DIR,
+    NO_NODE,
+    NODE_IDS,
+    NODE_KIND,
+    NODE_NAMES,
+    NUM_NODES,
+    ORIENTATION_NAMES,
+    neighbour,
+    node_id,
+)
 from misc.components.tof_VL53L0X import tofs
 
 # Type imports
-from navigation.components.types.navigation import JunctionOptions
+from navigation.components.types.motionControl import LineEvent
+from navigation.components.types.navigation import (
+    JunctionOptions,
+    NodeKind,
+    Orientation,
+)
 
 # State imports
 from navigation.state import (
@@ -29,6 +62,10 @@ from navigation.state import (
     MotionState,
 )
 
+START_BOX = NODE_IDS["START_BOX"]
+S = NODE_IDS["S"]
+P4 = NODE_IDS["P4"]
+
 
 class navigation:
     """
@@ -37,6 +74,14 @@ class navigation:
     """
     def __init__(self):
         self._pathfinding = pathfinding()
+        # Build the routes to everywhere we set a route to now, not mid run
+        self._pathfinding.table.precompute(
+            [node for node in range(NUM_NODES) if NODE_KIND[node] & NodeKind.PICKUP]
+            + [node_id(start) for start, _ in REEL_DROP_NODE.values()]
+            + [S, START_BOX]
+        )
+        # Walked routes by (start, dest, orientation), see _route
+        self._routes = routeCache(ROUTE_CACHE_SLOTS)
         self._motion = motion()
         self._state = State.FOLLOWING_PATH
         self._path_following_state = PathFollowingState.REST
@@ -45,14 +90,31 @@ class navigation:
 
         self.route = None
         self.start_node = None
-        self.current_node: str = "START_BOX"
-        self.current_orientation: str = "N"
+        # Destination of the route being followed, for the speed profile
+        self.route_dest = None
+        self.pending_node = None
+        self.pending_orientation = None
+        self.pending_step = None
+        # When we set off down the segment to pending_node, for localisation
+        self._segment_start = None
+        # Line searches since the last junction
+        self._line_searches = 0
+        # Node IDs / Orientation ints, see navigation.components.utils.graph
+        self.current_node: int = START_BOX
+        self.current_orientation: int = Orientation.N
         self.dropoff_initial = True
         self.go_back_to_nav = False
         self.end_drop_node = None
 
         self.bay_occ = False
         self.delivered_bays = set()
+        # Bay occupancy from the last time we scanned past, node -> occupied
+        self.bay_scan = {}
+        # Bay junction being scanned for and when we started heading to it
+        self._scan_node = NO_NODE
+        self._scan_start = None
+        # Edges blocked at runtime, node * 4 + direction -> ticks_ms the block ends
+        self._blocked = {}
 
         self.motion_mapping = {
             JunctionOptions.GO_LEFT: self._motion.turn_left,
@@ -61,8 +123,6 @@ class navigation:
             JunctionOptions.U_TURN: self._motion.u_turn,
         }
 
-        self.NODE_MAP = NODE_MAP
-
     @property
     def state(self):
         """
@@ -77,113 +137,535 @@ class navigation:
             else self._dropoff_state
         )
 
-    def _route_gen(self, route, path):
+    def get_directions(self, start, dest, orientation: int):
         """
-        Generator yielding (junction command, node) pairs for each step in the planned route.
+        Compute directions and node path from start to destination given orientation.
 
         Args:
-            route (list[JunctionOptions]): List of relative junction commands.
-            path (list[str]): List of traversed node names.
+            start (int | str): Starting node ID or name.
+            dest (int | str): Destination node ID or name.
+            orientation (int): Initial Orientation.
 
-        Yields:
-            tuple[JunctionOptions, str]: Next command and corresponding node.
+        Returns:
+            tuple[int, list[int], list[JunctionOptions]] | None:
+                Final orientation, traversed nodes, and command list.
         """
-        # We correlate the current instruction with the NEXT node rather than current hence 1:
-        for step, node in zip(route, path[1:]):
-            yield (step, node)
+        return self._pathfinding.get_directions(
+            node_id(start), node_id(dest), orientation
+        )
 
-    def get_directions(self, start: str, dest: str, orientation: str):
+    def route_length(self, start, dest, orientation: int | None = None):  # type: ignore
         """
-        Compute directions and node path from start to destination given orientation.
+        Number of nodes on the route from start to destination, without building it.
 
         Args:
-            start (str): Starting node name.
-            dest (str): Destination node name.
-            orientation (str): Initial orientation.
+            start (int | str): Starting node ID or name.
+            dest (int | str): Destination node ID or name.
+            orientation (int | None): Start Orientation (defaults to current).
 
         Returns:
-            tuple[str, list[str], list[JunctionOptions]] | None:
-                Final orientation, traversed nodes, and command list.
+            int | None: Route length in nodes, or None if no path exists.
+        """
+        orientation = (
+            self.current_orientation if orientation is None else orientation
+        )
+        return self._pathfinding.route_length(node_id(start), node_id(dest), orientation)
+
+    def _route(self, start: int, dest: int, orientation: int):
+        """
+        Packed route from start to destination, walked once and cached after that.
+
+        Returns:
+            bytes | None: Packed route, or None if no path exists.
+        """
+        key = (start * NUM_NODES + dest) * 4 + orientation
+        route = self._routes.get(key)
+        if route is None:
+            route = self._pathfinding.pack_route(start, dest, orientation)
+            if route is not None:
+                self._routes.put(key, route)
+        return route
+
+    def invalidate_routes(self):
+        """
+        Forget every route worked out so far, for when the graph changes.
+        """
+        self._pathfinding.table.invalidate()
+        self._routes.clear()
+
+    # ==========================
+    # Blocked edges
+    # ==========================
+    def block_edge(self, a, b, duration: int = EDGE_BLOCK_TIME):
+        """
+        Keep routes off the segment between two neighbouring nodes for a while,
+        replanning the route we're on.
+
+        A block on the segment we're driving along only counts from the junction at
+        the end of it, we don't turn round mid segment.
+
+        Args:
+            a (int | str): Node at one end.
+            b (int | str): Node at the other end.
+            duration (int): How long the block lasts in ms.
+        """
+        a = node_id(a)
+        b = node_id(b)
+        for d in range(4):
+            if neighbour(a, d) == b:
+                break
+        else:
+            logger.log(
+                "Navigation: can't block {} - {}, not neighbours",
+                NODE_NAMES[a],
+                NODE_NAMES[b],
+            )
+            return
+        self._block(a, d, duration)
+        self.invalidate_routes()
+        self._replan()
+
+    def block_node(self, node, duration: int = EDGE_BLOCK_TIME):
+        """
+        Keep routes away from a node for a while, replanning the route we're on.
+
+        Args:
+            node (int | str): Node ID or name.
+            duration (int): How long the block lasts in ms.
+        """
+        node = node_id(node)
+        for d in range(4):
+            if neighbour(node, d) != NO_NODE:
+                self._block(node, d, duration)
+        self.invalidate_routes()
+        self._replan()
+
+    def _block(self, node: int, direction: int, duration: int):
+        """
+        Block the edge leaving node in a direction until duration is up.
+        """
+        logger.log(
+            "Navigation: blocking {} - {}",
+            NODE_NAMES[node],
+            NODE_NAMES[neighbour(node, direction)],
+        )
+        self._pathfinding.table.block(node, direction)
+        self._blocked[node * 4 + direction] = ticks_add(ticks_ms(), duration)
+
+    def _expire_blocks(self):
+        """
+        Lift the blocks that have run their time.
+        """
+        now = ticks_ms()
+        expired = [key for key, end in self._blocked.items() if ticks_diff(now, end) >= 0]
+        for key in expired:
+            del self._blocked[key]
+            self._pathfinding.table.block(key >> 2, key & 3, False)
+        if expired:
+            # Both ends of a segment can have blocked it, put back any still going
+            for key in self._blocked:
+                self._pathfinding.table.block(key >> 2, key & 3)
+            logger.log("Navigation: {} blocks lifted", len(expired))
+            self.invalidate_routes()
+
+    def _clear_blocks(self):
+        """
+        Lift every block.
+        """
+        for key in self._blocked:
+            self._pathfinding.table.block(key >> 2, key & 3, False)
+        self._blocked = {}
+        self.invalidate_routes()
+
+    def _replan(self):
+        """
+        Swap the route we're on for one from the junction ahead (pending_node), the
+        motors keep going while we do.
+        """
+        if (
+            self._state != State.FOLLOWING_PATH
+            or self.route is None
+            or self.pending_node is None
+            or self.pending_node == self.route_dest
+        ):
+            return
+        packed = self._pathfinding.pack_route(
+            self.pending_node, self.route_dest, self.pending_orientation, True
+        )
+        if packed is None:
+            # Nothing around it, carry on and hope
+            logger.log(
+                "Navigation: no way round from {}, keeping the route",
+                NODE_NAMES[self.pending_node],
+            )
+            return
+        self.route = route_steps(packed)
+        self.current_orientation = route_orientation(packed)
+        logger.log(
+            "Navigation: replanned from {} to {}, {} ms",
+            NODE_NAMES[self.pending_node],
+            NODE_NAMES[self.route_dest],
+            route_time(packed),
+        )
+
+    def _localise(self) -> bool:
+        """
+        Check the junction we've just crawled onto is the one the route expects,
+        re-syncing and replanning if we went through some without seeing them.
+
+        Returns:
+            bool: Whether to take the next route step here, False for a false
+            detection (we just carry on following the line).
+        """
+        node = self.pending_node
+        motion = self._motion
+        if node is None or self._segment_start is None or motion.junction_start is None:
+            return True
+        elapsed = ticks_diff(motion.junction_start, self._segment_start)
+        at, missed = locate(
+            self._pathfinding.table,
+            node,
+            self.pending_orientation,
+            motion.reversing,
+            elapsed,
+            motion.junction_mask,
+        )
+        if at == NO_NODE:
+            logger.log(
+                "Navigation: false junction {} ms towards {}, saw {:04b}",
+                elapsed,
+                NODE_NAMES[node],
+                motion.junction_mask,
+            )
+            # Still the same segment, back to following the line
+            motion.forward()
+            return False
+        if not missed:
+            return True
+
+        logger.log(
+            "Navigation: missed {} junctions, at {} not {} after {} ms",
+            missed,
+            NODE_NAMES[at],
+            NODE_NAMES[node],
+            elapsed,
+        )
+        self.pending_node = at
+        if at == self.route_dest:
+            # Nothing left to do
+            self.route = None
+        else:
+            self._replan()
+        return True
+
+    def _line_event(self):
+        """
+        React to motion losing the line, finding it again or giving up on it.
+        """
+        motion = self._motion
+        event = motion.pop_line_event()
+        if event == LineEvent.LOST:
+            self._line_searches += 1
+            logger.log(
+                "Navigation: lost the line, {} {}, search {}",
+                self._state,
+                self.state,
+                self._line_searches,
+            )
+            if self._line_searches > LINE_MAX_SEARCHES:
+                # Better stopped on the board than going round in circles, robot()
+                # gets us going again with recover()
+                logger.log("Navigation: can't follow the line here, stuck")
+                motion.stop()
+                if self._state == State.DROPOFF:
+                    self._dropoff_state = DropoffState.STUCK
+                else:
+                    self._path_following_state = PathFollowingState.STUCK
+        elif event == LineEvent.FOUND:
+            if self._segment_start is not None:
+                # Searching isn't progress down the segment
+                self._segment_start = ticks_add(
+                    self._segment_start, motion.line_lost_time
+                )
+            logger.log("Navigation: found the line after {} ms", motion.line_lost_time)
+        elif event == LineEvent.GAVE_UP and self._line_searches < LINE_MAX_SEARCHES:
+            # Backed off a bit, try again from there
+            logger.log("Navigation: line still lost, searching again")
+            motion.search()
+
+    def recover(self, dest=None) -> bool:
+        """
+        Get going again after getting stuck: turn round on the segment we lost the
+        line on and route to the destination from the junction at the end we're then
+        facing. Going forwards that's the junction we last went through and the
+        segment is blocked, reversing out of a bay or pickup it's the junction we
+        were reversing to - the only way out.
+
+        Args:
+            dest (int | str | None): Destination node ID or name (defaults to the
+                route we were on).
+
+        Returns:
+            bool: Whether we're on our way, False if we don't know which segment
+            we're on or there's no route.
         """
-        return self._pathfinding.get_directions(start, dest, orientation)
+        if self._state == State.DROPOFF:
+            # Moved on to the junction ahead at each junction
+            ahead = self.current_node
+            heading = self.current_orientation
+        else:
+            ahead = self.pending_node
+            heading = self.pending_orientation
+        dest = self.route_dest if dest is None else node_id(dest)
+        if ahead is None or dest is None:
+            return False
+        back = (heading + 2) & 3
+        if self._motion.reversing:
+            # Facing the bay, turned round we drive on to the junction
+            node = ahead
+        else:
+            node = self._pathfinding.table.predecessor[ahead * 4 + heading]
+            if node == NO_NODE:
+                return False
+            self._block(node, heading, EDGE_BLOCK_TIME)
+            self.invalidate_routes()
+        packed = self._pathfinding.pack_route(node, dest, back, True)
+        if packed is None and self._blocked:
+            # Blocked in, trying the segment again is better than not moving
+            self._clear_blocks()
+            packed = self._pathfinding.pack_route(node, dest, back, True)
+        if packed is None:
+            return False
+        logger.log(
+            "Navigation: recovering, turning round for {} then {}, {} ms",
+            NODE_NAMES[node],
+            NODE_NAMES[dest],
+            route_time(packed),
+        )
+
+        self._state = State.FOLLOWING_PATH
+        self._path_following_state = PathFollowingState.TURNING
+        self._dropoff_state = DropoffState.REST
+        self.dropoff_initial = False
+        self.route_dest = dest
+        self.route = route_steps(packed)
+        self.pending_node = node
+        self.pending_orientation = back
+        # Part way down the segment, not a run to cruise
+        self.pending_step = None
+        self.current_node = dest
+        self.current_orientation = route_orientation(packed)
+        self._line_searches = 0
+        # Turn round on the line, TURNING follows it to node once it's found
+        self._motion.u_turn()
+        self._motion._turn_handle()
+        return True
+
+    def route_time(self, start, dest, orientation: int | None = None):  # type: ignore
+        """
+        Expected travel time of the fastest route from start to destination.
+
+        Args:
+            start (int | str): Starting node ID or name.
+            dest (int | str): Destination node ID or name.
+            orientation (int | None): Start Orientation (defaults to current).
+
+        Returns:
+            int | None: Route time in ms, or None if no path exists.
+        """
+        orientation = (
+            self.current_orientation if orientation is None else orientation
+        )
+        route = self._route(node_id(start), node_id(dest), orientation)
+        return None if route is None else route_time(route)
 
     def set_route(
         self,
-        dest: str,
-        start: str | None = None,  # type: ignore
-        orientation: str | None = None,  # type: ignore
+        dest,
+        start=None,
+        orientation: int | None = None,  # type: ignore
     ):
         """
         Set a new route to a destination, updating state and motion accordingly.
 
         Args:
-            dest (str): Destination node.
-            start (str | None): Optional start node (defaults to current).
-            orientation (str | None): Optional start orientation (defaults to current).
+            dest (int | str): Destination node ID or name.
+            start (int | str | None): Optional start node (defaults to current).
+            orientation (int | None): Optional start Orientation (defaults to current).
         """
         # Update states based on the route we're setting
         self._state = State.FOLLOWING_PATH
         self._path_following_state = PathFollowingState.NAVIGATING
 
-        orientation = orientation or self.current_orientation
-        start_node = start or self.current_node
-        logger.log("Pathfinding: {} {} {}", start_node, dest, orientation)
-        res = self._pathfinding.get_directions(start_node, dest, orientation)
-        if res is None:
+        dest = node_id(dest)
+        orientation = (
+            self.current_orientation if orientation is None else orientation
+        )
+        start_node = self.current_node if start is None else node_id(start)
+        logger.log(
+            "Pathfinding: {} {} {}",
+            NODE_NAMES[start_node],
+            NODE_NAMES[dest],
+            ORIENTATION_NAMES[orientation],
+        )
+        self._expire_blocks()
+        packed = self._route(start_node, dest, orientation)
+        if packed is None and self._blocked:
+            # Blocked in, a blocked segment is better than not moving
+            logger.log(
+                "Navigation: no route to {} round the blocks, lifting them",
+                NODE_NAMES[dest],
+            )
+            self._clear_blocks()
+            packed = self._route(start_node, dest, orientation)
+        if packed is None:
             # Panic!
+            logger.log("Navigation - no route to {}!", NODE_NAMES[dest])
             return
-        last_orientation, nodes, route = res
 
-        if not last_orientation:
-            logger.log("Navigation - last_orientation is None?!")
-            # Panic!
-            last_orientation = "N"
         self.start_node = start_node
-        self.current_node = dest
-        self.current_orientation = last_orientation
-        logger.log(
-            "Navigation: setting route {}, path {}, ori",
-            route,
-            nodes,
-            self.current_orientation,
+        self.route_dest = dest
+        # The junction at the end of the first segment, in route walk orientation
+        table = self._pathfinding.table
+        self.pending_node = (
+            None
+            if start_node == dest
+            else table.neighbour(start_node, table.step(start_node, orientation, dest))
         )
-        self.route = self._route_gen(route, nodes)
+        self.pending_orientation = orientation
+        self.current_node = dest
+        self.current_orientation = route_orientation(packed)
+        if DEBUG:
+            # Building the full route is only worth it for the log
+            nodes = [n for _, n, _ in route_steps(packed)]
+            if self.pending_node is not None:
+                nodes.insert(0, self.pending_node)
+            logger.log(
+                "Navigation: setting route {}, path {}, ori {}",
+                [cmd for cmd, _, _ in route_steps(packed)],
+                [NODE_NAMES[n] for n in nodes],
+                ORIENTATION_NAMES[self.current_orientation],
+            )
+        # Replay the packed route one junction at a time
+        self.route = route_steps(packed)
+        self._segment_start = ticks_ms()
+        self._line_searches = 0
         # Get to first junction - if a drop off or pick up then reverse out
-        if start_node.startswith(("D", "P")):
+        if NODE_KIND[start_node] & (NodeKind.DROPOFF | NodeKind.PICKUP):
             self._motion.reverse()
         else:
             self._motion.forward()
+            if table.step(start_node, orientation, dest) == orientation:
+                self._cruise(table.neighbour(start_node, orientation), orientation)
+
+    def _cruise(self, node: int, heading: int):
+        """
+        Cruise down the run of straight segments starting with the one to node.
+
+        Args:
+            node (int): Node the segment we've just started leads to.
+            heading (int): Orientation along the segment.
+        """
+        if not SPEED_PROFILE or self.route_dest is None:
+            return
+        run_time = self._pathfinding.run_time(node, heading, self.route_dest)
+        self._motion.cruise(cruise_time(run_time))
 
-    def get_tof_type(self):
+    def get_tof_type(self, node: int | None = None):  # type: ignore
         """
-        Get the type of ToF sensor (left or right) to use based on the current node.
+        Get the type of ToF sensor (left or right) to use based on the node.
+
+        Args:
+            node (int | None): Bay junction (defaults to current).
 
         Returns:
             str: "left" or "right" ToF type.
         """
-        if not self.current_node.startswith("J"):
-            return "right"  # right  # or raise error
+        node = self.current_node if node is None else node
+        # Bays on the west face the left ToF, everything else (incl. fallback) the right
+        if DROPOFF_DIR[node] == Orientation.W:
+            return "left"
+        return "right"
 
-        num = int(self.current_node[1:])  # extract number after J
+    def _scan(self):
+        """
+        Stream the bay side ToF while heading to a bay junction, filing the bay in
+        bay_scan once its junction crawl is over.
+        """
+        if not TOF_BAY_SCAN:
+            return
+        # Dropoff moves current_node on at each junction, path following pending_node
+        node = self.current_node if self._state == State.DROPOFF else self.pending_node
+        if node is None or DROPOFF_DIR[node] == NO_NODE:
+            if self._scan_node != NO_NODE:
+                self._scan_node = NO_NODE
+                tofs.stop_scan()
+            return
+        if node != self._scan_node:
+            self._scan_node = node
+            self._scan_start = ticks_ms()
+            # Scanned afresh on every pass
+            self.bay_scan.pop(node, None)
+        tofs.scan(self.get_tof_type(node))
+
+        detected = self._motion.junction_start
+        if (
+            self._motion.state == MotionState.JUNCTION
+            and node not in self.bay_scan
+            and detected is not None
+            # Not the junction we've just left
+            and ticks_diff(detected, self._scan_start) > 0
+        ):
+            occupied = tofs.scan_occupied(detected)
+            if occupied is not None:
+                self.bay_scan[node] = occupied
+                logger.log(
+                    "Navigation: scanned bay {} occ {}", NODE_NAMES[node], occupied
+                )
 
-        if 1 <= num <= 6 or 19 <= num <= 24:
-            return "right"  # right
-        elif 7 <= num <= 12 or 13 <= num <= 18:
-            return "left"  # left
-        else:
-            return "right"  # fallback #right
+    def _bay_occupied(self):
+        """
+        Whether the bay at the current node is occupied, from the scan if it got it,
+        otherwise sampling the ToF.
+
+        Returns:
+            bool | None: Occupied, None while still sampling.
+        """
+        if self.current_node == self.end_drop_node:
+            # Override, just turn in
+            return False
+        if self.current_node in self.delivered_bays:
+            # Check because reel is invisible to ToF - already has a reel
+            return True
+        if self.current_node in self.bay_scan:
+            return self.bay_scan[self.current_node]
+        if tofs.state == ToFState.REST:
+            tofs.start_reading()
+            logger.log(
+                "Navigation - dropoff - selected ToF is {}",
+                self.get_tof_type(),
+            )
+        tofs.handler(self.get_tof_type())
+        if tofs.state != ToFState.COMPLETE:
+            # Not done yet
+            return None
+        # Done reading, get occupied
+        occupied = tofs.occupied
+        logger.log("Navigation - dropoff: ToFs complete bay is occ: {}", occupied)
+        tofs.reset()
+        return occupied
 
     def start_dropoff(self, end_drop_node):
         """
         Enter dropoff mode and initialize drop-off state.
 
         Args:
-            end_drop_node (str): Node to deliver to.
+            end_drop_node (int | str): Node to deliver to.
         """
         self._state = State.DROPOFF
         self._dropoff_state = DropoffState.NAVIGATING
         self.dropoff_initial = True
-        self.end_drop_node = end_drop_node
+        self.end_drop_node = node_id(end_drop_node)
         logger.log("Starting dropoff {} {}", self._state, self._dropoff_state)
 
     def dropoff_handler(self):
@@ -193,42 +675,32 @@ class navigation:
         Detects bay occupancy, determines turn direction, and manages drop-off sequence.
         Updates state transitions for drop-off.
         """
+        self._scan()
+        if self._motion.line_event is not None:
+            self._line_event()
         if self.state == DropoffState.NAVIGATING:
             # Need to find an empty bay - check in pre-junction!
             if self.dropoff_initial or self._motion.state == MotionState.PRE_JUNCTION:
-                logger.log("Navigation - dropoff: In PRE_JUNCTION, checking ToFs!")
-                # Check because reel is invisible to ToF
-                if self.current_node == self.end_drop_node:
-                    # Override, just turn in
-                    self.bay_occ = False
-                elif self.current_node in self.delivered_bays:
-                    # already has a reel
-                    self.bay_occ = True
-                else:
-                    if tofs.state == ToFState.REST:
-                        tofs.start_reading()
-                        logger.log(
-                            "Navigation - dropoff - selected ToF is {}",
-                            self.get_tof_type(),
-                        )
-                    tofs.handler(self.get_tof_type())
-                    if tofs.state == ToFState.ACQUIRING_READINGS:
-                        # Not done yet
+                if not TOF_BAY_SCAN:
+                    logger.log("Navigation - dropoff: In PRE_JUNCTION, checking ToFs!")
+                    occupied = self._bay_occupied()
+                    if occupied is None:
                         return
-                    elif tofs.state == ToFState.COMPLETE:
-                        # Done reading, get occupied
-                        self.bay_occ = tofs.occupied
-                        logger.log(
-                            "Navigation - dropoff: ToFs complete bay is occ: {}",
-                            self.bay_occ,
-                        )
-                        tofs.reset()
-                logger.log("Navigation - dropoff: bay occ {}", self.bay_occ)
+                    self.bay_occ = occupied
+                    logger.log("Navigation - dropoff: bay occ {}", self.bay_occ)
                 self._dropoff_state = DropoffState.TURN_PENDING
 
         elif self.state == DropoffState.TURN_PENDING:
             # We start at the first junction so we'd already effectively be in junction mode
             if self.dropoff_initial or self._motion.state == MotionState.JUNCTION:
+                self._line_searches = 0
+                if TOF_BAY_SCAN:
+                    # Scanned on the way in, unless it missed the bay
+                    occupied = self._bay_occupied()
+                    if occupied is None:
+                        return
+                    self.bay_occ = occupied
+                    logger.log("Navigation - dropoff: bay occ {}", self.bay_occ)
                 self.dropoff_initial = False
                 # Update current node & direction for pathfinding later
                 if self.bay_occ:
@@ -240,8 +712,8 @@ class navigation:
                     self.go_back_to_nav = True
                 else:
                     self.go_back_to_nav = False
-                    cardinal_dir = NODE_MAP[self.current_node].get("dropoff", None)
-                    if cardinal_dir is None:
+                    cardinal_dir = DROPOFF_DIR[self.current_node]
+                    if cardinal_dir == NO_NODE:
                         logger.log(
                             "Navigation - dropoff: Bay dropoff is None when it really shouldn't be!"
                         )
@@ -254,23 +726,17 @@ class navigation:
                         )
                         logger.log(
                             "Navigation - dropoff: Turning into bay {} {}",
-                            orientation,
+                            ORIENTATION_NAMES[orientation],
                             junction_dir,
                         )
                         # We've turned into a bay so bay will be full
                         self.delivered_bays.add(self.current_node)
-                        if junction_dir is None or orientation is None:
-                            # Panic!
-                            logger.log("Navigation - dropoff: Compute turn failed!")
-                            junction_dir = JunctionOptions.GO_STRAIGHT
                         # Update orientation
-                        self.current_orientation = (
-                            orientation or self.current_orientation
-                        )
+                        self.current_orientation = orientation
                 # Update position
-                self.current_node = NODE_MAP[self.current_node][
-                    self.current_orientation
-                ]
+                self.current_node = neighbour(
+                    self.current_node, self.current_orientation
+                )
                 self._dropoff_state = DropoffState.TURNING
                 logger.log("Navigation - dropoff: Executing command {}", junction_dir)
                 motion_cmd = self.motion_mapping[junction_dir]
@@ -312,11 +778,17 @@ class navigation:
 
         Executes junction commands, manages state transitions, and coordinates with motion control.
         """
+        self._scan()
+        if self._motion.line_event is not None:
+            self._line_event()
         if self.state == PathFollowingState.NAVIGATING:
             if self._motion.state == MotionState.JUNCTION:
                 logger.log(
                     "Navigation: Entering junction handling", level=LOG_LEVELS.DEBUG
                 )
+                if LOCALISATION and not self._localise():
+                    return
+                self._line_searches = 0
                 # Junction detected, execute the next step
                 if self.route is None or (step_node := next(self.route, None)) is None:
                     # Exhausted commands, we're done with the defined route
@@ -324,20 +796,23 @@ class navigation:
                     self._motion.stop()
                     logger.log("Navigation: Completed route", level=LOG_LEVELS.DEBUG)
                     self.route = None
+                    self.route_dest = None
                     return
 
                 logger.log(
                     "Navigation: Getting next step in route", level=LOG_LEVELS.DEBUG
                 )
                 # We need to handle the junction - match action to motion command
-                step, next_node = step_node
+                step, next_node, next_orientation = step_node
                 self.pending_node = next_node
+                self.pending_orientation = next_orientation
+                self.pending_step = step
                 motion_cmd = self.motion_mapping[step]
 
-                logger.log("Navigation: next node {}", next_node)
+                logger.log("Navigation: next node {}", NODE_NAMES[next_node])
 
                 logger.log("Navigation: Executing the command", level=LOG_LEVELS.DEBUG)
-                if self.start_node == "P4" and step == JunctionOptions.U_TURN:
+                if self.start_node == P4 and step == JunctionOptions.U_TURN:
                     motion_cmd(opposite=True)  # type: ignore
                 else:
                     motion_cmd()
@@ -353,5 +828,9 @@ class navigation:
                 # Done with the turn - go forward as usual
                 self._path_following_state = PathFollowingState.NAVIGATING
                 self._motion.forward()
+                self._segment_start = ticks_ms()
+                # Straight through keeps the cruise we had, anything else starts a new run
+                if self.pending_step not in (JunctionOptions.GO_STRAIGHT, None):
+                    self._cruise(self.pending_node, self.pending_orientation)
             else:
                 return
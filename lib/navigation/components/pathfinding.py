@@ -6,27 +6,44 @@
 #
 #####################################################################################################
 
-from navigation.config import NODE_LIST, NODE_MAP
-from navigation.components.types.navigation import JunctionOptions
+from navigation.components.utils.graph import (
+    ADJACENCY,
+    NO_NODE,
+    NODE_IDS,
+    NODE_NAMES,
+    NUM_NODES,
+    ORIENTATION_NAMES,
+)
+from navigation.components.utils.routeCache import ROUTE_HEADER_SIZE
+from navigation.components.utils.routeTable import NO_HOP, TURNS, routeTable
+from navigation.components.types.navigation import Orientation
 from logger.logger import logger
 
 
 class pathfinding:
     """
-    Breadth-first search based path planner operating on the static node graph.
+    Path planner operating on the compiled node graph.
+
+    Nodes and orientations are small ints (see navigation.components.utils.graph).
+    Routes are the fastest ones in time, turns included, looked up in a route
+    table (see routeTable); path_find is kept as the plain hop-count BFS reference.
     """
     def __init__(self):
-        self.node_map = NODE_MAP
-        self.node_list = NODE_LIST
+        self.table = routeTable()
+
+    def _validate(self, start_node: int, end_node: int):
+        """
+        Raise if either node is not a known node ID.
+        """
+        if not (0 <= start_node < NUM_NODES and 0 <= end_node < NUM_NODES):
+            raise ValueError("start_node or end_node not a node ID")
 
-    def path_find(self, start_node: str, end_node: str):
+    def path_find(self, start_node: int, end_node: int):
         """
         Find a path from start_node to end_node using BFS on the map graph.
         Returns a dictionary with the list of nodes and directions to move.
         """
-        # Validate nodes
-        if start_node not in self.node_list or end_node not in self.node_list:
-            raise ValueError("start_node or end_node not in node_list")
+        self._validate(start_node, end_node)
 
         # Trivial case
         if start_node == end_node:
@@ -36,9 +53,9 @@ class pathfinding:
         queue = [start_node]
         head = 0
 
-        visited = {start_node}
-        parent = {}
-        parent_dir = {}
+        parent = bytearray(b"\xff" * NUM_NODES)
+        parent_dir = bytearray(b"\xff" * NUM_NODES)
+        parent[start_node] = start_node
 
         while head < len(queue):
             current = queue[head]
@@ -47,21 +64,17 @@ class pathfinding:
             if current == end_node:
                 break
 
-            neighbors = self.node_map[current]
-            for direction in neighbors:
-                if direction == "dropoff":
-                    continue
-                neighbor = neighbors[direction]
-                if neighbor is None or neighbor in visited:
+            for direction in range(4):
+                neighbor = ADJACENCY[current * 4 + direction]
+                if neighbor == NO_NODE or parent[neighbor] != NO_NODE:
                     continue
 
-                visited.add(neighbor)
                 parent[neighbor] = current
                 parent_dir[neighbor] = direction
                 queue.append(neighbor)
 
         # If end_node not reached
-        if end_node not in parent and start_node != end_node:
+        if parent[end_node] == NO_NODE:
             return None
 
         # Reconstruct path (backwards)
@@ -80,104 +93,290 @@ class pathfinding:
         path_dirs.reverse()  # reverse directions accordingly
 
         return {
-            "nodes": path_nodes,  # e.g. ["S", "J29", "J26", ...]
-            "moves": path_dirs,  # e.g. ["N", "N", "E", ...]
+            "nodes": path_nodes,  # e.g. [S, J29, J26, ...] as IDs
+            "moves": path_dirs,  # e.g. [N, N, E, ...] as Orientation
         }
 
-    ORI_TO_INT = {"N": 0, "E": 1, "S": 2, "W": 3}
-
     @staticmethod
-    def compute_turn(current_ori, target_ori):
+    def compute_turn(current_ori: int, target_ori: int):
         """
         Compute relative junction command required to rotate from
         current orientation to target orientation.
 
         Args:
-            current_ori (str): Current cardinal orientation ("N", "E", "S", "W").
-            target_ori (str): Target cardinal orientation.
+            current_ori (int): Current Orientation.
+            target_ori (int): Target Orientation.
+
+        Returns:
+            tuple[JunctionOptions, int]: Relative command and updated orientation.
+        """
+        return TURNS[(target_ori - current_ori) & 3], target_ori
+
+    def _walk(self, start_node: int, end_node: int, start_orientation: int):
+        """
+        Generator walking the route table from start to end.
+
+        The first move is taken without a junction command as we're already at the
+        start node and oriented (or reversing out of a bay), so we keep our heading.
+
+        Yields:
+            tuple[JunctionOptions, int, int]: Command, node reached, and
+            orientation after the command.
+        """
+        table = self.table
+        node = start_node
+        ori = start_orientation
+
+        d = table.step(node, ori, end_node)
+        if d == NO_HOP:
+            return
+        node = table.neighbour(node, d)
+        while node != end_node:
+            d = table.step(node, ori, end_node)
+            node = table.neighbour(node, d)
+            cmd = TURNS[(d - ori) & 3]
+            ori = d
+            yield cmd, node, ori
+
+    def route_gen(self, start_node: int, end_node: int, start_orientation: int):
+        """
+        Generator yielding (junction command, next node, orientation) for a route.
+
+        Walks the table lazily, one junction at a time, so no route lists are built.
+
+        Args:
+            start_node (int): Starting node ID.
+            end_node (int): Destination node ID.
+            start_orientation (int): Initial Orientation.
+
+        Yields:
+            tuple[JunctionOptions, int, int]: Next command, the node it leads to and
+            the orientation after it.
+        """
+        yield from self._walk(start_node, end_node, start_orientation)
+
+    def run_time(self, node: int, heading: int, end_node: int) -> int:
+        """
+        Expected time from leaving the junction before node, heading towards it, to
+        the next junction on the route that isn't straight through (or the end).
+
+        Args:
+            node (int): Node the current segment leads to.
+            heading (int): Orientation along the segment.
+            end_node (int): Destination node ID.
+
+        Returns:
+            int: Run time in ms at ROBOT_SPEED, 0 if there's no such segment.
+        """
+        table = self.table
+        prev = table.predecessor[node * 4 + heading]
+        if prev == NO_NODE:
+            return 0
+        edge_time = table.edge_time
+        straight = table.turn_time[0]
+        time = edge_time[prev * 4 + heading]
+        while node != end_node:
+            d = table.step(node, heading, end_node)
+            if d != heading:
+                break
+            time += straight + edge_time[node * 4 + d]
+            node = table.neighbour(node, d)
+        return time
+
+    def final_orientation(
+        self, start_node: int, end_node: int, start_orientation: int
+    ) -> int | None:  # type: ignore
+        """
+        Orientation the robot ends up in after following a route.
+
+        Returns:
+            int | None: Final Orientation, or None if no path exists.
+        """
+        self._validate(start_node, end_node)
+        if not self.table.reachable(start_node, end_node):
+            return None
+        ori = start_orientation
+        for _, _, ori in self._walk(start_node, end_node, start_orientation):
+            pass
+        return ori
+
+    def route_length(
+        self, start_node: int, end_node: int, start_orientation: int
+    ) -> int | None:  # type: ignore
+        """
+        Number of nodes visited after the start node on the route.
+
+        Args:
+            start_node (int): Starting node ID.
+            end_node (int): Destination node ID.
+            start_orientation (int): Initial Orientation - it changes the turns
+                and so which route is fastest.
 
         Returns:
-            tuple[JunctionOptions, str]: Relative command and updated orientation.
-        """
-        ci = pathfinding.ORI_TO_INT[current_ori]
-        ti = pathfinding.ORI_TO_INT[target_ori]
-        diff = (ti - ci) & 3
-
-        if diff == 0:
-            return JunctionOptions.GO_STRAIGHT, current_ori
-        elif diff == 1:
-            return JunctionOptions.GO_RIGHT, target_ori
-        elif diff == 2:
-            return JunctionOptions.U_TURN, target_ori
-        elif diff == 3:
-            return JunctionOptions.GO_LEFT, target_ori
-        else:
-            logger.log("Pathfinding: error in compute_turn")
-            return None, None
+            int | None: Route length in nodes, or None if no path exists.
+        """
+        self._validate(start_node, end_node)
+        if not self.table.reachable(start_node, end_node):
+            return None
+        if start_node == end_node:
+            return 0
+        length = 1
+        for _ in self._walk(start_node, end_node, start_orientation):
+            length += 1
+        return length
+
+    def route_time(
+        self, start_node: int, end_node: int, start_orientation: int
+    ) -> int | None:  # type: ignore
+        """
+        Expected travel time of the route, from the segment and junction times in config.
+
+        Returns:
+            int | None: Route time in ms, or None if no path exists.
+        """
+        self._validate(start_node, end_node)
+        table = self.table
+        if not table.reachable(start_node, end_node):
+            return None
+        if start_node == end_node:
+            return 0
+        edge_time = table.edge_time
+        turn_time = table.turn_time
+        node = start_node
+        ori = start_orientation
+
+        # No junction command for the first move
+        d = table.step(node, ori, end_node)
+        time = edge_time[node * 4 + d]
+        node = table.neighbour(node, d)
+        while node != end_node:
+            d = table.step(node, ori, end_node)
+            time += turn_time[(d - ori) & 3] + edge_time[node * 4 + d]
+            node = table.neighbour(node, d)
+            ori = d
+        return time
+
+    def pack_route(
+        self,
+        start_node: int,
+        end_node: int,
+        start_orientation: int,
+        at_junction: bool = False,
+    ):
+        """
+        Walk a route once into the packed form routeCache keeps.
+
+        Args:
+            start_node (int): Starting node ID.
+            end_node (int): Destination node ID.
+            start_orientation (int): Initial Orientation.
+            at_junction (bool): Arriving at start_node as a junction on the way, so
+                the first move needs a command too - for replanning mid route.
+
+        Returns:
+            bytes | None: Packed route (see navigation.components.utils.routeCache),
+            or None if no path exists.
+        """
+        self._validate(start_node, end_node)
+        table = self.table
+        if not table.reachable(start_node, end_node):
+            return None
+        route = bytearray(ROUTE_HEADER_SIZE)
+        time = 0
+        ori = start_orientation
+        if start_node != end_node:
+            edge_time = table.edge_time
+            turn_time = table.turn_time
+            node = start_node
+            if not at_junction:
+                # No junction command for the first move
+                d = table.step(node, ori, end_node)
+                time = edge_time[node * 4 + d]
+                node = table.neighbour(node, d)
+            while node != end_node:
+                d = table.step(node, ori, end_node)
+                turn = (d - ori) & 3
+                time += turn_time[turn] + edge_time[node * 4 + d]
+                node = table.neighbour(node, d)
+                ori = d
+                route.append(node)
+                route.append(TURNS[turn] << 2 | d)
+        route[0] = ori
+        route[1] = time & 0xFF
+        route[2] = (time >> 8) & 0xFF
+        route[3] = time >> 16
+        return bytes(route)
 
     def get_directions(
         self,
-        start_node: str,
-        end_node: str,
-        start_orientation: str,
+        start_node: int,
+        end_node: int,
+        start_orientation: int,
     ):
         """
         Convert absolute cardinal moves into relative junction commands.
 
         Args:
-            start_node (str): Starting node identifier.
-            end_node (str): Destination node identifier.
-            start_orientation (str): Initial orientation ("N", "E", "S", "W").
+            start_node (int): Starting node ID.
+            end_node (int): Destination node ID.
+            start_orientation (int): Initial Orientation.
 
         Returns:
-            tuple[str, list[str], list[JunctionOptions]] | None:
+            tuple[int, list[int], list[JunctionOptions]] | None:
                 Final orientation, traversed nodes, and relative commands,
                 or None if no path exists.
         """
-        # Get absolute moves from BFS
-        # We start at the start node (junction) so we should path find from next node
-        print(start_node, end_node)
-        path = self.path_find(start_node, end_node)
-        if path is None:
+        self._validate(start_node, end_node)
+        table = self.table
+        if not table.reachable(start_node, end_node):
             # Panic?
             return None
 
-        moves = path["moves"]  # e.g. ["N", "E", "S"]
-        logger.log("Nav - moves {}", moves)
-
-        # Clockwise orientation order
+        if start_node == end_node:
+            return (start_orientation, [], [])
+
+        # We start at the start node (junction) so the first move has no command
+        nodes = [
+            table.neighbour(
+                start_node, table.step(start_node, start_orientation, end_node)
+            )
+        ]
         junction_commands = []
         current_orientation = start_orientation
-
-        for move in moves[1:]:
-            cmd, current_orientation = self.compute_turn(current_orientation, move)
-            logger.log("pathfinding - {} {} {}", current_orientation, move, cmd)
+        for cmd, node, current_orientation in self._walk(
+            start_node, end_node, start_orientation
+        ):
+            logger.log(
+                "pathfinding - {} {}", ORIENTATION_NAMES[current_orientation], cmd
+            )
+            nodes.append(node)
             junction_commands.append(cmd)
-        # Return the last turn's orientation
 
         # Pathfinding now assumes you're already at the node AND you're orinetated correctly.
         # This translates to ignoring the first route command because you're already there.
-        return (current_orientation, path["nodes"][1:], junction_commands)
+        return (current_orientation, nodes, junction_commands)
 
 
 if __name__ == "__main__":
     # Simple test for path_find and get_directions as a debug/sanity check
     test_map = pathfinding()
 
-    start_node = "START_BOX"
-    end_node = "P2"
-    start_orientation = "N"
+    start_node = NODE_IDS["START_BOX"]
+    end_node = NODE_IDS["P2"]
+    start_orientation = Orientation.N
 
     path_result = test_map.path_find(start_node, end_node)
     directions = test_map.get_directions(start_node, end_node, start_orientation)
 
-    print("Path from", start_node, "to", end_node)
+    print("Path from", NODE_NAMES[start_node], "to", NODE_NAMES[end_node])
 
     if path_result is None:
         print("No path found")
     else:
-        print("Nodes:", path_result["nodes"], f"({len(path_result['nodes'])} nodes)")
-        print("Moves:", path_result["moves"], f"({len(path_result['moves'])} moves)")
+        nodes = [NODE_NAMES[n] for n in path_result["nodes"]]
+        moves = [ORIENTATION_NAMES[m] for m in path_result["moves"]]
+        print("Nodes:", nodes, f"({len(nodes)} nodes)")
+        print("Moves:", moves, f"({len(moves)} moves)")
 
-    print("Start orientation:", start_orientation)
+    print("Start orientation:", ORIENTATION_NAMES[start_orientation])
     print("Junction directions:", directions)
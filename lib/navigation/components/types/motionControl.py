@@ -12,4 +12,13 @@ class Junction:
     RIGHT = "RIGHT"
     T = "T"
 
+
+class LineEvent:
+    """
+    What happened with a lost line, for navigation (motion.pop_line_event).
+    """
+    LOST = "LOST"
+    FOUND = "FOUND"
+    GAVE_UP = "GAVE_UP"
+
  
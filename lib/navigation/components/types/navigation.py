@@ -12,4 +12,23 @@ class JunctionOptions:
     GO_RIGHT = 1
     GO_STRAIGHT = 2
     U_TURN = 3
- 
\ No newline at end of file
+ 
+
+class Orientation:
+    """
+    Cardinal orientations, numbered clockwise so turns are (target - current) & 3.
+    """
+    N = 0
+    E = 1
+    S = 2
+    W = 3
+
+
+class NodeKind:
+    """
+    Node kind flags of the compiled graph.
+    """
+    START = 1
+    JUNCTION = 2
+    PICKUP = 4
+    DROPOFF = 8
@@ -6,6 +6,8 @@
 #
 ####################################################################################################
 
+from array import array
+
 last_error = 0
 
 
@@ -26,10 +28,46 @@ def calculate_error(line_sensor_arr: list[int]) -> float:
     LO, LI, RI, RO = line_sensor_arr
     active_sensors = LO + LI + RI + RO
     if active_sensors == 0:
-        # Line is lost, panic
-        # TODO: This does NOT handle it properly, need proper recovery mode
+        # Line is lost, hold the last error - motion searches for it (LINE_LOST)
+        # if it doesn't come back
         pass
     else:
         weighted_error = (LO * -3 + LI * -1 + RI * 1 + RO * 3) / active_sensors
         last_error = weighted_error
     return last_error
+
+
+def _mask_error(mask: int):
+    """
+    Weighted error for a line sensor bitmask, None if no sensor is on.
+    """
+    lo, li, ri, ro = (mask >> 3) & 1, (mask >> 2) & 1, (mask >> 1) & 1, mask & 1
+    active_sensors = lo + li + ri + ro
+    if active_sensors == 0:
+        return None
+    return (lo * -3 + li * -1 + ri * 1 + ro * 3) / active_sensors
+
+
+# calculate_error for every bitmask, saves the float maths and tuple per tick
+ERROR_TABLE = tuple(_mask_error(mask) for mask in range(16))
+
+
+def calculate_error_mask(mask: int) -> float:
+    """
+    calculate_error for a line sensor bitmask, by table lookup.
+
+    Args:
+        mask (int): Sensor bitmask, see LineSensor in the navigation config.
+
+    Returns:
+        float: Signed lateral error used for PD correction.
+    """
+    global last_error
+    if mask:
+        last_error = ERROR_TABLE[mask]
+    return last_error
+
+
+# Every error is a multiple of 1/3 (1-4 active sensors, odd weights), so 3x the error
+# is exact as an int. 0 for no sensors, callers keep the last error for that.
+ERROR_TABLE_3 = array("b", [round(3 * (e or 0)) for e in ERROR_TABLE])
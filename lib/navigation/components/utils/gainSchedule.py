@@ -0,0 +1,46 @@
+####################################################################################################
+#
+# Utils related to the PD gain schedule.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+from navigation.config import PD_SCHEDULE
+
+# (power, direction) -> gains, powers come from a handful of call sites
+_cache = {}
+
+
+def scheduled_gains(power: int, direction: int):
+    """
+    Look up the PD gains for a commanded power and direction.
+
+    Interpolates linearly between the PD_SCHEDULE rows either side of the power and
+    holds the first / last row outside them.
+
+    Args:
+        power (int): Commanded motor power.
+        direction (Direction): FORWARD or REVERSE.
+
+    Returns:
+        tuple[float, float, float]: (KP, KD, max correction).
+    """
+    key = (power, direction)
+    gains = _cache.get(key)
+    if gains is not None:
+        return gains
+
+    rows = PD_SCHEDULE[direction]
+    if power <= rows[0][0]:
+        gains = rows[0][1:]
+    elif power >= rows[-1][0]:
+        gains = rows[-1][1:]
+    else:
+        for lo, hi in zip(rows, rows[1:]):
+            if power <= hi[0]:
+                t = (power - lo[0]) / (hi[0] - lo[0])
+                gains = tuple(a + (b - a) * t for a, b in zip(lo[1:], hi[1:]))
+                break
+    _cache[key] = gains
+    return gains
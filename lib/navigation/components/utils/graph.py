@@ -0,0 +1,130 @@
+####################################################################################################
+#
+# Compiled, array-backed representation of the node graph.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Compiled form of NODE_MAP built once at import.
+
+Nodes are small-int IDs (their index in NODE_LIST) and the graph lives in byte
+arrays, so the hot paths compare and index ints instead of hashing and slicing
+short-lived strings. The name <-> ID maps are only meant for logging and for
+converting names at the API boundary.
+"""
+
+from array import array
+
+from navigation.config import (
+    DEFAULT_SEGMENT_TIME,
+    DROPOFF_SEGMENT_TIME,
+    NODE_LIST,
+    NODE_MAP,
+    PICKUP_SEGMENT_TIME,
+    SEGMENT_TIME,
+)
+from navigation.components.types.navigation import NodeKind
+
+# Marker for "no node" in the byte tables
+NO_NODE = 0xFF
+
+# Cardinal names in clockwise order, index == Orientation
+ORIENTATION_NAMES = ("N", "E", "S", "W")
+
+NODE_NAMES = tuple(NODE_LIST)
+NODE_IDS = {name: i for i, name in enumerate(NODE_NAMES)}
+NUM_NODES = len(NODE_NAMES)
+
+# 4 neighbour slots per node: ADJACENCY[node * 4 + orientation]
+ADJACENCY = bytearray(b"\xff" * (NUM_NODES * 4))
+# NodeKind flag per node
+NODE_KIND = bytearray(NUM_NODES)
+# Orientation to turn to for the bay of a dropoff junction, NO_NODE otherwise
+DROPOFF_DIR = bytearray(b"\xff" * NUM_NODES)
+# Travel time in ms along each edge: EDGE_TIME[node * 4 + orientation]
+EDGE_TIME = array("H", bytes(NUM_NODES * 4 * 2))
+
+
+def _kind(name: str) -> int:
+    """
+    Classify a node from its name, only ever done while compiling.
+    """
+    if name in ("START_BOX", "S"):
+        return NodeKind.START
+    prefix = name[0]
+    if prefix == "J":
+        return NodeKind.JUNCTION
+    elif prefix == "P":
+        return NodeKind.PICKUP
+    return NodeKind.DROPOFF
+
+
+def _compile():
+    """
+    Fill the adjacency, kind, dropoff direction and edge time arrays from NODE_MAP.
+    """
+    for name, neighbours in NODE_MAP.items():
+        if name not in NODE_IDS:
+            raise ValueError("node {} missing from NODE_LIST".format(name))
+        node = NODE_IDS[name]
+        for ori in range(4):
+            neighbour = neighbours[ORIENTATION_NAMES[ori]]
+            if neighbour is not None:
+                ADJACENCY[node * 4 + ori] = NODE_IDS[neighbour]
+        NODE_KIND[node] = _kind(name)
+        dropoff = neighbours.get("dropoff", None)
+        if dropoff is not None:
+            DROPOFF_DIR[node] = ORIENTATION_NAMES.index(dropoff)
+
+    # Edge times need the node kinds of both ends
+    for node in range(NUM_NODES):
+        for ori in range(4):
+            neighbour = ADJACENCY[node * 4 + ori]
+            if neighbour != NO_NODE:
+                EDGE_TIME[node * 4 + ori] = _segment_time(node, neighbour)
+
+
+def _segment_time(a: int, b: int) -> int:
+    """
+    Measured time for the segment between two nodes, falling back on the kind defaults.
+    """
+    pair = (NODE_NAMES[a], NODE_NAMES[b])
+    if pair in SEGMENT_TIME:
+        return SEGMENT_TIME[pair]
+    pair = (pair[1], pair[0])
+    if pair in SEGMENT_TIME:
+        return SEGMENT_TIME[pair]
+    kinds = NODE_KIND[a] | NODE_KIND[b]
+    if kinds & NodeKind.PICKUP:
+        return PICKUP_SEGMENT_TIME
+    if kinds & NodeKind.DROPOFF:
+        return DROPOFF_SEGMENT_TIME
+    return DEFAULT_SEGMENT_TIME
+
+
+_compile()
+
+
+def node_id(node) -> int:
+    """
+    Convert a node name to its ID, passing IDs straight through.
+
+    Args:
+        node (str | int): Node name or ID.
+
+    Returns:
+        int: Node ID.
+    """
+    return NODE_IDS[node] if isinstance(node, str) else node
+
+
+def neighbour(node: int, orientation: int) -> int:
+    """
+    Node reached by leaving node in the given orientation.
+
+    Returns:
+        int: Node ID, or NO_NODE if there is no edge.
+    """
+    return ADJACENCY[node * 4 + orientation]
@@ -0,0 +1,66 @@
+####################################################################################################
+#
+# Utils related to sampling the line sensors with PIO.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+PIO program oversampling the line sensors and the majority vote over its words.
+
+The state machine reads the four (consecutive) line sensor pins every sample period
+and autopushes LINE_SENSOR_PIO_SAMPLES samples per FIFO word, newest in the low
+nibble. Each nibble is laid out like the line sensor bitmask (outer right on the
+lowest pin), so a word's majority vote is a reading for the control loop.
+"""
+
+# Machine imports
+import micropython  # type: ignore
+import rp2  # type: ignore
+
+# Local imports
+from config import LINE_SENSOR_PIO_SAMPLES
+
+# PIO cycles per sample - in_ plus the maximum delay
+PIO_CYCLES_PER_SAMPLE = 32
+
+
+@rp2.asm_pio(
+    in_shiftdir=rp2.PIO.SHIFT_LEFT,
+    autopush=True,
+    push_thresh=4 * LINE_SENSOR_PIO_SAMPLES,
+    fifo_join=rp2.PIO.JOIN_RX,
+)
+def sample_line_sensors():
+    # PIO assembler names, provided by asm_pio
+    in_(pins, 4)[31]  # type: ignore # noqa: F821
+
+
+@micropython.viper
+def majority(word: int, samples: int) -> int:
+    """
+    Per channel majority vote over the samples in a FIFO word, as a bitmask.
+    """
+    half = samples >> 1
+    c0 = 0
+    c1 = 0
+    c2 = 0
+    c3 = 0
+    w = word
+    for _ in range(samples):
+        c0 += w & 1
+        c1 += (w >> 1) & 1
+        c2 += (w >> 2) & 1
+        c3 += (w >> 3) & 1
+        w >>= 4
+    mask = 0
+    if c0 > half:
+        mask |= 1
+    if c1 > half:
+        mask |= 2
+    if c2 > half:
+        mask |= 4
+    if c3 > half:
+        mask |= 8
+    return mask
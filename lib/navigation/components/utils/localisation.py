@@ -0,0 +1,101 @@
+####################################################################################################
+#
+# Utils related to junction localisation.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Checks each junction motion detects against the one the route expects next, from
+which sides it has lines off (what the outer sensors see over the crawl) and how long
+the segment to it should take.
+
+Between junctions we only ever follow the line, so a missed junction means we've
+gone straight through it - the candidates are the expected junction and the ones
+straight on after it.
+"""
+
+from navigation.config import (
+    LOCALISE_EARLY,
+    LOCALISE_LOOKAHEAD,
+    OUTER_LEFT_MASK,
+    OUTER_RIGHT_MASK,
+)
+from navigation.components.utils.graph import NO_NODE, neighbour
+
+
+def junction_pattern(node: int, orientation: int) -> int:
+    """
+    Outer sensor bits expected crossing a node facing an orientation.
+
+    Args:
+        node (int): Node ID.
+        orientation (int): Orientation the robot faces.
+
+    Returns:
+        int: Bits of OUTER_MASK, 0 for nodes with nothing off either side (marker
+        bars and pads), which can look like anything coming in at a slight angle.
+    """
+    pattern = 0
+    if neighbour(node, (orientation + 3) & 3) != NO_NODE:
+        pattern |= OUTER_LEFT_MASK
+    if neighbour(node, (orientation + 1) & 3) != NO_NODE:
+        pattern |= OUTER_RIGHT_MASK
+    return pattern
+
+
+def locate(table, node: int, orientation: int, reversing: bool, elapsed: int, seen: int):
+    """
+    Work out which node a detected junction is, given the one the route expects.
+
+    Only a junction that doesn't look exactly like the expected one is questioned -
+    segment times alone can't tell row junctions apart. One with no side in common
+    that comes well before it is a false detection. Otherwise whichever is closest
+    in time of the expected one and those straight on that look exactly right -
+    off square only one side of a T may be seen, so the expected one stays in.
+    Reversing the sensors trail over the junction at an angle, so those are taken
+    as they come.
+
+    Args:
+        table (routeTable): Route table, for the edges and their times.
+        node (int): Junction the route expects next.
+        orientation (int): Orientation we face along the segment to it.
+        reversing (bool): Whether we're reversing down the segment.
+        elapsed (int): ms from setting off down the segment to the detection.
+        seen (int): Outer sensor bits over the crawl (motion.junction_mask).
+
+    Returns:
+        tuple[int, int]: Node we're at, NO_NODE for a false detection, and how many
+        junctions we went through without seeing.
+    """
+    pattern = junction_pattern(node, orientation)
+    if reversing or not pattern or seen == pattern:
+        return node, 0
+    edge_time = table.edge_time
+    prev = table.predecessor[node * 4 + orientation]
+    time = 0 if prev == NO_NODE else edge_time[prev * 4 + orientation]
+    if not seen & pattern and elapsed * 100 < time * LOCALISE_EARLY:
+        return NO_NODE, 0
+
+    best = node
+    best_missed = 0
+    best_error = abs(elapsed - time)
+    straight = table.turn_time[0]
+    for missed in range(1, LOCALISE_LOOKAHEAD + 1):
+        ahead = neighbour(node, orientation)
+        if ahead == NO_NODE:
+            break
+        time += straight + edge_time[node * 4 + orientation]
+        node = ahead
+        if seen != junction_pattern(node, orientation):
+            continue
+        if elapsed * 100 < time * LOCALISE_EARLY:
+            # Couldn't have got there yet, nor any further
+            break
+        error = abs(elapsed - time)
+        if error < best_error:
+            best = node
+            best_missed = missed
+            best_error = error
+    return best, best_missed
@@ -6,6 +6,26 @@
 #
 ####################################################################################################
 
+# Machine imports
+import micropython  # type: ignore
+from micropython import const  # type: ignore
+
+# Local imports
+from config import MOVING_AVERAGE_VIPER
+
+# Longest history the bit filters can keep, one byte per channel
+BIT_HISTORY_MAX = 8
+
+# Set bits in every byte
+POPCOUNT = bytearray(bin(i).count("1") for i in range(256))
+
+
+def _on_above(size, threshold):
+    """
+    Table of the total a channel has to be above to be on, by number of readings.
+    """
+    return bytearray([255] + [int(threshold * c) for c in range(1, size + 1)])
+
 
 class movingAverage:
     """
@@ -72,3 +92,194 @@ class movingAverage:
             1 if (self.totals[i] / self.counts[i]) > threshold else 0 for i in range(4)
         )
         return tuple(vals)
+
+
+class maskMovingAverage:
+    """
+    Moving average over line sensor bitmasks (see LineSensor in the navigation config).
+
+    Same result as movingAverage + clamp, but on integer counters with a precomputed
+    threshold table: no division and no allocation per reading.
+    """
+    def __init__(self, size, threshold=0.5):
+        """
+        Args:
+            size (int): Window size, at most 255.
+            threshold (float): Cutoff on the averaged value for a channel to be on.
+        """
+        self.size = size
+        self.buffer = bytearray(size)
+        self.index = 0
+        self.count = 0
+        self.totals = bytearray(4)
+        # Channel is on if its total is above _on_above[count], i.e. total / count > threshold
+        self._on_above = _on_above(size, threshold)
+
+    def add(self, mask: int):
+        """
+        Add a new bitmask reading.
+        """
+        old = self.buffer[self.index]
+        self.buffer[self.index] = mask
+        self.index += 1
+        if self.index == self.size:
+            self.index = 0
+        if self.count < self.size:
+            self.count += 1
+
+        if old != mask:
+            t = self.totals
+            t[0] += (mask & 1) - (old & 1)
+            t[1] += ((mask >> 1) & 1) - ((old >> 1) & 1)
+            t[2] += ((mask >> 2) & 1) - ((old >> 2) & 1)
+            t[3] += ((mask >> 3) & 1) - ((old >> 3) & 1)
+
+    def clamp(self) -> int:
+        """
+        Thresholded averages as a bitmask.
+        """
+        t = self.totals
+        limit = self._on_above[self.count]
+        mask = 0
+        if t[0] > limit:
+            mask |= 1
+        if t[1] > limit:
+            mask |= 2
+        if t[2] > limit:
+            mask |= 4
+        if t[3] > limit:
+            mask |= 8
+        return mask
+
+
+class bitMovingAverage:
+    """
+    Moving average over line sensor bitmasks with a shift register per channel.
+
+    Each channel's last `size` readings are the bits of one int, so a reading is a
+    shift and the average is a popcount against the threshold table.
+    """
+    def __init__(self, size, threshold=0.5):
+        """
+        Args:
+            size (int): Window size, at most BIT_HISTORY_MAX.
+            threshold (float): Cutoff on the averaged value for a channel to be on.
+        """
+        if size > BIT_HISTORY_MAX:
+            raise ValueError("bit history is at most {}".format(BIT_HISTORY_MAX))
+        self.size = size
+        self.window = (1 << size) - 1
+        self.count = 0
+        self.h0 = 0
+        self.h1 = 0
+        self.h2 = 0
+        self.h3 = 0
+        self._on_above = _on_above(size, threshold)
+
+    def add(self, mask: int):
+        """
+        Add a new bitmask reading.
+        """
+        w = self.window
+        self.h0 = ((self.h0 << 1) | (mask & 1)) & w
+        self.h1 = ((self.h1 << 1) | ((mask >> 1) & 1)) & w
+        self.h2 = ((self.h2 << 1) | ((mask >> 2) & 1)) & w
+        self.h3 = ((self.h3 << 1) | ((mask >> 3) & 1)) & w
+        if self.count < self.size:
+            self.count += 1
+
+    def clamp(self) -> int:
+        """
+        Thresholded averages as a bitmask.
+        """
+        limit = self._on_above[self.count]
+        mask = 0
+        if POPCOUNT[self.h0] > limit:
+            mask |= 1
+        if POPCOUNT[self.h1] > limit:
+            mask |= 2
+        if POPCOUNT[self.h2] > limit:
+            mask |= 4
+        if POPCOUNT[self.h3] > limit:
+            mask |= 8
+        return mask
+
+
+# Byte offsets into the viper filter state
+_H0 = const(0)
+_COUNT = const(4)
+_SIZE = const(5)
+_WINDOW = const(6)
+
+
+@micropython.viper
+def _bits_add(state, mask: int):
+    s = ptr8(state)  # type: ignore # noqa: F821 - viper builtin
+    w = s[_WINDOW]
+    s[_H0] = ((s[_H0] << 1) | (mask & 1)) & w
+    s[_H0 + 1] = ((s[_H0 + 1] << 1) | ((mask >> 1) & 1)) & w
+    s[_H0 + 2] = ((s[_H0 + 2] << 1) | ((mask >> 2) & 1)) & w
+    s[_H0 + 3] = ((s[_H0 + 3] << 1) | ((mask >> 3) & 1)) & w
+    if s[_COUNT] < s[_SIZE]:
+        s[_COUNT] = s[_COUNT] + 1
+
+
+@micropython.viper
+def _bits_clamp(state, popcount, on_above) -> int:
+    s = ptr8(state)  # type: ignore # noqa: F821 - viper builtin
+    pc = ptr8(popcount)  # type: ignore # noqa: F821 - viper builtin
+    limit = ptr8(on_above)[s[_COUNT]]  # type: ignore # noqa: F821 - viper builtin
+    mask = 0
+    if pc[s[_H0]] > limit:
+        mask |= 1
+    if pc[s[_H0 + 1]] > limit:
+        mask |= 2
+    if pc[s[_H0 + 2]] > limit:
+        mask |= 4
+    if pc[s[_H0 + 3]] > limit:
+        mask |= 8
+    return mask
+
+
+class viperBitMovingAverage:
+    """
+    bitMovingAverage compiled with the viper emitter, state kept in a bytearray.
+    """
+    def __init__(self, size, threshold=0.5):
+        """
+        Args:
+            size (int): Window size, at most BIT_HISTORY_MAX.
+            threshold (float): Cutoff on the averaged value for a channel to be on.
+        """
+        if size > BIT_HISTORY_MAX:
+            raise ValueError("bit history is at most {}".format(BIT_HISTORY_MAX))
+        self.size = size
+        # h0-h3, count, size, window
+        self.state = bytearray(7)
+        self.state[_SIZE] = size
+        self.state[_WINDOW] = (1 << size) - 1
+        self._on_above = _on_above(size, threshold)
+
+    def add(self, mask: int):
+        """
+        Add a new bitmask reading.
+        """
+        _bits_add(self.state, mask)
+
+    def clamp(self) -> int:
+        """
+        Thresholded averages as a bitmask.
+        """
+        return _bits_clamp(self.state, POPCOUNT, self._on_above)
+
+
+def mask_moving_average(size, threshold=0.5):
+    """
+    Fastest bitmask moving average for the history size: bit histories (viper
+    compiled if MOVING_AVERAGE_VIPER) up to BIT_HISTORY_MAX, counters above that.
+    """
+    if size > BIT_HISTORY_MAX:
+        return maskMovingAverage(size, threshold)
+    if MOVING_AVERAGE_VIPER:
+        return viperBitMovingAverage(size, threshold)
+    return bitMovingAverage(size, threshold)
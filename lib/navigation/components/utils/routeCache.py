@@ -0,0 +1,110 @@
+####################################################################################################
+#
+# Utils related to caching walked routes.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Routes are kept as compact bytes:
+
+    [0]       orientation at the end of the route
+    [1:4]     expected route time in ms, 24 bit little endian
+    then per junction: node reached, command << 2 | orientation after it
+"""
+
+from array import array
+
+# Bytes before the junctions
+ROUTE_HEADER_SIZE = 4
+
+
+def route_orientation(route) -> int:
+    """
+    Orientation the robot ends up in after a packed route.
+    """
+    return route[0]
+
+
+def route_time(route) -> int:
+    """
+    Expected travel time of a packed route in ms.
+    """
+    return route[1] | route[2] << 8 | route[3] << 16
+
+
+def route_steps(route):
+    """
+    Generator yielding (junction command, next node, orientation) off a packed route,
+    the same as pathfinding.route_gen.
+    """
+    for i in range(ROUTE_HEADER_SIZE, len(route), 2):
+        step = route[i + 1]
+        yield step >> 2, route[i], step & 3
+
+
+class routeCache:
+    """
+    Fixed size least recently used cache of packed routes keyed by small ints.
+
+    Slots are preallocated and a hit only moves a use stamp, so looking a route
+    up again doesn't allocate.
+    """
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._keys = array("i", [-1] * slots)
+        self._routes = [None] * slots
+        # Stamp of the last use of each slot, the lowest is evicted
+        self._used = array("i", bytes(4 * slots))
+        self._slot = {}
+        self._stamp = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int):
+        """
+        Cached route for a key.
+
+        Returns:
+            bytes | None: Packed route, None on a miss.
+        """
+        slot = self._slot.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._stamp += 1
+        self._used[slot] = self._stamp
+        return self._routes[slot]
+
+    def put(self, key: int, route):
+        """
+        Cache a route, evicting the least recently used one when full.
+        """
+        slot = self._slot.get(key)
+        if slot is None:
+            if len(self._slot) < self.slots:
+                slot = len(self._slot)
+            else:
+                used = self._used
+                slot = 0
+                for i in range(1, self.slots):
+                    if used[i] < used[slot]:
+                        slot = i
+                del self._slot[self._keys[slot]]
+            self._slot[key] = slot
+            self._keys[slot] = key
+        self._stamp += 1
+        self._used[slot] = self._stamp
+        self._routes[slot] = route
+
+    def clear(self):
+        """
+        Drop every route, for when the graph changes under them.
+        """
+        self._slot.clear()
+        for i in range(self.slots):
+            self._keys[i] = -1
+            self._routes[i] = None
+            self._used[i] = 0
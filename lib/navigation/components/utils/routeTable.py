@@ -0,0 +1,175 @@
+####################################################################################################
+#
+# Fastest-route table for pathfinding.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+from array import array
+from heapq import heappop, heappush
+
+from navigation.config import JUNCTION_TIME
+from navigation.components.types.navigation import JunctionOptions
+from navigation.components.utils.graph import ADJACENCY, EDGE_TIME, NO_NODE, NUM_NODES
+
+# Relative command for a clockwise orientation difference of 0, 1, 2, 3
+TURNS = (
+    JunctionOptions.GO_STRAIGHT,
+    JunctionOptions.GO_RIGHT,
+    JunctionOptions.U_TURN,
+    JunctionOptions.GO_LEFT,
+)
+
+# Marker for "no hop" in the next-hop table
+NO_HOP = 0xFF
+
+# Heap entries are (cost << STATE_BITS) | state so the heap only holds small ints.
+# 10 bits covers 256 nodes * 4 headings, which NO_NODE limits us to anyway.
+STATE_BITS = 10
+STATE_MASK = (1 << STATE_BITS) - 1
+# Larger than any route, still a small int
+INF = 0x3FFFFFFF
+
+
+class routeTable:
+    """
+    Fastest-route table over (node, heading) states of the compiled node graph.
+
+    Costs are travel times: the EDGE_TIME of every segment plus the JUNCTION_TIME of
+    the command needed at every junction, so a route with fewer turns can win over one
+    with fewer junctions. Each destination's row is filled by a reverse Dijkstra the
+    first time it's asked for; precompute the ones we know about at boot so that
+    doesn't happen mid run.
+    """
+    def __init__(self):
+        self.size = NUM_NODES
+        self.adjacency = ADJACENCY
+        self.edge_time = EDGE_TIME
+        # Indexed by (target - current) & 3, same as TURNS
+        self.turn_time = tuple(JUNCTION_TIME[cmd] for cmd in TURNS)
+
+        # next_dir[(dest * size + node) * 4 + heading] is the orientation to leave
+        # node in towards dest when arriving there facing heading
+        self.next_dir = bytearray(b"\xff" * (self.size * self.size * 4))
+        self.built = bytearray(self.size)
+
+        # Node leading into every (node, direction) - the graph is a grid so there's
+        # at most one: predecessor[node * 4 + d] = m where m --d--> node
+        self.predecessor = bytearray(b"\xff" * (self.size * 4))
+        for node in range(self.size):
+            for d in range(4):
+                neighbour = ADJACENCY[node * 4 + d]
+                if neighbour != NO_NODE:
+                    self.predecessor[neighbour * 4 + d] = node
+
+        # Edges blocked at runtime, blocked[node * 4 + d] for leaving node in d
+        self.blocked = bytearray(self.size * 4)
+
+        # Scratch cost buffer re-used for every destination
+        self._cost = array("l", [INF] * (self.size * 4))
+
+    def precompute(self, dests):
+        """
+        Build the rows for the given destinations now.
+
+        Args:
+            dests (iterable[int]): Destination node IDs.
+        """
+        for dest in dests:
+            if not self.built[dest]:
+                self._build(dest)
+
+    def block(self, node: int, direction: int, blocked: bool = True):
+        """
+        Block (or unblock) the edge leaving node in a direction, both ways. Rows
+        built so far don't know, invalidate() after.
+        """
+        neighbour = self.adjacency[node * 4 + direction]
+        if neighbour == NO_NODE:
+            return
+        flag = 1 if blocked else 0
+        self.blocked[node * 4 + direction] = flag
+        self.blocked[neighbour * 4 + ((direction + 2) & 3)] = flag
+
+    def invalidate(self):
+        """
+        Forget every row, they're built again as they're asked for. For when the
+        edge times change.
+        """
+        for dest in range(self.size):
+            self.built[dest] = 0
+
+    def _build(self, dest: int):
+        """
+        Fill one destination's row with a reverse Dijkstra from dest.
+        """
+        size = self.size
+        cost = self._cost
+        predecessor = self.predecessor
+        blocked = self.blocked
+        edge_time = self.edge_time
+        turn_time = self.turn_time
+        next_dir = self.next_dir
+        row = dest * size * 4
+
+        for i in range(size * 4):
+            cost[i] = INF
+            # Clear the last build, states that can't reach dest any more keep NO_HOP
+            next_dir[row + i] = NO_HOP
+
+        # Arriving at dest in any heading costs nothing more. Ascending, so a valid heap.
+        heap = []
+        for h in range(4):
+            cost[dest * 4 + h] = 0
+            heap.append(dest * 4 + h)
+
+        while heap:
+            key = heappop(heap)
+            c = key >> STATE_BITS
+            state = key & STATE_MASK
+            if c > cost[state]:
+                # Stale entry, already found cheaper
+                continue
+            # We arrive at node facing d, so came from its predecessor leaving in d
+            d = state & 3
+            prev = predecessor[state]
+            if prev == NO_NODE or blocked[prev * 4 + d]:
+                continue
+            base = c + edge_time[prev * 4 + d]
+            for h in range(4):
+                new_cost = base + turn_time[(d - h) & 3]
+                prev_state = prev * 4 + h
+                if new_cost < cost[prev_state]:
+                    cost[prev_state] = new_cost
+                    next_dir[row + prev_state] = d
+                    heappush(heap, (new_cost << STATE_BITS) | prev_state)
+
+        self.built[dest] = 1
+
+    def step(self, node: int, heading: int, dest: int) -> int:
+        """
+        Direction to leave node in towards dest, arriving there facing heading.
+
+        Returns:
+            int: Orientation (0-3), or NO_HOP if at dest / unreachable.
+        """
+        if not self.built[dest]:
+            self._build(dest)
+        return self.next_dir[(dest * self.size + node) * 4 + heading]
+
+    def neighbour(self, node: int, direction: int) -> int:
+        """
+        Node reached by leaving node in the given direction.
+
+        Returns:
+            int: Node ID, or NO_NODE if there is no edge.
+        """
+        return self.adjacency[node * 4 + direction]
+
+    def reachable(self, start: int, dest: int) -> bool:
+        """
+        Whether dest can be reached from start.
+        """
+        # Reachability doesn't depend on heading
+        return start == dest or self.step(start, 0, dest) != NO_HOP
@@ -0,0 +1,33 @@
+####################################################################################################
+#
+# Utils related to the route speed profile.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+from navigation.config import (
+    CRUISE_SPEED,
+    MIN_CRUISE_RUN_TIME,
+    ROBOT_SPEED,
+    SLOWDOWN_LEAD_TIME,
+)
+
+
+def cruise_time(run_time: int) -> int:
+    """
+    How long to cruise at CRUISE_SPEED for a run of straight segments.
+
+    Run times are measured at ROBOT_SPEED, cruising covers the same ground quicker so
+    the time is scaled down - the straight junction crawls on the way are at
+    ROBOT_SPEED, so this errs on slowing down early.
+
+    Args:
+        run_time (int): Expected time to the next turn at ROBOT_SPEED in ms.
+
+    Returns:
+        int: Time to cruise for in ms, 0 to stay at ROBOT_SPEED.
+    """
+    if run_time < MIN_CRUISE_RUN_TIME:
+        return 0
+    return (run_time - SLOWDOWN_LEAD_TIME) * ROBOT_SPEED // CRUISE_SPEED
@@ -20,6 +20,8 @@ and drop-off mappings used by pathfinding and motion control.
 # rmp - delete all files off pico
 
 from grabber.components.types.resistance import Reel
+from navigation.components.types.motor import Direction
+from navigation.components.types.navigation import JunctionOptions
 
 ROBOT_SPEED = 95
 
@@ -52,6 +54,32 @@ class PD:
     KD = 0
 
 
+# Gain schedule: (power, KP, KD, max correction) rows by direction, sorted by power.
+# Gains are interpolated between rows and held past the ends, so a single row is
+# the same gains at every power. Add rows as other speeds get tuned.
+PD_SCHEDULE = {
+    Direction.FORWARD: ((ROBOT_SPEED, PD.KP, PD.KD, MAX_PD_CORRECTION),),
+    # Reversing is a lot twitchier, sensors are on the far side from the wheels
+    Direction.REVERSE: ((ROBOT_SPEED, PD.KP * 0.25, PD.KD * 0.25, MAX_PD_CORRECTION),),
+}
+
+# Integer PD on the line sensor bitmask (fixedPDControl) instead of simple_pid.
+# Only P and D - needs PD.KI = 0.
+FIXED_POINT_PD = True
+
+# Speed profile: cruise faster than ROBOT_SPEED on long runs of straight segments and
+# be back down to ROBOT_SPEED before the next turn, so the junction crawl timings
+# below still hold. Reversing and dropoff moves never cruise.
+SPEED_PROFILE = True
+CRUISE_SPEED = 100
+# Power change per control loop tick while ramping between speeds
+SPEED_RAMP_STEP = 1
+# Time (at ROBOT_SPEED) before the next turn to be back at ROBOT_SPEED
+SLOWDOWN_LEAD_TIME = 500
+# Runs shorter than this (at ROBOT_SPEED) aren't worth speeding up on
+MIN_CRUISE_RUN_TIME = 1500
+
+
 class LineSensor:
     """
     Logical indices for the four line sensors.
@@ -65,6 +93,15 @@ class LineSensor:
     OUTER_RIGHT = 0
 
 
+# Masks into the line sensor bitmask, bits as in LineSensor so it reads left to right
+OUTER_LEFT_MASK = 1 << LineSensor.OUTER_LEFT
+INNER_LEFT_MASK = 1 << LineSensor.INNER_LEFT
+INNER_RIGHT_MASK = 1 << LineSensor.INNER_RIGHT
+OUTER_RIGHT_MASK = 1 << LineSensor.OUTER_RIGHT
+OUTER_MASK = OUTER_LEFT_MASK | OUTER_RIGHT_MASK
+INNER_MASK = INNER_LEFT_MASK | INNER_RIGHT_MASK
+
+
 # TODO: Use - DEPENDENT ON ROBOT_SPEED, IF ROBOT_SPEED CHANGES CHANGE THESE!
 # This is incredibly arbitrary currently
 # (Hint: non-dimensionalise?)
@@ -85,6 +122,76 @@ REVERSE_GRACE_MULTIPLIER = 1.25
 # Or sensor input
 DROP_OFF_FORWARD_TIME = 1550
 
+# Line lost recovery (motion LINE_LOST). The PD holds the last error for this long
+# with every sensor off the line before we stop and look for it
+LINE_LOST_TIME = 250
+# Pivot towards the side the line was last seen on for this long, then back
+# TODO: Sized off a turn (~570ms for 90 degrees), tune
+LINE_SEARCH_SWEEP_TIME = 400
+# Then back off the way we came for this long before giving up
+LINE_SEARCH_BACK_TIME = 1000
+# Most searches between two junctions, navigation searches again when motion gives
+# up until then. A dead end finds the line backing off and loses it again forever
+LINE_MAX_SEARCHES = 3
+
+
+### Route planning costs
+# Everything in ms at ROBOT_SPEED - used to find the fastest route, not the one with
+# the fewest junctions. IF ROBOT_SPEED CHANGES THESE NEED REMEASURING!
+
+# From the log files: junction detected -> back to following the line
+JUNCTION_TIME = {
+    JunctionOptions.GO_STRAIGHT: 325,
+    JunctionOptions.GO_LEFT: 850,
+    JunctionOptions.GO_RIGHT: 850,
+    # TODO: Never measured, motion control waits at least this long for a U-turn
+    JunctionOptions.U_TURN: JUNCTION_FORWARD_TIME + int(JUNCTION_TURN_GRACE_PERIOD * 2.5),
+}
+
+# Most segments are the gaps between dropoff bays so that's the default
+DEFAULT_SEGMENT_TIME = 210
+PICKUP_SEGMENT_TIME = 1270
+DROPOFF_SEGMENT_TIME = DROP_OFF_FORWARD_TIME
+
+# From the log files: forward command -> next junction detected. Either direction.
+# Mirrored segments on the other side of the table use the same time.
+# TODO: Only one run so far, J32 -> J25 -> J26 look like we lost the line. Remeasure!
+SEGMENT_TIME = {
+    ("START_BOX", "S"): 480,
+    ("S", "J29"): 200,
+    ("J29", "J28"): 3980,
+    ("J29", "J30"): 3980,
+    ("J28", "J27"): 1380,
+    ("J30", "J31"): 1380,
+    ("J27", "J1"): 4310,
+    ("J31", "J7"): 4310,
+    ("J36", "J32"): 1910,
+    ("J37", "J33"): 1910,
+    ("J32", "J25"): 5490,
+    ("J33", "J25"): 5490,
+    ("J25", "J26"): 8950,
+    ("J26", "J34"): 2340,
+    ("J26", "J35"): 2340,
+    ("J34", "J13"): 1850,
+    ("J35", "J19"): 1850,
+}
+
+# Timings fitted from run logs by tools/fit_timings.py take over from the ones above
+try:
+    from navigation import timings
+except ImportError:
+    timings = None
+
+if timings is not None:
+    for (a, b), ms in timings.SEGMENT_TIME.items():
+        # Lookups go either way, don't leave the hand measured one shadowing it
+        SEGMENT_TIME.pop((b, a), None)
+        SEGMENT_TIME[(a, b)] = ms
+    JUNCTION_TIME.update(timings.JUNCTION_TIME)
+    JUNCTION_TURN_GRACE_PERIOD = getattr(
+        timings, "JUNCTION_TURN_GRACE_PERIOD", JUNCTION_TURN_GRACE_PERIOD
+    )
+
 
 ### Dropoff logic for a given reel type
 
@@ -97,6 +204,29 @@ REEL_DROP_NODE = {
     Reel.REEL_3: ("J19", "J24"),  # RED!
 }
 
+# Walked routes kept by navigation, least recently used dropped first. Each is
+# 4 bytes + 2 per junction, so ~60 bytes with the bytes object, ~3 KB when full.
+# The mission planner asks for 40 odd route times every dropoff.
+ROUTE_CACHE_SLOTS = 48
+
+# How long a segment blocked at runtime (navigation.block_edge) is kept off routes
+EDGE_BLOCK_TIME = 60_000
+
+# Junction localisation (navigation.components.utils.localisation): check every
+# junction against the map and the segment time, re-syncing past missed ones
+LOCALISATION = True
+# A junction that doesn't look like the expected one before this % of the segment
+# time is a false detection, and no junction is reached before this % of its time
+LOCALISE_EARLY = 40
+# Most junctions in a row we can have gone straight through without seeing
+LOCALISE_LOOKAHEAD = 2
+
+# Mission planner (navigation.components.missionPlanner)
+REELS_PER_PICKUP = 2
+# Grabber time at a pickup / dropoff on top of the travel, per the run logs
+MISSION_PICKUP_TIME = 1000
+MISSION_DROPOFF_TIME = 500
+
 
 NODE_LIST = [
     "START_BOX",
@@ -114,6 +244,7 @@ NODE_LIST = [
     "J5",
     "J6",
     "J7",
+    "J8",
     "J9",
     "J10",
     "J11",
@@ -30,6 +30,16 @@ class MotionState:
     PRE_JUNCTION = "PRE_JUNCTION"
     JUNCTION = "JUNCTION"
     POST_JUNCTION = "POST_JUNCTION"
+    LINE_LOST = "LINE_LOST"
+
+
+class LineSearchState:
+    """
+    Phases of the search for a lost line.
+    """
+    SWEEP = "SWEEP"
+    SWEEP_BACK = "SWEEP_BACK"
+    BACK_OFF = "BACK_OFF"
 
 
 class NavigationState:
@@ -48,6 +58,8 @@ class PathFollowingState:
     NAVIGATING = "NAVIGATING"
     TURNING = "TURNING"
     COMPLETE = "COMPLETE"
+    # Gave up on the line, stopped until nav.recover()
+    STUCK = "STUCK"
 
 
 class DropoffState:
@@ -60,3 +72,5 @@ class DropoffState:
     TURNING = "TURNING"
     DROPPING_OFF = "DROPPING_OFF"
     COMPLETE = "COMPLETE"
+    # Gave up on the line, stopped until nav.recover()
+    STUCK = "STUCK"
@@ -12,7 +12,7 @@ from utime import ticks_ms, ticks_diff  # type: ignore
 
 # Local imports
 from misc.components.button import button
-from overallnavigation import robot
+from overallnavigation import boot, robot
 from config import CONTROL_LOOP_POLL_RATE, DISABLE_RUN
 from misc.components.LEDArray import LED_array
 
@@ -25,6 +25,8 @@ async def entry():
             LED_array.flash()
             await uasyncio.sleep_ms(100)
         return
+    # Calibrate and home while waiting for the button rather than after it
+    await boot()
     while True:
         button._handler(0)
         if button.state():
@@ -15,13 +15,23 @@ import uasyncio  # type: ignore
 from misc.components.tof_VL53L0X import tofs
 
 # ===================== LOCAL IMPORTS =====================
+from navigation.components.missionPlanner import missionPlanner
 from navigation.components.navigation import navigation
-from navigation.state import DropoffState, PathFollowingState
+from navigation.components.utils.graph import NODE_NAMES
+from navigation.state import DropoffState, MotionState, PathFollowingState
 
 from grabber.components.grabberControl import grabberControl
 from logger.logger import logger
 from misc.components.button import button
-from config import CONTROL_LOOP_POLL_RATE, LOG_LEVELS, RUN_TIME, END_FORWARD_TIME
+from misc.state import ToFState
+from config import (
+    BINARY_LOG,
+    CONTROL_LOOP_POLL_RATE,
+    LOG_LEVELS,
+    RUN_TIME,
+    END_FORWARD_TIME,
+    PROFILE_CONTROL_LOOP,
+)
 from state import AGVState as State
 
 # ===================== State =====================
@@ -33,7 +43,8 @@ polls = 0
 pickup_start = None
 end_run_start = None
 end_drop_node = None
-second_pickup = False
+# Whether we've got stuck and recovered since the last pickup or dropoff
+recovered = False
 
 
 # ===================== TIMER ISR =====================
@@ -44,54 +55,42 @@ def timer_isr(t):
     micropython.schedule(nav._motion._handler, t)
 
 
-# ===================== PICKUP / DROPOFF CONFIG =====================
-pickup_bays = {
-    "P1": True,
-    "P2": False,  # We go there first
-    "P3": True,
-    "P4": True,
-}
-
-
-# ===================== PICKUP LOGIC =====================
-def reset_pickups_if_empty():
-    global second_pickup
-    for bay in pickup_bays.keys():
-        pickup_bays[bay] = True
-    second_pickup = True
-
-
-def nearest_pickup(start):
-    if all(not free for free in pickup_bays.values()):
-        # Reset free bays
-        if second_pickup:
-            logger.log("Done all 8 - stopping!")
-            return None
-        logger.log("AGV: resetting bays because none are free!")
-        reset_pickups_if_empty()
-
-    best_bay = None
-    shortest = float("inf")
-
-    for bay, free in pickup_bays.items():
-        if not free:
-            continue
-
-        res = nav.get_directions(start, bay, nav.current_orientation)
-        if res is None:
-            logger.log("AGV: directions should not be None!")
-            continue
+# ===================== PROFILING =====================
+if PROFILE_CONTROL_LOOP:
+    from misc.components.loopProfiler import loopProfiler
+
+    # Motion states, plus ticks where the ToFs are being read
+    TOF_READING = "TOF_READING"
+    profiler = loopProfiler(
+        CONTROL_LOOP_POLL_RATE,
+        (
+            MotionState.REST,
+            MotionState.FOLLOWING_LINE,
+            MotionState.PRE_JUNCTION,
+            MotionState.JUNCTION,
+            MotionState.POST_JUNCTION,
+            MotionState.LINE_LOST,
+            TOF_READING,
+        ),
+    )
 
-        _, nodes, _ = res
+    def profiled_motion_handler(t):
+        start = profiler.start()
+        nav._motion._handler(t)
+        if tofs.state == ToFState.ACQUIRING_READINGS:
+            profiler.stop(start, TOF_READING)
+        else:
+            profiler.stop(start, nav._motion.state)
 
-        if len(nodes) < shortest:
-            shortest = len(nodes)
-            best_bay = bay
+    def timer_isr(t):  # noqa: F811 - profiled version
+        global polls
+        polls += 1
+        micropython.schedule(button._handler, t)
+        profiler.schedule(profiled_motion_handler, t)
 
-    if best_bay is not None:
-        pickup_bays[best_bay] = False  # mark as used
 
-    return best_bay
+# ===================== PICKUP / DROPOFF PLANNING =====================
+planner = missionPlanner(nav)
 
 
 # ===================== PICKUP / DROPOFF LOGIC =====================
@@ -99,6 +98,27 @@ def nearest_pickup(start):
 grabber = grabberControl()
 
 
+# ===================== BOOT =====================
+booted = False
+
+
+async def boot():
+    """
+    Staged power-on: both ToFs calibrate at the same time on their own buses while the
+    grabber homes. Only does anything the first time, robot() calls it too so it can
+    be run on its own.
+    """
+    global booted
+    if booted:
+        return
+    start = ticks_ms()
+    await uasyncio.gather(tofs.init(), grabber.home())
+    booted = True
+    logger.log(
+        "Boot complete in {} ms", ticks_diff(ticks_ms(), start), level=LOG_LEVELS.INFO
+    )
+
+
 # ===================== MAIN LOOP =====================
 async def robot():
     global pickup_start
@@ -106,6 +126,8 @@ async def robot():
     global p_i
     global end_run_start
     global end_drop_node
+    global recovered
+    await boot()
     control_timer = Timer()
     control_timer.init(
         freq=CONTROL_LOOP_POLL_RATE,
@@ -113,19 +135,46 @@ async def robot():
         callback=timer_isr,
     )
 
+    if BINARY_LOG:
+        # Flushes the log ring to flash in the background
+        uasyncio.create_task(logger.run())
+
     logger.log("Robot loop starting", LOG_LEVELS.INFO)
     start_time = ticks_ms()
 
-    logger.log("tofs: Starting both tofs")
-
-    tofs.start_tofs()
+    # Warms up while we drive out of the start box, bay checks wait for it
+    uasyncio.create_task(tofs.start_tofs())
 
     while not button.state():
-        if state == State.REST:
-            # Go to the first pre-defined pickup
-            logger.log("AGV: Starting - going to P2")
-            nav.set_route("P2")
-            state = State.MOVING_TO_PICKUP
+        if nav.state in (PathFollowingState.STUCK, DropoffState.STUCK):
+            # Gave up on the line - go round from the last junction, or home if
+            # that's already failed us once this leg. A dropoff row can only be
+            # started from its end, so that's home too
+            if recovered or state == State.MOVING_TO_DROPOFF_BAY or not nav.recover():
+                if state == State.ENDING_RUN or not nav.recover("S"):
+                    logger.log(
+                        "AGV: Stuck and can't get back, stopping", level=LOG_LEVELS.INFO
+                    )
+                    break
+                logger.log(
+                    "AGV: Stuck, going back to the start box!", level=LOG_LEVELS.INFO
+                )
+                state = State.ENDING_RUN
+            recovered = True
+
+        elif state == State.REST:
+            pickup_node = planner.next_pickup(
+                nav.current_node, nav.current_orientation, RUN_TIME
+            )
+            if pickup_node is not None:
+                logger.log("AGV: Starting - going to {}", NODE_NAMES[pickup_node])
+                nav.set_route(pickup_node)
+                state = State.MOVING_TO_PICKUP
+            else:
+                # Nothing we can get to, nav to start
+                logger.log("AGV: No pickup to go to, going back to the start box!")
+                nav.set_route("S")
+                state = State.ENDING_RUN
 
         elif state == State.MOVING_TO_PICKUP:
             LED_array.strobe()
@@ -143,6 +192,7 @@ async def robot():
             if nav.state == PathFollowingState.COMPLETE:
                 logger.log("AGV: At pickup bay")
                 state = State.PICKING_UP
+                recovered = False
 
         elif state == State.PICKING_UP:
             # TODO: Align properly here
@@ -184,6 +234,7 @@ async def robot():
             if nav.state == DropoffState.COMPLETE:
                 logger.log("AGV: At dropoff bay")
                 state = State.DROPPING_OFF
+                recovered = False
 
         elif state == State.DROPPING_OFF:
             # We're now in position, physically drop the reel
@@ -195,14 +246,11 @@ async def robot():
             elif grabber.state == GrabberState.DROPPED_OFF:
                 LED_array.off()
                 # Drop off done, nav-ing & transition state
-                if ticks_diff(ticks_ms(), start_time) > RUN_TIME:
-                    # Run out of time, nav to start
-                    # TODO: Do we have to go back to start within 6 min?
-                    logger.log("AGV: Ran out of time, going back to the start box!")
-                    nav.set_route("S")
-                    state = State.ENDING_RUN
-                    continue
-                pickup_node = nearest_pickup(nav.current_node)
+                pickup_node = planner.next_pickup(
+                    nav.current_node,
+                    nav.current_orientation,
+                    RUN_TIME - ticks_diff(ticks_ms(), start_time),
+                )
                 if pickup_node is not None:
                     nav.set_route(pickup_node)
                     state = State.MOVING_TO_PICKUP
@@ -212,11 +260,14 @@ async def robot():
                     grabber.reset()
                     logger.log(
                         "AGV: Dropped off - Reset grabber & going to pickup {}",
-                        pickup_node,
+                        NODE_NAMES[pickup_node],
                     )
                 else:
-                    logger.log("AGV: No available pickup node found!", LOG_LEVELS.INFO)
-                    # TODO: put default here
+                    # Out of reels or out of time, nav to start
+                    logger.log(
+                        "AGV: Done, going back to the start box!", level=LOG_LEVELS.INFO
+                    )
+                    nav.set_route("S")
                     state = State.ENDING_RUN
                     continue
 
@@ -224,13 +275,11 @@ async def robot():
             nav.handler()
             LED_array.flash()
             if nav.state == PathFollowingState.COMPLETE:
-                logger.log("AGV: Back at start bay")
-                nav._motion._forward(50)
-                end_run_start = ticks_ms()
-                if (
-                    end_run_start
-                    and ticks_diff(ticks_ms(), end_run_start) > END_FORWARD_TIME
-                ):
+                if end_run_start is None:
+                    logger.log("AGV: Back at start bay")
+                    nav._motion._forward(50)
+                    end_run_start = ticks_ms()
+                elif ticks_diff(ticks_ms(), end_run_start) > END_FORWARD_TIME:
                     nav._motion.stop()
                     logger.log("AGV: Positioned nicely in start bay, goodbye!")
                     break
@@ -238,9 +287,12 @@ async def robot():
         await uasyncio.sleep_ms(1000 // CONTROL_LOOP_POLL_RATE)
 
     nav._motion.stop()
-    tofs.stop_tofs()
+    await tofs.stop_tofs()
     control_timer.deinit()
 
     logger.log("polls: {}", str(polls))
+    if PROFILE_CONTROL_LOOP:
+        for line in profiler.report():
+            logger.log("{}", line, level=LOG_LEVELS.INFO)
     logger.log("Robot loop done", LOG_LEVELS.INFO)
     logger.close()
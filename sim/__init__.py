@@ -0,0 +1,49 @@
+####################################################################################################
+#
+# Host-side simulator for the AGV.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Runs the code in lib/ on a Linux host, against a 2D model of the robot on the track.
+
+sim/modules holds stand-ins for the MicroPython only modules (machine, utime,
+uasyncio, micropython, ustruct). They are backed by a virtual clock so a run goes
+as fast as the host allows, and by the world model (kinematics, line sensors, ToFs,
+reels) which plays the part of the hardware. Nothing here is uploaded to the Pico.
+
+Call install() before importing anything from lib/, see sim.run for a full run.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = os.path.join(ROOT, "sim", "modules")
+LIB = os.path.join(ROOT, "lib")
+
+
+def install(seed: int = 0):
+    """
+    Put the stand-in modules and lib/ on sys.path and build the world.
+
+    Must be called before anything from lib/ is imported as a lot of it talks to
+    hardware at import (e.g. the ToF singleton).
+
+    Args:
+        seed (int): Seed for reel types, occupied bays and sensor noise.
+
+    Returns:
+        World: The simulated world the stand-ins are wired to.
+    """
+    for path in (LIB, MODULES, ROOT):
+        if path in sys.path:
+            sys.path.remove(path)
+    # Stand-ins first so they win over anything installed on the host
+    sys.path[:0] = [MODULES, LIB, ROOT]
+
+    from sim.world import World
+
+    return World(seed)
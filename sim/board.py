@@ -0,0 +1,51 @@
+####################################################################################################
+#
+# Simulated board wiring.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Shared state between the machine stand-ins and the world.
+
+The stand-ins write outputs (pin values, PWM duties) here and read inputs from the
+callables the world registers, keyed by GPIO number / I2C bus id.
+"""
+
+
+class Board:
+    """
+    GPIO, PWM, ADC and I2C wiring of the simulated Pico.
+    """
+    def __init__(self):
+        # GPIO -> last value written
+        self.outputs = {}
+        # GPIO -> callable returning the input level
+        self.inputs = {}
+        # GPIO -> duty_u16
+        self.pwm = {}
+        # GPIO -> callable returning a u16 reading
+        self.adc = {}
+        # I2C bus id -> {address: device}
+        self.i2c = {}
+        # GPIO -> (handler, trigger, Pin) from Pin.irq
+        self.irqs = {}
+
+    def read(self, pin: int) -> int:
+        """
+        Level of a pin, inputs win over whatever was last written.
+        """
+        source = self.inputs.get(pin, None)
+        if source is not None:
+            return source()
+        return self.outputs.get(pin, 0)
+
+    def duty(self, pin: int) -> int:
+        """
+        PWM duty of a pin, 0 if it isn't a PWM output.
+        """
+        return self.pwm.get(pin, 0)
+
+
+board = Board()
@@ -0,0 +1,136 @@
+####################################################################################################
+#
+# Virtual clock for the simulator.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Virtual time, hardware timers and the micropython.schedule queue.
+
+Time only moves when something waits on it (utime.sleep_*, uasyncio sleeps). While
+it moves the world is stepped and timer callbacks fire at their due times, same as
+the hardware timer IRQs interrupting a sleep on the Pico. Pin IRQs raised by the
+world while it's stepped go through irq(). Scheduled callbacks are run straight
+after the IRQ that scheduled them.
+"""
+
+from sim.config import PHYSICS_STEP_US
+
+# MicroPython's default schedule queue depth
+SCHEDULE_DEPTH = 8
+
+
+class Clock:
+    """
+    Virtual time in us, driving the world, timers and scheduled callbacks.
+    """
+    def __init__(self):
+        self.now_us = 0
+        # Called with (dt_us) whenever time moves
+        self.listeners = []
+        self._timers = []
+        self._scheduled = []
+        self._in_irq = False
+
+    # ==========================
+    # Timers
+    # ==========================
+    def add_timer(self, timer):
+        """
+        Register a timer, timer.next_us must be set.
+        """
+        if timer not in self._timers:
+            self._timers.append(timer)
+
+    def remove_timer(self, timer):
+        """
+        Stop a timer from firing.
+        """
+        if timer in self._timers:
+            self._timers.remove(timer)
+
+    # ==========================
+    # micropython.schedule
+    # ==========================
+    def schedule(self, func, arg):
+        """
+        Queue a callback like micropython.schedule, raising when the queue is full.
+        """
+        if len(self._scheduled) >= SCHEDULE_DEPTH:
+            raise RuntimeError("schedule queue full")
+        self._scheduled.append((func, arg))
+
+    def run_scheduled(self):
+        """
+        Run everything queued by micropython.schedule.
+        """
+        while self._scheduled:
+            func, arg = self._scheduled.pop(0)
+            func(arg)
+
+    def irq(self, handler, arg):
+        """
+        Run an IRQ handler now, then whatever it scheduled unless another IRQ is
+        already being handled (that one runs the queue when it's done).
+        """
+        nested = self._in_irq
+        self._in_irq = True
+        try:
+            handler(arg)
+            if not nested:
+                self.run_scheduled()
+        finally:
+            self._in_irq = nested
+
+    # ==========================
+    # Time
+    # ==========================
+    def advance(self, dt_us: int):
+        """
+        Move time forward by dt_us.
+        """
+        self.advance_to(self.now_us + int(dt_us))
+
+    def advance_to(self, t_us: int):
+        """
+        Move time forward to t_us, firing timers and stepping the world on the way.
+        """
+        if self._in_irq:
+            # Someone is sleeping in a callback, just let time pass
+            self._run_to(max(t_us, self.now_us))
+            return
+        self.run_scheduled()
+        while True:
+            timer = None
+            for t in self._timers:
+                if t.next_us <= t_us and (timer is None or t.next_us < timer.next_us):
+                    timer = t
+            if timer is None:
+                break
+            self._run_to(timer.next_us)
+            if timer.period_us:
+                timer.next_us += timer.period_us
+            else:
+                self._timers.remove(timer)
+            self._in_irq = True
+            try:
+                timer.callback(timer)
+                self.run_scheduled()
+            finally:
+                self._in_irq = False
+        self._run_to(t_us)
+
+    def _run_to(self, t_us: int):
+        """
+        Step the listeners up to t_us in physics sized chunks.
+        """
+        while self.now_us < t_us:
+            dt = min(PHYSICS_STEP_US, t_us - self.now_us)
+            self.now_us += dt
+            for listener in self.listeners:
+                listener(dt)
+
+
+clock = Clock()
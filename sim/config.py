@@ -0,0 +1,151 @@
+####################################################################################################
+#
+# Config for the simulator.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Physical constants of the simulated robot and track.
+
+Distances are in mm, times in ms unless stated otherwise. The robot numbers are
+picked so the simulated timings land near the ones in the log files, they are not
+measurements.
+"""
+
+from grabber.components.types.resistance import Reel
+
+### Clock
+
+# Physics step - the world is integrated at least this often
+PHYSICS_STEP_US = 1000
+
+### Robot
+
+# Pins, as wired in navigation.components.motorController / grabber.components.servoController
+LEFT_MOTOR_PINS = {"dir": 4, "PWM": 5}
+RIGHT_MOTOR_PINS = {"dir": 7, "PWM": 6}
+JAW_SERVO_PIN = 13
+LIFTER_SERVO_PIN = 15
+# I2C bus ids used by the ToFs
+LEFT_TOF_BUS = 0
+RIGHT_TOF_BUS = 1
+
+# Distance between the wheels
+TRACK_WIDTH = 170
+# Wheel speed at 100% duty. 95% -> ~90 degrees in 625ms when spinning on the spot
+MAX_WHEEL_SPEED = 225
+# Below this duty the motors stall
+MOTOR_DEADBAND = 0.08
+# First order lag of the wheels getting up to speed
+MOTOR_TIME_CONSTANT = 60
+
+# Line sensors, relative to the wheel axle: forward offset and lateral (+ right) offset
+LINE_SENSOR_FORWARD = 40
+LINE_SENSOR_LATERAL = {
+    "OUTER_LEFT": -50,
+    "INNER_LEFT": -7,
+    "INNER_RIGHT": 7,
+    "OUTER_RIGHT": 50,
+}
+# Sensors see the line a little before their centre is on it
+LINE_SENSOR_SPOT_RADIUS = 3
+
+# Grabber jaw relative to the wheel axle
+GRABBER_FORWARD = 90
+# Pulse width the jaw is considered closed below (us), between JAW_CLOSED and JAW_OPEN
+JAW_CLOSED_BELOW = 1525
+
+# ToFs look sideways, mounted this far out from the middle of the robot
+TOF_LATERAL = 60
+TOF_BACKGROUND = 600
+TOF_NOISE = 8
+# How far along the robot a bay is still seen
+TOF_FIELD_HALF_WIDTH = 60
+# Ranging period in continuous mode (us), roughly the default timing budget
+TOF_PERIOD_US = 33000
+# Single shot measurements and the init calibrations (us)
+TOF_SINGLE_SHOT_US = 25000
+
+### Track
+
+LINE_HALF_WIDTH = 9.5
+# Half length of the marker bars across the line
+CROSSBAR_HALF_LENGTH = 60
+# Pickup / dropoff bays end in a pad, starting at the node and going away from the junction.
+# Deep enough that the robot stops on it, so reversing out isn't seen as a junction.
+PAD_HALF_WIDTH = 60
+PAD_DEPTH = 60
+
+# Node positions, x to the east and y to the north, origin at J27.
+# Bays are deep enough that the timed drive into them doesn't reach the pad.
+NODE_POSITIONS = {
+    "START_BOX": (1000, -300),
+    "S": (1000, -150),
+    "P1": (0, -300),
+    "P2": (500, -300),
+    "P3": (1500, -300),
+    "P4": (2000, -300),
+    "J27": (0, 0),
+    "J28": (500, 0),
+    "J29": (1000, 0),
+    "J30": (1500, 0),
+    "J31": (2000, 0),
+    "J26": (1000, 450),
+    "J34": (780, 450),
+    "J35": (1220, 450),
+    "J36": (0, 1400),
+    "J37": (2000, 1400),
+    "J32": (0, 1700),
+    "J25": (1000, 1700),
+    "J33": (2000, 1700),
+}
+# Dropoff columns: (first junction, junction x, bay x)
+DROPOFF_COLUMNS = (
+    (1, 0, 300),
+    (7, 2000, 1700),
+    (13, 780, 480),
+    (19, 1220, 1520),
+)
+DROPOFF_FIRST_Y = 600
+DROPOFF_SPACING = 120
+for _first, _jx, _dx in DROPOFF_COLUMNS:
+    for _i in range(6):
+        _y = DROPOFF_FIRST_Y + _i * DROPOFF_SPACING
+        NODE_POSITIONS["J{}".format(_first + _i)] = (_jx, _y)
+        NODE_POSITIONS["D{}".format(_first + _i)] = (_dx, _y)
+
+# Nodes with a bar across the line so they're detected as a junction
+CROSSBAR_NODES = ("S", "J36", "J37")
+# Worn patch of line left behind the line sensors by --scuff, the robot reversing out
+# of the bay is off the line over it for longer than LINE_LOST_TIME
+SCUFF_OFFSET = 30
+SCUFF_LENGTH = 70
+# Nodes ending in a pad
+PAD_NODES = ("P1", "P2", "P3", "P4") + tuple("D{}".format(i) for i in range(1, 25))
+
+# Where the robot starts, on the line just inside the start box
+START_POSITION = (1000, -280)
+START_HEADING = "N"
+
+### Reels
+
+REELS_PER_PICKUP = 2
+# Bays that already have a reel in them at the start
+PREOCCUPIED_BAYS = 4
+# ADC reading with each reel in the jaw
+REEL_ADC = {
+    Reel.REEL_0: 30000,
+    Reel.REEL_1: 57000,
+    Reel.REEL_2: 2000,
+    Reel.REEL_3: 50000,
+}
+ADC_NOISE = 400
+# Nothing in the jaw
+OPEN_CIRCUIT_ADC = 65000
+# How close the jaw has to be to a pickup / bay to grab / place a reel
+PICKUP_RADIUS = 150
+DROPOFF_RADIUS = 150
+# Distance from the ToF to the face of a reel in a bay
+REEL_RADIUS = 50
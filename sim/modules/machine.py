@@ -0,0 +1,170 @@
+####################################################################################################
+#
+# Simulated machine module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Stand-in for MicroPython's machine module, wired to sim.board and sim.clock.
+"""
+
+from sim.board import board
+from sim.clock import clock
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id.id if isinstance(id, Pin) else id
+        self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self, x=None):
+        if x is None:
+            return board.read(self.id)
+        board.outputs[self.id] = 1 if x else 0
+
+    def __call__(self, x=None):
+        return self.value(x)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(not board.outputs.get(self.id, 0))
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        if handler is None:
+            board.irqs.pop(self.id, None)
+        else:
+            board.irqs[self.id] = (handler, trigger, self)
+
+
+class PWM:
+    def __init__(self, dest, freq=None, duty_u16=None, duty_ns=None, invert=False):
+        self.pin = dest if isinstance(dest, Pin) else Pin(dest)
+        self._freq = 0
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def init(self, freq=None, duty_u16=None, duty_ns=None):
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return board.duty(self.pin.id)
+        board.pwm[self.pin.id] = max(0, min(65535, int(value)))
+
+    def deinit(self):
+        board.pwm.pop(self.pin.id, None)
+
+
+class ADC:
+    def __init__(self, pin):
+        self.id = pin.id if isinstance(pin, Pin) else pin
+
+    def read_u16(self):
+        source = board.adc.get(self.id, None)
+        return source() if source is not None else 0
+
+
+class I2C:
+    def __init__(self, id=0, *, scl=None, sda=None, freq=400_000, timeout=50_000):
+        self.id = id
+
+    def _device(self, addr):
+        device = board.i2c.get(self.id, {}).get(addr, None)
+        if device is None:
+            # ENODEV, same as the Pico when nothing acks
+            raise OSError(19)
+        return device
+
+    def scan(self):
+        return sorted(board.i2c.get(self.id, {}))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        return self._device(addr).read(memaddr, nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        data = self._device(addr).read(memaddr, len(buf))
+        buf[: len(data)] = data
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        self._device(addr).write(memaddr, buf)
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.callback = None
+        self.period_us = 0
+        self.next_us = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, *, mode=PERIODIC, freq=-1, period=-1, callback=None):
+        if freq > 0:
+            period_us = 1_000_000 // freq
+        else:
+            period_us = max(1, period) * 1000
+        self.callback = callback
+        self.period_us = period_us if mode == Timer.PERIODIC else 0
+        self.next_us = clock.now_us + period_us
+        clock.add_timer(self)
+
+    def deinit(self):
+        clock.remove_timer(self)
+
+
+def freq(hz=None):
+    return 125_000_000
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    return
+
+
+def idle():
+    return
+
+
+def reset():
+    raise SystemExit("machine.reset()")
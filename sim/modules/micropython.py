@@ -0,0 +1,63 @@
+####################################################################################################
+#
+# Simulated micropython module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Stand-in for the micropython module. Code emitters are no-ops on the host, the
+viper pointer casts they make available are put in builtins.
+"""
+
+import builtins
+
+from sim.clock import clock
+
+
+def const(value):
+    return value
+
+
+def schedule(func, arg):
+    clock.schedule(func, arg)
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def alloc_emergency_exception_buf(size):
+    return
+
+
+def mem_info(*args):
+    return
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
+
+
+class _ptr8:
+    """
+    Viper ptr8 cast: byte access to a buffer, stores truncate like on the device.
+    """
+    __slots__ = ("buf",)
+
+    def __init__(self, buf):
+        self.buf = buf
+
+    def __getitem__(self, i):
+        return self.buf[i]
+
+    def __setitem__(self, i, value):
+        self.buf[i] = value & 0xFF
+
+
+builtins.ptr8 = _ptr8
@@ -0,0 +1,189 @@
+####################################################################################################
+#
+# Simulated rp2 module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Stand-in for the PIO parts of the rp2 module.
+
+asm_pio assembles into a list of instructions like the real one, by running the
+program with the assembler names in its globals. StateMachine runs them against the
+board pins as the clock moves, counting cycles at its frequency. Only what sampling
+programs need is there: in_ from pins with autopush, nop, wrap_target / wrap and
+delays. Anything else raises NotImplementedError when assembled.
+"""
+
+from collections import deque
+
+from sim.board import board
+from sim.clock import clock
+
+# Depth of one FIFO, doubled when joined
+FIFO_DEPTH = 4
+
+
+class PIO:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+
+
+class _Instruction:
+    """
+    One assembled instruction, [n] sets the delay like in the real assembler.
+    """
+    def __init__(self, op, *args):
+        self.op = op
+        self.args = args
+        self.delay = 0
+
+    def __getitem__(self, delay):
+        self.delay = delay
+        return self
+
+
+class _Program:
+    def __init__(self, instructions, wrap_target, wrap, options):
+        self.instructions = instructions
+        self.wrap_target = wrap_target
+        self.wrap = wrap
+        self.options = options
+
+
+def asm_pio(**options):
+    def assemble(func):
+        instructions = []
+        marks = {}
+
+        def emit(op):
+            def instruction(*args):
+                instructions.append(_Instruction(op, *args))
+                return instructions[-1]
+
+            return instruction
+
+        def unsupported(name):
+            def instruction(*args):
+                raise NotImplementedError("sim rp2: {} isn't simulated".format(name))
+
+            return instruction
+
+        names = {
+            "in_": emit("in"),
+            "nop": emit("nop"),
+            "pins": "pins",
+            "wrap_target": lambda: marks.__setitem__("wrap_target", len(instructions)),
+            "wrap": lambda: marks.__setitem__("wrap", len(instructions) - 1),
+        }
+        for name in ("out", "push", "pull", "mov", "irq", "set", "jmp", "wait", "label"):
+            names[name] = unsupported(name)
+
+        # Same trick as MicroPython - run the body with the assembler in its globals
+        saved = {k: func.__globals__[k] for k in names if k in func.__globals__}
+        func.__globals__.update(names)
+        try:
+            func()
+        finally:
+            for k in names:
+                del func.__globals__[k]
+            func.__globals__.update(saved)
+
+        return _Program(
+            instructions,
+            marks.get("wrap_target", 0),
+            marks.get("wrap", len(instructions) - 1),
+            options,
+        )
+
+    return assemble
+
+
+class StateMachine:
+    def __init__(self, id, program=None, freq=-1, **kwargs):
+        self.id = id
+        self.rx = deque()
+        self._active = False
+        if program is not None:
+            self.init(program, freq, **kwargs)
+
+    def init(self, program, freq=-1, *, in_base=None, **kwargs):
+        options = program.options
+        self.program = program
+        self.freq = freq if freq > 0 else 125_000_000
+        self.in_base = in_base.id if in_base is not None else 0
+        self.shift_left = options.get("in_shiftdir", PIO.SHIFT_LEFT) == PIO.SHIFT_LEFT
+        self.autopush = options.get("autopush", False)
+        self.push_thresh = options.get("push_thresh", 32)
+        joined = options.get("fifo_join", PIO.JOIN_NONE) == PIO.JOIN_RX
+        self.depth = FIFO_DEPTH * 2 if joined else FIFO_DEPTH
+        self.restart()
+
+    def restart(self):
+        self.pc = self.program.wrap_target
+        self.isr = 0
+        self.isr_count = 0
+        self._cycles = 0.0
+        # Cycles left before the current instruction (with its delay) is done
+        self._busy = 0
+        self.rx.clear()
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+        if self._active and self._step not in clock.listeners:
+            clock.listeners.append(self._step)
+        elif not self._active and self._step in clock.listeners:
+            clock.listeners.remove(self._step)
+
+    def rx_fifo(self):
+        return len(self.rx)
+
+    def get(self, buf=None, shift=0):
+        # Blocking on the device, here the FIFO would never fill
+        if not self.rx:
+            raise RuntimeError("sim rp2: get() on an empty FIFO would block forever")
+        return self.rx.popleft() >> shift
+
+    def _step(self, dt_us):
+        """
+        Run the program for dt_us worth of cycles.
+        """
+        self._cycles += dt_us * self.freq / 1_000_000
+        while self._cycles >= 1:
+            if self._busy == 0:
+                self._execute(self.program.instructions[self.pc])
+            whole = min(self._busy, int(self._cycles))
+            self._busy -= whole
+            self._cycles -= whole
+
+    def _execute(self, instruction):
+        if instruction.op == "in":
+            source, bits = instruction.args
+            value = 0
+            for i in range(bits):
+                value |= board.read(self.in_base + i) << i
+            if self.shift_left:
+                self.isr = ((self.isr << bits) | value) & 0xFFFFFFFF
+            else:
+                self.isr = (self.isr >> bits) | (value << (32 - bits))
+            self.isr_count += bits
+            if self.autopush and self.isr_count >= self.push_thresh:
+                # Stalls on the device when full, the newest sample is lost here
+                if len(self.rx) < self.depth:
+                    self.rx.append(self.isr)
+                self.isr = 0
+                self.isr_count = 0
+        self._busy = 1 + instruction.delay
+        self.pc = (
+            self.program.wrap_target if self.pc == self.program.wrap else self.pc + 1
+        )
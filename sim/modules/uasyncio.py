@@ -0,0 +1,250 @@
+####################################################################################################
+#
+# Simulated uasyncio module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Minimal uasyncio on the virtual clock.
+
+A single threaded scheduler like MicroPython's: tasks run until they await a sleep
+or another task, and when every task is waiting the clock jumps to the next wake up
+(firing timers and stepping the world on the way). Covers run, create_task, gather,
+sleep, sleep_ms, wait_for(_ms), Event and ThreadSafeFlag.
+"""
+
+from heapq import heappop, heappush
+
+from sim.clock import clock
+
+
+class CancelledError(BaseException):
+    pass
+
+
+class TimeoutError(Exception):
+    pass
+
+
+class _Sleep:
+    """
+    Awaitable handing a sleep request to the scheduler.
+    """
+    __slots__ = ("us",)
+
+    def __init__(self, us):
+        self.us = us
+
+    def __await__(self):
+        yield self
+
+
+class Task:
+    """
+    A coroutine being run by the scheduler.
+    """
+    def __init__(self, coro):
+        self.coro = coro
+        self.done_ = False
+        self.result = None
+        self.exc = None
+        self.waiters = []
+        self._throw = None
+
+    def done(self):
+        return self.done_
+
+    def cancel(self):
+        if self.done_:
+            return False
+        self._throw = CancelledError()
+        _loop.wake(self)
+        return True
+
+    def __await__(self):
+        if not self.done_:
+            yield self
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+class _Loop:
+    """
+    Heap of (wake time, sequence, task) run on the virtual clock.
+    """
+    def __init__(self):
+        self.queue = []
+        self._seq = 0
+
+    def push(self, task, at_us):
+        self._seq += 1
+        heappush(self.queue, (at_us, self._seq, task))
+
+    def wake(self, task):
+        # Drop any pending sleep so it's not run twice
+        self.queue = [entry for entry in self.queue if entry[2] is not task]
+        self.queue.sort()
+        self.push(task, clock.now_us)
+
+    def step(self, task):
+        """
+        Run a task until it next waits.
+        """
+        try:
+            if task._throw is not None:
+                exc, task._throw = task._throw, None
+                request = task.coro.throw(exc)
+            else:
+                request = task.coro.send(None)
+        except StopIteration as e:
+            self._finish(task, e.value, None)
+            return
+        except BaseException as e:  # noqa: B036 - cancel / errors go to the awaiter
+            self._finish(task, None, e)
+            return
+
+        if isinstance(request, _Sleep):
+            self.push(task, clock.now_us + request.us)
+        elif isinstance(request, Task):
+            if request.done_:
+                self.push(task, clock.now_us)
+            else:
+                request.waiters.append(task)
+        elif isinstance(request, _EventWait):
+            request.event.waiting.append(task)
+        else:
+            # Bare yield - just let everything else run
+            self.push(task, clock.now_us)
+
+    def _finish(self, task, result, exc):
+        task.done_ = True
+        task.result = result
+        task.exc = exc
+        if task.waiters:
+            for waiter in task.waiters:
+                self.push(waiter, clock.now_us)
+            task.waiters = []
+        elif exc is not None and not isinstance(exc, CancelledError):
+            print("Task exception wasn't retrieved")
+            raise exc
+
+    def run_until_complete(self, main):
+        while not main.done_:
+            if not self.queue:
+                raise RuntimeError("uasyncio: every task is waiting forever")
+            at_us, _, task = heappop(self.queue)
+            if task.done_:
+                continue
+            if at_us > clock.now_us:
+                clock.advance_to(at_us)
+            self.step(task)
+        if main.exc is not None:
+            raise main.exc
+        return main.result
+
+
+_loop = _Loop()
+
+
+def create_task(coro):
+    task = coro if isinstance(coro, Task) else Task(coro)
+    _loop.push(task, clock.now_us)
+    return task
+
+
+def run(coro):
+    main = create_task(coro)
+    # Main has no awaiter, keep its exception for run to raise
+    main.waiters.append(_Sink())
+    return _loop.run_until_complete(main)
+
+
+class _Sink:
+    """
+    Stand-in awaiter so the main task's exception isn't reported twice.
+    """
+    done_ = True
+    _throw = None
+
+
+def get_event_loop():
+    return _loop
+
+
+def sleep(t):
+    return _Sleep(int(t * 1_000_000))
+
+
+def sleep_ms(t):
+    return _Sleep(int(t * 1000))
+
+
+async def gather(*aws, return_exceptions=False):
+    tasks = [aw if isinstance(aw, Task) else create_task(aw) for aw in aws]
+    results = []
+    for task in tasks:
+        try:
+            results.append(await task)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+async def wait_for_ms(aw, timeout):
+    task = aw if isinstance(aw, Task) else create_task(aw)
+    deadline = clock.now_us + timeout * 1000
+    while not task.done_:
+        if clock.now_us >= deadline:
+            task.cancel()
+            raise TimeoutError()
+        await _Sleep(min(1000, deadline - clock.now_us))
+    return await task
+
+
+async def wait_for(aw, timeout):
+    return await wait_for_ms(aw, int(timeout * 1000))
+
+
+class Event:
+    def __init__(self):
+        self.state = False
+        self.waiting = []
+
+    def is_set(self):
+        return self.state
+
+    def set(self):
+        self.state = True
+        for task in self.waiting:
+            _loop.push(task, clock.now_us)
+        self.waiting = []
+
+    def clear(self):
+        self.state = False
+
+    async def wait(self):
+        while not self.state:
+            await _EventWait(self)
+        return True
+
+
+class _EventWait:
+    """
+    Awaitable parking the current task on an Event.
+    """
+    def __init__(self, event):
+        self.event = event
+
+    def __await__(self):
+        yield self
+
+
+class ThreadSafeFlag(Event):
+    async def wait(self):
+        await Event.wait(self)
+        self.state = False
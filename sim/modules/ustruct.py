@@ -0,0 +1,58 @@
+####################################################################################################
+#
+# Simulated ustruct module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Stand-in for ustruct. MicroPython truncates integers that don't fit the format
+rather than raising like CPython, and the VL53L0X driver relies on it.
+"""
+
+import struct as _struct
+from struct import calcsize, unpack, unpack_from  # noqa: F401
+
+_INTEGER_CODES = "bBhHiIlLqQ"
+
+
+def _codes(fmt):
+    """
+    Format codes one per packed value, expanding repeat counts.
+    """
+    codes = []
+    count = ""
+    for c in fmt:
+        if c.isdigit():
+            count += c
+            continue
+        if c in "<>!=@":
+            continue
+        n = int(count) if count else 1
+        count = ""
+        if c == "s":
+            codes.append(c)
+        elif c != "x":
+            codes.extend(c * n)
+    return codes
+
+
+def _truncate(fmt, values):
+    out = []
+    for c, v in zip(_codes(fmt), values):
+        if c in _INTEGER_CODES:
+            bits = 8 * _struct.calcsize("<" + c)
+            v = int(v) & ((1 << bits) - 1)
+            if c.islower() and v >= 1 << (bits - 1):
+                v -= 1 << bits
+        out.append(v)
+    return out
+
+
+def pack(fmt, *values):
+    return _struct.pack(fmt, *_truncate(fmt, values))
+
+
+def pack_into(fmt, buffer, offset, *values):
+    _struct.pack_into(fmt, buffer, offset, *_truncate(fmt, values))
@@ -0,0 +1,58 @@
+####################################################################################################
+#
+# Simulated utime module.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Stand-in for MicroPython's utime on the virtual clock, ticks wrap like on the Pico.
+"""
+
+from sim.clock import clock
+
+# MicroPython ticks are 30 bit
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALFPERIOD = _TICKS_PERIOD // 2
+
+
+def ticks_ms():
+    return (clock.now_us // 1000) & _TICKS_MAX
+
+
+def ticks_us():
+    return clock.now_us & _TICKS_MAX
+
+
+# No cycle counter, us is close enough for the PID
+ticks_cpu = ticks_us
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & _TICKS_MAX
+
+
+def sleep_ms(ms):
+    clock.advance(ms * 1000)
+
+
+def sleep_us(us):
+    clock.advance(us)
+
+
+def sleep(seconds):
+    clock.advance(seconds * 1_000_000)
+
+
+def time():
+    return clock.now_us // 1_000_000
+
+
+def time_ns():
+    return clock.now_us * 1000
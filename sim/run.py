@@ -0,0 +1,134 @@
+####################################################################################################
+#
+# Entry point for a simulated run.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Run overallnavigation.robot() end to end in the simulator, from the repo root:
+
+    python -m sim.run [--seed N] [--duration MS] [--debug] [--events] [--profile]
+                      [--scuff N] [--set NAME=VALUE ...]
+
+The robot loop only ends on a button press, so the button is pressed once the
+duration is up. Prints what got delivered and how the run went.
+"""
+
+import argparse
+import ast
+import sys
+import time
+import traceback
+
+from sim import install
+
+# Extra time after RUN_TIME for getting back to the start
+DEFAULT_OVERRUN = 30_000
+
+
+def report(world, wall_s: float, failed: bool):
+    """
+    Print the summary of a run.
+    """
+    from sim.clock import clock
+
+    sim_s = clock.now_us / 1_000_000
+    correct = sum(1 for _, _, ok in world.delivered if ok)
+    print("=" * 60)
+    print(
+        "Simulated {:.1f}s in {:.1f}s wall ({:.0f}x real time){}".format(
+            sim_s, wall_s, sim_s / wall_s if wall_s else 0, " - FAILED" if failed else ""
+        )
+    )
+    print("Picked up:  {}".format(len(world.picked)))
+    print("Delivered:  {} ({} in the right row)".format(len(world.delivered), correct))
+    print("Dropped:    {}".format(len(world.dropped)))
+    print("Distance:   {:.0f}mm".format(world.odometer))
+    print("Max offset: {:.0f}mm from the line".format(world.max_line_offset))
+    print(
+        "Final pose: ({:.0f}, {:.0f}) heading {:.0f} deg".format(
+            world.x, world.y, world.heading * 180 / 3.141592653589793
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated AGV run")
+    parser.add_argument("--seed", type=int, default=0, help="seed for reels and noise")
+    parser.add_argument(
+        "--duration", type=int, default=None, help="virtual ms before the button press"
+    )
+    parser.add_argument("--debug", action="store_true", help="print the robot log")
+    parser.add_argument("--events", action="store_true", help="print world events")
+    parser.add_argument(
+        "--scuff",
+        type=int,
+        default=None,
+        metavar="N",
+        help="wear the line away behind the robot at the Nth delivery, so it loses "
+        "the line reversing out of the bay",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="profile the control loop ISR / handler"
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a constant in the global config, e.g. LINE_SENSOR_PIO=True",
+    )
+    args = parser.parse_args(argv)
+
+    world = install(args.seed)
+    world.scuff_delivery = args.scuff
+
+    # Has to happen before the logger is imported
+    import config
+
+    if args.debug:
+        config.DEBUG = config.USB_DEBUG = True
+    if args.profile:
+        config.PROFILE_CONTROL_LOOP = True
+    for override in args.set:
+        name, _, value = override.partition("=")
+        if not hasattr(config, name):
+            parser.error("config has no {}".format(name))
+        setattr(config, name, ast.literal_eval(value))
+
+    import uasyncio  # type: ignore
+    from machine import Timer  # type: ignore
+
+    import overallnavigation
+
+    duration = args.duration or config.RUN_TIME + DEFAULT_OVERRUN
+
+    def press(_):
+        world.button_pressed = True
+
+    Timer(mode=Timer.ONE_SHOT, period=duration, callback=press)
+
+    failed = False
+    start = time.perf_counter()
+    try:
+        uasyncio.run(overallnavigation.robot())
+    except Exception:
+        traceback.print_exc()
+        failed = True
+    wall_s = time.perf_counter() - start
+
+    if args.events:
+        for ms, event in world.events:
+            print("{:>7} {}".format(ms, event))
+    if args.profile:
+        # The robot only logs it, which needs --debug to see
+        for line in overallnavigation.profiler.report():
+            print(line)
+    report(world, wall_s, failed)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
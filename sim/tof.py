@@ -0,0 +1,209 @@
+####################################################################################################
+#
+# Simulated VL53L0X ToF sensor.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Register level stand-in for the VL53L0X, enough for misc.components.utils.VL53L0X.
+
+Registers are plain storage apart from the few the driver polls or the ranging
+registers, which are backed by a range callable from the world. Single shots (the
+driver's init calibrations) take TOF_SINGLE_SHOT_US. Continuous ranging
+takes the timing budget the sequence and timeout registers work out to, or the
+intermeasurement period in timed mode if that's longer.
+
+With an interrupt pin the sensor measures on its own time rather than when polled,
+driving GPIO1 while a sample is waiting and raising the pin's IRQ on the edge.
+"""
+
+from sim.board import board
+from sim.clock import clock
+from sim.config import TOF_PERIOD_US, TOF_SINGLE_SHOT_US
+
+_SYSRANGE_START = 0x00
+_SEQUENCE_CONFIG = 0x01
+_MEASURE_PERIOD = 0x04
+_MSRC_TIMEOUT = 0x46
+_PRE_RANGE_VCSEL = 0x50
+_PRE_RANGE_TIMEOUT = 0x51
+_FINAL_RANGE_VCSEL = 0x70
+_FINAL_RANGE_TIMEOUT = 0x71
+_INTERRUPT_CLEAR = 0x0B
+_GPIO_HV_MUX = 0x84
+_RESULT_INTERRUPT_STATUS = 0x13
+_RESULT_RANGE = 0x1E
+_SPAD_READY = 0x83
+_SPAD_INFO = 0x92
+_MODEL_ID = 0xC0
+
+# New sample ready, as reported in RESULT_INTERRUPT_STATUS
+_STATUS_READY = 0x04
+# 44 reference SPADs, not aperture
+_SPAD_INFO_VALUE = 0x2C
+
+
+class fakeVL53L0X:
+    """
+    I2C register device behaving like a VL53L0X for the parts the driver uses.
+    """
+    def __init__(self, range_mm, int_pin=None):
+        """
+        Args:
+            range_mm (callable): Returns the distance the sensor sees right now in mm.
+            int_pin (int | None): GPIO GPIO1 is wired to, None if it isn't.
+        """
+        self.range_mm = range_mm
+        self.registers = bytearray(256)
+        self.registers[_MODEL_ID] = 0xEE
+        self.registers[_SPAD_READY] = 0x01
+        self.registers[_SPAD_INFO] = _SPAD_INFO_VALUE
+
+        self.continuous = False
+        self.period_us = TOF_PERIOD_US
+        self._next_sample_us = 0
+        # Due time of a single shot in flight
+        self._single_shot_us = None
+        self.samples = 0
+
+        self.int_pin = int_pin
+        self._gpio1_level = self.gpio1()
+        if int_pin is not None:
+            board.inputs[int_pin] = self.gpio1
+            clock.listeners.append(self.tick)
+
+    # ==========================
+    # I2C interface
+    # ==========================
+    def read(self, register: int, size: int) -> bytes:
+        """
+        Read size consecutive registers.
+        """
+        if register == _RESULT_INTERRUPT_STATUS:
+            self._poll()
+        return bytes(self.registers[(register + i) & 0xFF] for i in range(size))
+
+    def write(self, register: int, data):
+        """
+        Write consecutive registers.
+        """
+        for i, value in enumerate(data):
+            self._write((register + i) & 0xFF, value)
+
+    # ==========================
+    # GPIO1
+    # ==========================
+    def gpio1(self) -> int:
+        """
+        Level of the interrupt output, active low unless the mux register says high.
+        """
+        active = 1 if self.registers[_GPIO_HV_MUX] & 0x10 else 0
+        return active if self.registers[_RESULT_INTERRUPT_STATUS] & 0x07 else 1 - active
+
+    def tick(self, dt_us: int):
+        """
+        Clock listener: measure when due and raise the pin IRQ on a GPIO1 edge.
+        Without a handler on the pin the sensor is left to be polled.
+        """
+        irq = board.irqs.get(self.int_pin)
+        if irq is None:
+            return
+        self._poll()
+        level = self.gpio1()
+        if level == self._gpio1_level:
+            return
+        self._gpio1_level = level
+        handler, trigger, pin = irq
+        # machine.Pin.IRQ_RISING / IRQ_FALLING
+        if trigger & (8 if level else 4):
+            clock.irq(handler, pin)
+
+    # ==========================
+    # Behaviour
+    # ==========================
+    def _write(self, register: int, value: int):
+        if register == _SYSRANGE_START:
+            if value & 0x01:
+                # Single shot (or stop), the bit self clears
+                self.continuous = False
+                self._single_shot_us = clock.now_us + TOF_SINGLE_SHOT_US
+                value = 0
+            elif value & 0x06:
+                # Back-to-back or timed continuous
+                self._single_shot_us = None
+                self.continuous = True
+                self.period_us = self._budget_us()
+                if value & 0x04:
+                    # Oscillator calibration reads 0 here so the period is in ms
+                    period = int.from_bytes(
+                        self.registers[_MEASURE_PERIOD : _MEASURE_PERIOD + 4], "big"
+                    )
+                    self.period_us = max(self.period_us, period * 1000)
+                self._next_sample_us = clock.now_us + self.period_us
+        elif register == _INTERRUPT_CLEAR:
+            if value & 0x01:
+                self.registers[_RESULT_INTERRUPT_STATUS] = 0
+            value = 0
+        elif register == _SPAD_READY:
+            # Always ready, never lets the driver's poll loop spin
+            value |= 0x01
+        self.registers[register] = value
+
+    def _poll(self):
+        """
+        Complete any single shot or continuous measurement that's due.
+        """
+        if self._single_shot_us is not None and clock.now_us >= self._single_shot_us:
+            self._single_shot_us = None
+            self._sample()
+        if self.continuous and clock.now_us >= self._next_sample_us:
+            self._sample()
+            # Keep to the ranging period even if nobody read for a while
+            periods = (clock.now_us - self._next_sample_us) // self.period_us + 1
+            self._next_sample_us += periods * self.period_us
+
+    def _register16(self, register: int) -> int:
+        return (self.registers[register] << 8) | self.registers[register + 1]
+
+    def _budget_us(self) -> int:
+        """
+        Measurement time from the sequence / timeout registers, like the driver's
+        budget calculation. TOF_PERIOD_US if they're not set up.
+        """
+        def macro_ns(vcsel_reg):
+            return (2304 * ((vcsel_reg + 1) << 1) * 1655 + 500) // 1000
+
+        def decode(reg_val):
+            return ((reg_val & 0xFF) << (reg_val >> 8)) + 1
+
+        seq = self.registers[_SEQUENCE_CONFIG]
+        pre_ns = macro_ns(self.registers[_PRE_RANGE_VCSEL])
+        final_ns = macro_ns(self.registers[_FINAL_RANGE_VCSEL])
+        pre_mclks = decode(self._register16(_PRE_RANGE_TIMEOUT))
+        final_mclks = decode(self._register16(_FINAL_RANGE_TIMEOUT))
+        if not seq & 0x80 or final_mclks <= 1:
+            return TOF_PERIOD_US
+        msrc_us = (self.registers[_MSRC_TIMEOUT] + 1) * pre_ns // 1000
+        budget = 1910 + 960
+        if seq & 0x10:
+            budget += msrc_us + 590
+        if seq & 0x08:
+            budget += 2 * (msrc_us + 690)
+        elif seq & 0x04:
+            budget += msrc_us + 660
+        if seq & 0x40:
+            budget += pre_mclks * pre_ns // 1000 + 660
+            final_mclks -= pre_mclks
+        return budget + final_mclks * final_ns // 1000 + 550
+
+    def _sample(self):
+        """
+        Take a measurement now and flag it as ready.
+        """
+        distance = max(0, min(8190, int(self.range_mm())))
+        self.registers[_RESULT_RANGE] = distance >> 8
+        self.registers[_RESULT_RANGE + 1] = distance & 0xFF
+        self.registers[_RESULT_INTERRUPT_STATUS] = _STATUS_READY
+        self.samples += 1
@@ -0,0 +1,121 @@
+####################################################################################################
+#
+# Track geometry for the simulator.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+from navigation.config import NODE_MAP
+
+from sim.config import (
+    CROSSBAR_HALF_LENGTH,
+    CROSSBAR_NODES,
+    LINE_HALF_WIDTH,
+    NODE_POSITIONS,
+    PAD_DEPTH,
+    PAD_HALF_WIDTH,
+    PAD_NODES,
+)
+
+# Unit vectors for the NODE_MAP directions
+DIRECTIONS = {"N": (0, 1), "E": (1, 0), "S": (0, -1), "W": (-1, 0)}
+
+
+class Track:
+    """
+    Black areas of the track as axis aligned rectangles, built from NODE_MAP and the
+    node positions: a line along every edge, bars at the marker nodes and pads at the bays.
+    """
+    def __init__(self):
+        # (x0, y0, x1, y1) with x0 <= x1 and y0 <= y1
+        self.rects = []
+        # Patches worn off the track, white whatever is under them
+        self.wiped = []
+        self._build()
+
+    def _build(self):
+        seen = set()
+        for name, neighbours in NODE_MAP.items():
+            x, y = NODE_POSITIONS[name]
+            for direction, (dx, dy) in DIRECTIONS.items():
+                other = neighbours[direction]
+                if other is None or (other, name) in seen:
+                    continue
+                seen.add((name, other))
+                ox, oy = NODE_POSITIONS[other]
+                # The map is a grid - catch typos in the positions early
+                if (ox - x) * dx < 0 or (oy - y) * dy < 0 or (ox != x and oy != y):
+                    raise ValueError(
+                        "{} is not {} of {} in NODE_POSITIONS".format(
+                            other, direction, name
+                        )
+                    )
+                self._line(x, y, ox, oy)
+
+        for name in CROSSBAR_NODES:
+            x, y = NODE_POSITIONS[name]
+            if self._leaves(name)[1]:
+                # Line is vertical, bar is horizontal
+                self._line(x - CROSSBAR_HALF_LENGTH, y, x + CROSSBAR_HALF_LENGTH, y)
+            else:
+                self._line(x, y - CROSSBAR_HALF_LENGTH, x, y + CROSSBAR_HALF_LENGTH)
+
+        for name in PAD_NODES:
+            x, y = NODE_POSITIONS[name]
+            dx, dy = self._leaves(name)
+            # Away from the junction
+            fx, fy = x - dx * PAD_DEPTH, y - dy * PAD_DEPTH
+            wx, wy = abs(dy) * PAD_HALF_WIDTH, abs(dx) * PAD_HALF_WIDTH
+            self._add(x - wx, y - wy, fx + wx, fy + wy)
+
+    def _leaves(self, name: str):
+        """
+        Unit vector of the first line leaving a node.
+        """
+        for direction, vector in DIRECTIONS.items():
+            if NODE_MAP[name][direction] is not None:
+                return vector
+        raise ValueError("{} has no neighbours".format(name))
+
+    def _line(self, x0, y0, x1, y1):
+        self._add(
+            min(x0, x1) - LINE_HALF_WIDTH,
+            min(y0, y1) - LINE_HALF_WIDTH,
+            max(x0, x1) + LINE_HALF_WIDTH,
+            max(y0, y1) + LINE_HALF_WIDTH,
+        )
+
+    def _add(self, x0, y0, x1, y1):
+        self.rects.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+
+    def wipe(self, x0, y0, x1, y1):
+        """
+        Wear a patch of the track away.
+        """
+        self.wiped.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+
+    def distance(self, x: float, y: float) -> float:
+        """
+        Distance from a point to the nearest black area, 0 if on one.
+        """
+        best = 1e18
+        for x0, y0, x1, y1 in self.rects:
+            cx = x0 if x < x0 else x1 if x > x1 else x
+            cy = y0 if y < y0 else y1 if y > y1 else y
+            d = (x - cx) * (x - cx) + (y - cy) * (y - cy)
+            if d < best:
+                best = d
+        return best**0.5
+
+    def on_line(self, x: float, y: float, radius: float = 0) -> bool:
+        """
+        Whether a sensor spot of the given radius centred on the point sees black.
+        """
+        for x0, y0, x1, y1 in self.wiped:
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return False
+        for x0, y0, x1, y1 in self.rects:
+            if x0 - radius <= x <= x1 + radius and y0 - radius <= y <= y1 + radius:
+                return True
+        return False
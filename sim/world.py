@@ -0,0 +1,334 @@
+####################################################################################################
+#
+# World model for the simulator.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+2D model of the robot on the track, standing in for everything the Pico is wired to.
+
+Differential drive kinematics from the motor PWM, line sensors against the track
+lines, ToFs against the reels in the bays and the resistance ADC against the reel in
+the jaw. Reels are picked up / placed when the jaw servo closes / opens.
+"""
+
+import math
+import random
+
+from config import (
+    BUTTON_PIN,
+    DEFAULT_TOF_ADDR,
+    LEFT_TOF_INT_PIN,
+    LINE_SENSOR_PINS,
+    RESISTANCE_SENSE_PIN,
+    RIGHT_TOF_INT_PIN,
+)
+from grabber.components.types.resistance import REEL_ARR
+from grabber.config import SERVO_PULSE_WIDTH
+from navigation.components.types.lineSensor import LineSensor
+from navigation.config import REEL_DROP_NODE
+
+from sim.board import board
+from sim.clock import clock
+from sim.config import (
+    ADC_NOISE,
+    DROPOFF_RADIUS,
+    GRABBER_FORWARD,
+    JAW_CLOSED_BELOW,
+    JAW_SERVO_PIN,
+    LEFT_MOTOR_PINS,
+    LEFT_TOF_BUS,
+    LINE_HALF_WIDTH,
+    LINE_SENSOR_FORWARD,
+    LINE_SENSOR_LATERAL,
+    LINE_SENSOR_SPOT_RADIUS,
+    MAX_WHEEL_SPEED,
+    MOTOR_DEADBAND,
+    MOTOR_TIME_CONSTANT,
+    NODE_POSITIONS,
+    OPEN_CIRCUIT_ADC,
+    PICKUP_RADIUS,
+    PREOCCUPIED_BAYS,
+    REEL_ADC,
+    REEL_RADIUS,
+    REELS_PER_PICKUP,
+    RIGHT_MOTOR_PINS,
+    RIGHT_TOF_BUS,
+    SCUFF_LENGTH,
+    SCUFF_OFFSET,
+    START_HEADING,
+    START_POSITION,
+    TOF_BACKGROUND,
+    TOF_FIELD_HALF_WIDTH,
+    TOF_LATERAL,
+    TOF_NOISE,
+    TRACK_WIDTH,
+)
+from sim.tof import fakeVL53L0X
+from sim.track import Track
+
+HEADINGS = {"N": math.pi / 2, "E": 0.0, "S": -math.pi / 2, "W": math.pi}
+
+# Sample the distance to the line every so many physics steps, it's not cheap
+LINE_OFFSET_SAMPLE_STEPS = 20
+
+
+class World:
+    """
+    The robot, the track and the reels.
+    """
+    def __init__(self, seed: int = 0):
+        self.random = random.Random(seed)
+        self.track = Track()
+
+        # Pose of the middle of the wheel axle, heading anticlockwise from east
+        self.x, self.y = START_POSITION
+        self.heading = HEADINGS[START_HEADING]
+        self.v_left = 0.0
+        self.v_right = 0.0
+
+        self.button_pressed = False
+        # Delivery to wear the line away behind the robot at, see _scuff
+        self.scuff_delivery = None
+        self.jaw_closed = False
+        self.held = None
+
+        # Reels waiting at every pickup, last one is taken first
+        self.pickups = {
+            name: [self.random.choice(REEL_ARR) for _ in range(REELS_PER_PICKUP)]
+            for name in NODE_POSITIONS
+            if name.startswith("P")
+        }
+        # Reel in every dropoff bay, None if empty
+        self.bays = {name: None for name in NODE_POSITIONS if name.startswith("D")}
+        for name in self.random.sample(sorted(self.bays), PREOCCUPIED_BAYS):
+            self.bays[name] = self.random.choice(REEL_ARR)
+
+        # Stats
+        self.odometer = 0.0
+        self.max_line_offset = 0.0
+        self.picked = []
+        self.delivered = []
+        self.dropped = []
+        self.events = []
+        self._steps = 0
+        # Line sensor readings this physics step, the pose only moves on a step
+        self._line_cache = {}
+
+        self._wire()
+        clock.listeners.append(self.step)
+
+    def _wire(self):
+        """
+        Hook the world up to the board the machine stand-ins use.
+        """
+        for sensor, pin in LINE_SENSOR_PINS.items():
+            lateral = LINE_SENSOR_LATERAL[_SENSOR_NAMES[sensor]]
+            board.inputs[pin] = self._line_sensor(lateral)
+        board.inputs[BUTTON_PIN] = lambda: 1 if self.button_pressed else 0
+        board.adc[RESISTANCE_SENSE_PIN] = self._resistance
+        board.i2c[LEFT_TOF_BUS] = {
+            DEFAULT_TOF_ADDR: fakeVL53L0X(
+                lambda: self.tof_range(-1), LEFT_TOF_INT_PIN
+            )
+        }
+        board.i2c[RIGHT_TOF_BUS] = {
+            DEFAULT_TOF_ADDR: fakeVL53L0X(
+                lambda: self.tof_range(1), RIGHT_TOF_INT_PIN
+            )
+        }
+
+    def log(self, msg, *args):
+        """
+        Record a world event against the virtual time.
+        """
+        self.events.append((clock.now_us // 1000, msg.format(*args)))
+
+    # ==========================
+    # Geometry
+    # ==========================
+    def _point(self, forward: float, lateral: float):
+        """
+        World position of a point on the robot, lateral positive to the right.
+        """
+        c = math.cos(self.heading)
+        s = math.sin(self.heading)
+        return (
+            self.x + forward * c + lateral * s,
+            self.y + forward * s - lateral * c,
+        )
+
+    def _line_sensor(self, lateral: float):
+        """
+        Input callable for a line sensor at the given lateral offset.
+        """
+        def read():
+            value = self._line_cache.get(lateral)
+            if value is None:
+                x, y = self._point(LINE_SENSOR_FORWARD, lateral)
+                value = 1 if self.track.on_line(x, y, LINE_SENSOR_SPOT_RADIUS) else 0
+                self._line_cache[lateral] = value
+            return value
+
+        return read
+
+    def _nearest(self, names, x: float, y: float, radius: float):
+        """
+        Nearest of the named nodes within radius of the point, None if there isn't one.
+        """
+        best = None
+        best_d = radius
+        for name in names:
+            nx, ny = NODE_POSITIONS[name]
+            d = math.hypot(nx - x, ny - y)
+            if d <= best_d:
+                best = name
+                best_d = d
+        return best
+
+    # ==========================
+    # Sensors
+    # ==========================
+    def tof_range(self, side: int) -> float:
+        """
+        Distance seen by a ToF looking out of the side of the robot (+1 right, -1 left).
+        """
+        c = math.cos(self.heading)
+        s = math.sin(self.heading)
+        distance = TOF_BACKGROUND
+        for name, reel in self.bays.items():
+            if reel is None:
+                continue
+            nx, ny = NODE_POSITIONS[name]
+            rx = nx - self.x
+            ry = ny - self.y
+            along = rx * c + ry * s
+            across = side * (rx * s - ry * c)
+            if across > 0 and abs(along) <= TOF_FIELD_HALF_WIDTH:
+                distance = min(distance, across - TOF_LATERAL - REEL_RADIUS)
+        return distance + self.random.gauss(0, TOF_NOISE)
+
+    def _resistance(self) -> int:
+        """
+        Resistance ADC reading for whatever is in the jaw.
+        """
+        if self.held is None:
+            return OPEN_CIRCUIT_ADC
+        value = REEL_ADC[self.held] + self.random.gauss(0, ADC_NOISE)
+        return max(0, min(65535, int(value)))
+
+    # ==========================
+    # Physics
+    # ==========================
+    def _wheel_target(self, pins) -> float:
+        """
+        Wheel speed the motor is driving towards, from its direction pin and PWM duty.
+        """
+        duty = board.duty(pins["PWM"]) / 65535
+        if duty < MOTOR_DEADBAND:
+            return 0.0
+        # Direction.FORWARD == 1
+        sign = 1 if board.read(pins["dir"]) else -1
+        return sign * duty * MAX_WHEEL_SPEED
+
+    def step(self, dt_us: int):
+        """
+        Integrate the robot forward by dt_us.
+        """
+        dt = dt_us / 1_000_000
+        alpha = min(1.0, dt_us / (MOTOR_TIME_CONSTANT * 1000))
+        self.v_left += (self._wheel_target(LEFT_MOTOR_PINS) - self.v_left) * alpha
+        self.v_right += (self._wheel_target(RIGHT_MOTOR_PINS) - self.v_right) * alpha
+
+        v = (self.v_left + self.v_right) / 2
+        w = (self.v_right - self.v_left) / TRACK_WIDTH
+        mid = self.heading + w * dt / 2
+        self.x += v * math.cos(mid) * dt
+        self.y += v * math.sin(mid) * dt
+        self.heading = (self.heading + w * dt + math.pi) % (2 * math.pi) - math.pi
+        self.odometer += abs(v) * dt
+        self._line_cache.clear()
+
+        self._steps += 1
+        if self._steps % LINE_OFFSET_SAMPLE_STEPS == 0:
+            x, y = self._point(LINE_SENSOR_FORWARD, 0)
+            self.max_line_offset = max(self.max_line_offset, self.track.distance(x, y))
+
+        self._update_jaw()
+
+    def _scuff(self):
+        """
+        Wear the line away just behind the line sensors, where they'll go reversing
+        out of the bay.
+        """
+        x, y = self._point(LINE_SENSOR_FORWARD, 0)
+        # Bays are axis aligned, snap along the line and across it
+        c = round(math.cos(self.heading))
+        s = round(math.sin(self.heading))
+        near = SCUFF_OFFSET
+        far = SCUFF_OFFSET + SCUFF_LENGTH
+        width = LINE_HALF_WIDTH + LINE_SENSOR_SPOT_RADIUS + 1
+        self.track.wipe(
+            x - c * near + abs(s) * width,
+            y - s * near + abs(c) * width,
+            x - c * far - abs(s) * width,
+            y - s * far - abs(c) * width,
+        )
+        self.log("Scuffed the line {}-{}mm behind ({:.0f}, {:.0f})", near, far, x, y)
+
+    def _update_jaw(self):
+        """
+        Pick up / place reels on the jaw closing / opening.
+        """
+        duty = board.duty(JAW_SERVO_PIN)
+        if not duty:
+            return
+        closed = duty * SERVO_PULSE_WIDTH / 65535 < JAW_CLOSED_BELOW
+        if closed == self.jaw_closed:
+            return
+        self.jaw_closed = closed
+        x, y = self._point(GRABBER_FORWARD, 0)
+
+        if closed and self.held is None:
+            pickup = self._nearest(self.pickups, x, y, PICKUP_RADIUS)
+            if pickup is not None and self.pickups[pickup]:
+                self.held = self.pickups[pickup].pop()
+                self.picked.append((pickup, self.held))
+                self.log("Picked up reel {} at {}", self.held, pickup)
+        elif not closed and self.held is not None:
+            bay = self._nearest(self.bays, x, y, DROPOFF_RADIUS)
+            if bay is None or self.bays[bay] is not None:
+                self.dropped.append((self.held, (round(x), round(y))))
+                self.log("Dropped reel {} at ({:.0f}, {:.0f})", self.held, x, y)
+            else:
+                self.bays[bay] = self.held
+                correct = _correct_bay(self.held, bay)
+                self.delivered.append((bay, self.held, correct))
+                self.log(
+                    "Delivered reel {} to {} ({})",
+                    self.held,
+                    bay,
+                    "correct" if correct else "WRONG",
+                )
+                if len(self.delivered) == self.scuff_delivery:
+                    self._scuff()
+            self.held = None
+
+
+# Keys of LINE_SENSOR_LATERAL for each LineSensor
+_SENSOR_NAMES = {
+    LineSensor.OUTER_LEFT: "OUTER_LEFT",
+    LineSensor.INNER_LEFT: "INNER_LEFT",
+    LineSensor.INNER_RIGHT: "INNER_RIGHT",
+    LineSensor.OUTER_RIGHT: "OUTER_RIGHT",
+}
+
+
+def _correct_bay(reel: int, bay: str) -> bool:
+    """
+    Whether a bay is in the dropoff row for the reel.
+    """
+    first, last = (int(j[1:]) for j in REEL_DROP_NODE[reel])
+    return min(first, last) <= int(bay[1:]) <= max(first, last)
@@ -0,0 +1,140 @@
+####################################################################################################
+#
+# Decodes binary robot logs.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Host side decoder for the ring logger's files (BINARY_LOG), from the repo root:
+
+    python tools/decode_log.py robot.bin [-o robot.log]
+
+Prints the "<ms> <message>" lines the text logger would have written, so the output
+works with tools/fit_timings.py. See lib/logger/ringLogger.py for the format.
+"""
+
+import argparse
+import struct
+import sys
+
+# Same as lib/logger/ringLogger.py
+LOG_MAGIC = b"IDPLOG1\n"
+REC_LOG = 1
+REC_DEF = 2
+REC_DROP = 3
+ARG_INT = 0x69
+ARG_FLOAT = 0x66
+ARG_STR = 0x73
+ARG_BOOL = 0x62
+ARG_NONE = 0x6E
+ARG_TUPLE = 0x74
+ARG_LIST = 0x6C
+NO_STRING = 0xFFFF
+
+
+class DecodeError(Exception):
+    pass
+
+
+class Decoder:
+    """
+    Reads records off a binary log, keeping the string table as it goes.
+    """
+    def __init__(self, data: bytes):
+        if not data.startswith(LOG_MAGIC):
+            raise DecodeError("not a binary robot log")
+        self.data = data
+        self.pos = len(LOG_MAGIC)
+        self.strings = {NO_STRING: "?"}
+        self.last_ms = 0
+
+    def _take(self, fmt: str):
+        size = struct.calcsize(fmt)
+        if self.pos + size > len(self.data):
+            raise DecodeError("truncated record at byte {}".format(self.pos))
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += size
+        return values[0] if len(values) == 1 else values
+
+    def _string(self, i: int) -> str:
+        return self.strings.get(i, "<string {}>".format(i))
+
+    def _arg(self):
+        tag = self._take("<B")
+        if tag == ARG_INT:
+            return self._take("<i")
+        if tag == ARG_FLOAT:
+            return self._take("<i") / 1000
+        if tag == ARG_STR:
+            return self._string(self._take("<H"))
+        if tag == ARG_BOOL:
+            return bool(self._take("<B"))
+        if tag == ARG_NONE:
+            return None
+        if tag == ARG_TUPLE:
+            return tuple(self._arg() for _ in range(self._take("<B")))
+        if tag == ARG_LIST:
+            return [self._arg() for _ in range(self._take("<B"))]
+        raise DecodeError(
+            "unknown argument tag {:#x} at byte {}".format(tag, self.pos - 1)
+        )
+
+    def lines(self):
+        """
+        Generator yielding the log lines.
+        """
+        while self.pos < len(self.data):
+            kind = self._take("<B")
+            if kind == REC_DEF:
+                i, length = self._take("<HH")
+                end = self.pos + length
+                self.strings[i] = self.data[self.pos : end].decode("utf-8", "replace")
+                self.pos = end
+            elif kind == REC_LOG:
+                ms, msg_id, argc = self._take("<IHB")
+                # Back to signed, the robot writes ticks_diff
+                if ms >= 1 << 31:
+                    ms -= 1 << 32
+                self.last_ms = ms
+                args = [self._arg() for _ in range(argc)]
+                msg = self._string(msg_id)
+                try:
+                    text = msg.format(*args)
+                except (IndexError, KeyError, ValueError):
+                    text = "{} {}".format(msg, args)
+                yield "{} {}".format(ms, text)
+            elif kind == REC_DROP:
+                yield "{} [{} records dropped, log ring full]".format(
+                    self.last_ms, self._take("<I")
+                )
+            else:
+                raise DecodeError(
+                    "unknown record kind {} at byte {}".format(kind, self.pos - 1)
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode a binary robot log")
+    parser.add_argument("log", help="binary log file, e.g. robot.bin")
+    parser.add_argument("-o", "--output", help="write the text log here")
+    args = parser.parse_args(argv)
+
+    with open(args.log, "rb") as f:
+        decoder = Decoder(f.read())
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for line in decoder.lines():
+            out.write(line + "\n")
+    except DecodeError as e:
+        print("decode_log: {}".format(e), file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+####################################################################################################
+#
+# Fits segment and junction timings from robot logs.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Host side tool turning robot.log files into navigation/timings.py, from the repo root:
+
+    python tools/fit_timings.py log/robot.log [more logs ...] [-o lib/navigation/timings.py]
+
+Only the path following parts of a run are used, dropoffs drive at their own speed.
+Per route it measures:
+
+    segment   forward / reverse command -> next junction detected, per edge
+    crawl     junction detected -> PRE_JUNCTION over (JUNCTION_FORWARD_TIME + loop lag)
+    turn      junction command -> back on a line, per command
+    junction  junction detected -> turn complete, per command (JUNCTION_TIME)
+
+Anything with the logger's "<ms> <message>" lines works, including the printed output of
+python -m sim.run --debug. Segments are matched to edges with the route path, which is
+only logged with DEBUG on.
+Segments where the speed profile cruised aren't at ROBOT_SPEED so they're left out.
+
+The generated module overrides the hand measured SEGMENT_TIME / JUNCTION_TIME entries
+(medians) and JUNCTION_TURN_GRACE_PERIOD (a fraction of the quick end of the left /
+right turns) in navigation.config. The straight grace period can't be fitted - going
+straight the line is found as soon as the grace period is up.
+"""
+
+import argparse
+import ast
+import re
+import statistics
+import sys
+
+LINE = re.compile(r"^(-?\d+) (.*)$")
+FORWARD = "Motion: Received forward command"
+REVERSE = "Motion: Received reverse command"
+COMMANDS = {
+    "Motion: Received left command": "GO_LEFT",
+    "Motion: Received right command": "GO_RIGHT",
+    "Motion: Received continue straight command": "GO_STRAIGHT",
+    "Motion: Received u_turn command": "U_TURN",
+}
+# Order they're written out in
+COMMAND_ORDER = ("GO_STRAIGHT", "GO_LEFT", "GO_RIGHT", "U_TURN")
+
+# Grace period as a fraction of the turn time percentile below
+GRACE_FRACTION = 0.8
+GRACE_PERCENTILE = 10
+
+HEADER = """\
+####################################################################################################
+#
+# Segment and junction timings fitted from run logs.
+#
+# GENERATED by tools/fit_timings.py from {logs} - re-run it rather than editing.
+#
+####################################################################################################
+
+from navigation.components.types.navigation import JunctionOptions
+"""
+
+
+class Samples:
+    """
+    Durations collected from the logs, in ms.
+    """
+    def __init__(self):
+        # frozenset({a, b}) -> [ms], with the direction first seen kept for the key
+        self.segment = {}
+        self.segment_key = {}
+        self.crawl = []
+        self.turn = {cmd: [] for cmd in COMMAND_ORDER}
+        self.junction = {cmd: [] for cmd in COMMAND_ORDER}
+        self.cruised = 0
+
+    def add_segment(self, a: str, b: str, ms: int):
+        edge = frozenset((a, b))
+        self.segment.setdefault(edge, []).append(ms)
+        self.segment_key.setdefault(edge, (a, b))
+
+
+class LogParser:
+    """
+    Walks one log a line at a time, tracking the route, segment and junction in flight.
+    """
+    def __init__(self, samples: Samples):
+        self.samples = samples
+        self.following = False
+        self.path = None
+        self.prev = None
+        self.next = None
+        self.cruising = False
+
+        self.segment_start = None
+        self.segment_cruised = False
+        self.detected = None
+        self.command = None
+        self.command_start = None
+
+    def _start_route(self, start: str):
+        self.following = True
+        self.path = None
+        self.prev = start
+        self.next = None
+        self.segment_start = None
+        self.detected = None
+        self.command = None
+
+    def feed(self, t: int, msg: str):
+        if msg.startswith("Pathfinding: "):
+            self._start_route(msg.split()[1])
+        elif msg.startswith(("Starting dropoff", "Navigation: Completed")):
+            self.following = False
+            self.segment_start = None
+        elif not self.following:
+            return
+        elif msg.startswith("Navigation: setting route"):
+            _, _, rest = msg.partition("path ")
+            self.path = ast.literal_eval(rest[: rest.rindex("]") + 1])
+            self.next = self.path[0] if self.path else None
+        elif msg.startswith("Motion: cruising for"):
+            self.cruising = self.segment_cruised = True
+        elif msg.startswith("Motion: cruise over"):
+            self.cruising = False
+        elif msg in (FORWARD, REVERSE):
+            if msg == REVERSE:
+                self.cruising = False
+            if self.segment_start is None:
+                self.segment_start = t
+                self.segment_cruised = self.cruising
+        elif msg.startswith("Junction detection: Detected a junction"):
+            self._end_segment(t)
+            self.detected = t
+        elif msg.startswith("Motion control: Transitioning from PRE_JUNCTION"):
+            if self.detected is not None:
+                self.samples.crawl.append(t - self.detected)
+        elif msg.startswith("Navigation: next node "):
+            # The junction we're at is the end of the last segment
+            self.prev = self.next
+            self.next = msg.split()[3]
+        elif msg in COMMANDS:
+            self.command = COMMANDS[msg]
+            self.command_start = t
+            if self.command != "GO_STRAIGHT":
+                self.cruising = False
+        elif msg.startswith("Motion: successful junction"):
+            if self.command is not None:
+                self.samples.turn[self.command].append(t - self.command_start)
+        elif msg.startswith("Navigation: Turning complete"):
+            if self.command is not None and self.detected is not None:
+                self.samples.junction[self.command].append(t - self.detected)
+            self.command = None
+            self.detected = None
+
+    def _end_segment(self, t: int):
+        if self.segment_start is None:
+            return
+        if self.segment_cruised:
+            self.samples.cruised += 1
+        elif self.prev is not None and self.next is not None:
+            self.samples.add_segment(self.prev, self.next, t - self.segment_start)
+        self.segment_start = None
+
+
+def parse(path: str, samples: Samples):
+    """
+    Add the samples from one log file.
+    """
+    parser = LogParser(samples)
+    with open(path, encoding="ascii", errors="replace") as f:
+        for line in f:
+            match = LINE.match(line.rstrip("\n"))
+            if match is None:
+                continue
+            parser.feed(int(match.group(1)), match.group(2))
+
+
+def percentile(values, p: int) -> int:
+    """
+    Nearest rank percentile.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, (len(ordered) * p + 99) // 100 - 1)]
+
+
+def describe(values) -> str:
+    return "n={} min {} p10 {} p90 {} max {}".format(
+        len(values),
+        min(values),
+        percentile(values, 10),
+        percentile(values, 90),
+        max(values),
+    )
+
+
+def median(values) -> int:
+    return int(round(statistics.median(values)))
+
+
+def report(samples: Samples):
+    """
+    Print the distributions.
+    """
+    for edge in sorted(samples.segment, key=lambda e: samples.segment_key[e]):
+        a, b = samples.segment_key[edge]
+        values = samples.segment[edge]
+        print(
+            "segment  {:>9} - {:<9} median {:>5}  {}".format(
+                a, b, median(values), describe(values)
+            )
+        )
+    if samples.cruised:
+        print("segment  {} left out, cruising".format(samples.cruised))
+    if samples.crawl:
+        print(
+            "crawl    median {:>5}  {}".format(
+                median(samples.crawl), describe(samples.crawl)
+            )
+        )
+    for name, table in (("turn    ", samples.turn), ("junction", samples.junction)):
+        for cmd in COMMAND_ORDER:
+            if table[cmd]:
+                print(
+                    "{} {:<11} median {:>5}  {}".format(
+                        name, cmd, median(table[cmd]), describe(table[cmd])
+                    )
+                )
+
+
+def generate(samples: Samples, logs, min_samples: int) -> str:
+    """
+    Source of the timings module.
+    """
+    out = [HEADER.format(logs=", ".join(logs))]
+
+    out.append("# Median ms from forward / reverse command to junction detected, either way")
+    out.append("SEGMENT_TIME = {")
+    for edge in sorted(samples.segment, key=lambda e: samples.segment_key[e]):
+        values = samples.segment[edge]
+        if len(values) < min_samples:
+            continue
+        out.append(
+            '    ("{}", "{}"): {},  # {}'.format(
+                *samples.segment_key[edge], median(values), describe(values)
+            )
+        )
+    out.append("}")
+    out.append("")
+
+    out.append("# Median ms from junction detected to back following the line")
+    out.append("JUNCTION_TIME = {")
+    for cmd in COMMAND_ORDER:
+        values = samples.junction[cmd]
+        if len(values) < min_samples:
+            continue
+        out.append(
+            "    JunctionOptions.{}: {},  # {}".format(cmd, median(values), describe(values))
+        )
+    out.append("}")
+
+    turns = [ms for cmd in ("GO_LEFT", "GO_RIGHT") for ms in samples.turn[cmd]]
+    if len(turns) >= min_samples:
+        out.append("")
+        out.append(
+            "# {} of the p{} left / right turn time ({})".format(
+                GRACE_FRACTION, GRACE_PERCENTILE, describe(turns)
+            )
+        )
+        out.append(
+            "JUNCTION_TURN_GRACE_PERIOD = {}".format(
+                int(percentile(turns, GRACE_PERCENTILE) * GRACE_FRACTION)
+            )
+        )
+    return "\n".join(out) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit navigation timings from robot logs")
+    parser.add_argument("logs", nargs="+", help="robot.log files")
+    parser.add_argument("-o", "--output", help="write the timings module here")
+    parser.add_argument(
+        "--min-samples", type=int, default=1, help="leave out anything with fewer samples"
+    )
+    args = parser.parse_args(argv)
+
+    samples = Samples()
+    for path in args.logs:
+        parse(path, samples)
+    report(samples)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(generate(samples, args.logs, args.min_samples))
+        print("Wrote {}".format(args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+####################################################################################################
+#
+# Strips disabled log calls out of the code before deploying.
+#
+# Copyright (c) 2026 IDP group 112. All Rights Reserved.
+#
+####################################################################################################
+
+"""
+Host side preprocessor so disabled logging costs nothing on the robot, from the repo root:
+
+    python tools/strip_logs.py [--out build] [--check]
+    mpremote cp -r build/lib : + cp build/main.py build/overallnavigation.py :
+
+Copies the code into --out with, per lib/config.py (--out is cleared first, so only
+a directory this tool made before is ever written over):
+
+    - logger.log(...) statements below LOG_LEVEL replaced by pass - every one of them
+      if no logger is enabled (DEBUG, USB_DEBUG and BINARY_LOG all off) - so their
+      arguments are never built and the call never happens
+    - if DEBUG: guards turned into if False: when DEBUG is off, which the MicroPython
+      compiler drops entirely
+
+Line numbers are kept so tracebacks still point at the source. Levels are read from
+level=LOG_LEVELS.<NAME> (DEBUG when not given), anything else is left alone. Log
+arguments must not have side effects, they go with the call.
+
+--check enforces the convention for the source tree instead: TRACE logs run every
+control loop tick, so they have to sit under an if DEBUG: guard to cost nothing when
+the code is run without stripping.
+"""
+
+import argparse
+import ast
+import os
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB = os.path.join(ROOT, "lib")
+# Top level modules that get deployed next to lib/
+TOP_LEVEL = ("main.py", "overallnavigation.py", "robot.py")
+# Left in --out so we only ever clear a directory we made
+MARKER = ".strip_logs"
+
+
+def load_config():
+    """
+    The deployed lib/config.py, for the levels and flags.
+    """
+    sys.path.insert(0, LIB)
+    try:
+        import config
+    finally:
+        sys.path.remove(LIB)
+    return config
+
+
+def is_log_call(node) -> bool:
+    """
+    Whether a statement is a bare logger.log(...) call.
+    """
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Attribute)
+        and node.value.func.attr == "log"
+        and isinstance(node.value.func.value, ast.Name)
+        and node.value.func.value.id == "logger"
+    )
+
+
+def log_level(call: ast.Call, levels):
+    """
+    Level a log call is made at, None if it can't be told from the source.
+    """
+    for kw in call.keywords:
+        if kw.arg == "level":
+            value = kw.value
+            if (
+                isinstance(value, ast.Attribute)
+                and isinstance(value.value, ast.Name)
+                and value.value.id == "LOG_LEVELS"
+            ):
+                return getattr(levels, value.attr, None)
+            return None
+    return levels.DEBUG
+
+
+def is_debug_guard(node) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Name)
+        and node.test.id == "DEBUG"
+    )
+
+
+def own_lines(node, lines) -> bool:
+    """
+    Whether nothing else shares the lines of a statement (no ; tricks).
+    """
+    before = lines[node.lineno - 1][: node.col_offset]
+    after = lines[node.end_lineno - 1][node.end_col_offset :]
+    return not before.strip() and (not after.strip() or after.strip().startswith("#"))
+
+
+def strip(source: str, config):
+    """
+    Rewrite one module.
+
+    Returns:
+        tuple[str, int, int]: New source, log calls stripped and guards disabled.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    logging = config.DEBUG or config.USB_DEBUG or config.BINARY_LOG
+    stripped = 0
+    guards = 0
+
+    for node in ast.walk(tree):
+        if is_debug_guard(node) and not config.DEBUG:
+            # Same length so the columns don't move
+            line = lines[node.test.lineno - 1]
+            col = node.test.col_offset
+            lines[node.test.lineno - 1] = line[:col] + "False" + line[col + 5 :]
+            guards += 1
+        elif is_log_call(node) and own_lines(node, lines):
+            level = log_level(node.value, config.LOG_LEVELS)
+            if logging and (level is None or level >= config.LOG_LEVEL):
+                continue
+            first = node.lineno - 1
+            indent = lines[first][: node.col_offset]
+            lines[first] = indent + "pass\n"
+            for i in range(first + 1, node.end_lineno):
+                lines[i] = "\n"
+            stripped += 1
+    return "".join(lines), stripped, guards
+
+
+def check(path: str, source: str, levels):
+    """
+    TRACE log calls not under an if DEBUG: guard.
+
+    Returns:
+        list[str]: One message per offending call.
+    """
+    problems = []
+
+    def visit(node, guarded):
+        for child in ast.iter_child_nodes(node):
+            if is_log_call(child) and not guarded:
+                if log_level(child.value, levels) == levels.TRACE:
+                    problems.append(
+                        "{}:{}: TRACE log outside an if DEBUG: guard".format(
+                            path, child.lineno
+                        )
+                    )
+            visit(child, guarded or is_debug_guard(child))
+
+    visit(ast.parse(source), False)
+    return problems
+
+
+def sources():
+    """
+    (path relative to the repo root, absolute path) of every deployed module.
+    """
+    for name in TOP_LEVEL:
+        yield name, os.path.join(ROOT, name)
+    for dirpath, dirnames, filenames in os.walk(LIB):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                full = os.path.join(dirpath, name)
+                yield os.path.relpath(full, ROOT), full
+
+
+def unsafe_out(out):
+    """
+    Why --out can't be cleared and written to, None if it can.
+    """
+    out = os.path.realpath(out)
+    if os.path.commonpath([out, os.path.realpath(ROOT)]) == out:
+        return "{} is or contains the repo".format(out)
+    lib = os.path.realpath(LIB)
+    if os.path.commonpath([out, lib]) == lib:
+        return "{} is inside lib/".format(out)
+    if not os.path.exists(out):
+        return None
+    if not os.path.isdir(out):
+        return "{} is not a directory".format(out)
+    if os.path.exists(os.path.join(out, MARKER)):
+        return None
+    for name in ("lib",) + TOP_LEVEL:
+        if os.path.exists(os.path.join(out, name)):
+            return "{} has its own {}".format(out, name)
+    if os.listdir(out):
+        return "{} wasn't made by this tool".format(out)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Strip disabled logs for deploying")
+    parser.add_argument("--out", default="build", help="output directory")
+    parser.add_argument(
+        "--check", action="store_true", help="only check the TRACE guard convention"
+    )
+    args = parser.parse_args(argv)
+    config = load_config()
+
+    if args.check:
+        problems = []
+        for rel, full in sources():
+            with open(full) as f:
+                problems += check(rel, f.read(), config.LOG_LEVELS)
+        for problem in problems:
+            print(problem)
+        return 1 if problems else 0
+
+    out = os.path.join(ROOT, args.out) if not os.path.isabs(args.out) else args.out
+    problem = unsafe_out(out)
+    if problem:
+        print("Not writing to --out: {}".format(problem))
+        return 1
+    if os.path.exists(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    open(os.path.join(out, MARKER), "w").close()
+    total_stripped = 0
+    total_guards = 0
+    for rel, full in sources():
+        with open(full) as f:
+            source, stripped, guards = strip(f.read(), config)
+        total_stripped += stripped
+        total_guards += guards
+        dest = os.path.join(out, rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "w") as f:
+            f.write(source)
+    print(
+        "Stripped {} log calls and {} if DEBUG: guards into {}".format(
+            total_stripped, total_guards, out
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())